@@ -1,10 +1,10 @@
 # Standard library
-import csv
+from itertools import chain
 
 # Third-party
 from django.conf import settings
 from django.contrib import admin, messages
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.utils.translation import ngettext
 from simple_history.admin import SimpleHistoryAdmin
@@ -15,6 +15,7 @@ from controlpanel.api.models import (
     App,
     AppS3Bucket,
     DashboardDomain,
+    EmailNotification,
     Feedback,
     IPAllowlist,
     JusticeDomain,
@@ -31,6 +32,7 @@ from controlpanel.api.models.dashboard import (
 )
 from controlpanel.api.models.status_post import StatusPageEvent
 from controlpanel.api.tasks.user import upgrade_user_helm_chart
+from controlpanel.utils import aiter_chunks, iter_csv, iter_queryset
 
 # Historical models for browsing audit trail including deletions
 HistoricalDashboard = Dashboard.history.model
@@ -49,21 +51,29 @@ make_migration_pending.short_description = "Mark selected users as pending migra
 
 
 def export_as_csv(filename, row_data):
-    """Helper function to export data as CSV and return in HttpResponse."""
-    response = HttpResponse(content_type="text/csv")
+    """
+    Helper function returning a response streaming data as a CSV. `row_data` is an
+    iterable of dicts with the same keys, which is only read as the response is
+    sent, so it can be a generator over iter_queryset().
+    """
+
+    def lines():
+        rows = iter(row_data)
+        first = next(rows, None)
+        # Handle empty data case
+        if first is None:
+            yield from iter_csv([], [])
+            return
+
+        fieldnames = list(first.keys())
+        yield from iter_csv(
+            fieldnames, ([row[name] for name in fieldnames] for row in chain([first], rows))
+        )
+
+    response = StreamingHttpResponse(aiter_chunks(lines()), content_type="text/csv")
     timestamp = timezone.now().strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"{filename}_{timestamp}.csv"
     response["Content-Disposition"] = f"attachment; filename={filename}"
-
-    # Handle empty data case
-    if not row_data:
-        writer = csv.DictWriter(response, fieldnames=[])
-        writer.writeheader()
-        return response
-
-    writer = csv.DictWriter(response, fieldnames=row_data[0].keys())
-    writer.writeheader()
-    writer.writerows(row_data)
     return response
 
 
@@ -141,7 +151,7 @@ class UserAdmin(admin.ModelAdmin):
 
     @admin.action(description="Export selected users as CSV")
     def export_as_csv(self, request, queryset):
-        data = [
+        data = (
             {
                 "username": obj.username,
                 "alpha_role_arn": obj.iam_role_name,
@@ -153,8 +163,8 @@ class UserAdmin(admin.ModelAdmin):
                 "azure_oid": obj.azure_oid,
                 "date_joined": obj.date_joined,
             }
-            for obj in queryset
-        ]
+            for obj in iter_queryset(queryset)
+        )
 
         return export_as_csv(filename="users", row_data=data)
 
@@ -195,7 +205,7 @@ class ToolDeploymentAdmin(admin.ModelAdmin):
     @admin.action
     def export_as_csv(self, request, queryset):
         queryset = queryset.select_related("user", "tool")
-        data = [
+        data = (
             {
                 "username": obj.user.username,
                 "tool_type": obj.tool_type,
@@ -209,8 +219,8 @@ class ToolDeploymentAdmin(admin.ModelAdmin):
                 "is_deprecated": obj.tool.is_deprecated,
                 "created": obj.created,
             }
-            for obj in queryset
-        ]
+            for obj in iter_queryset(queryset)
+        )
 
         return export_as_csv(filename="tool_deployments", row_data=data)
 
@@ -219,6 +229,13 @@ class JusticeDomainAdmin(admin.ModelAdmin):
     list_display = ("domain",)
 
 
+class EmailNotificationAdmin(admin.ModelAdmin):
+    list_display = ("email_address", "template_id", "status", "attempts", "sent_at", "created")
+    list_filter = ("status", "template_id")
+    search_fields = ("email_address",)
+    readonly_fields = ("created", "modified", "notify_id", "sent_at", "attempts", "error")
+
+
 class StatusPageEventAdmin(admin.ModelAdmin):
     list_display = (
         "title",
@@ -237,6 +254,18 @@ class StatusPageEventAdmin(admin.ModelAdmin):
     readonly_fields = ("created", "modified", "raw_payload")
     date_hierarchy = "reported_at"
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        StatusPageEvent.invalidate_active_events()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        StatusPageEvent.invalidate_active_events()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        StatusPageEvent.invalidate_active_events()
+
 
 class HistoricalAdmin(admin.ModelAdmin):
     """Base admin for browsing history records including deletions."""
@@ -342,6 +371,7 @@ admin.site.register(ToolDeployment, ToolDeploymentAdmin)
 admin.site.register(DashboardDomain, DashboardDomainAdmin)
 admin.site.register(JusticeDomain, JusticeDomainAdmin)
 admin.site.register(StatusPageEvent, StatusPageEventAdmin)
+admin.site.register(EmailNotification, EmailNotificationAdmin)
 admin.site.register(Dashboard, SimpleHistoryAdmin)
 admin.site.register(DashboardAdminAccess, SimpleHistoryAdmin)
 admin.site.register(DashboardViewerAccess, SimpleHistoryAdmin)
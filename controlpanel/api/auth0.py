@@ -1,6 +1,8 @@
 # Standard library
 import base64
+import math
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Third-party
@@ -16,6 +18,7 @@ from auth0.management.roles import Roles as Auth0Roles
 from auth0.management.users import Users
 from auth0.rest import RestClient
 from django.conf import settings
+from django.core.cache import cache
 from jinja2 import Environment
 from rest_framework.exceptions import APIException
 
@@ -29,6 +32,35 @@ PER_PAGE = 50
 # This is the maximum they'll allow for group/members API
 PER_PAGE_FOR_GROUP_MEMBERS = 25
 
+# Number of pages get_all fetches at the same time once the total is known.
+# Kept low to stay well within the Management API rate limits
+MAX_CONCURRENT_PAGES = 4
+
+# Number of emails looked up with a single OR-query when importing users, kept
+# well under the length limit of the user search query string
+EMAIL_SEARCH_BATCH_SIZE = 20
+
+# Number of users created at the same time when importing users, kept low for
+# the same rate limit reasons as MAX_CONCURRENT_PAGES
+MAX_CONCURRENT_USER_CREATES = 4
+
+# Number of users the dashboard role is removed from at the same time, kept
+# low for the same rate limit reasons as MAX_CONCURRENT_PAGES
+MAX_CONCURRENT_ROLE_REMOVALS = 4
+
+# Cache key of the authorization extension group name -> group id index
+GROUP_IDS_CACHE_KEY = "auth0_group_ids"
+
+# Cache key set when a group name isn't found, so that looking it up again
+# only lists the groups once in a while
+GROUP_ID_MISS_CACHE_KEY = "auth0_group_id_miss:{}"
+
+# Cache key of the connection name <-> enabled client ids index
+CONNECTIONS_CACHE_KEY = "auth0_connections"
+
+# Cache key of the ids of all the clients
+CLIENT_IDS_CACHE_KEY = "auth0_client_ids"
+
 # The default value for timeout in auth0.management is 5 seconds which will
 # get ReadTimeOut error quite easily on Auth0 dev tenant when Control panel
 # initialises the connection with it. In order to avoid this, a longer timeout
@@ -123,10 +155,8 @@ class ExtendedAuth0(Auth0):
         unchosen connections to diable the client from it, then enable nomis
         login if nomis login has been chosen
         """
-        connections = self.connections.get_all()
-        for connection in connections:
-            if connection["name"] in chosen_connections:
-                self.connections.enable_client(connection, client_id)
+        for connection in self.connections.get_connections(chosen_connections):
+            self.connections.enable_client(connection, client_id)
 
     def _create_custom_connection(self, app_name, connections):
         new_connections = []
@@ -183,7 +213,8 @@ class ExtendedAuth0(Auth0):
             #  catch in the worker? e.g.:
             # raise Auth0Error(detail=exc.message, code=exc.error_code)
             # Or get the group ID and continue?
-            group = {"_id": self.groups.get_group_id(client_name)}
+            # the group exists, so list the groups even if its name was missed
+            group = {"_id": self.groups.refresh_group_ids().get(client_name)}
 
         self.groups.add_role(group["_id"], role["_id"])
 
@@ -226,24 +257,53 @@ class ExtendedAuth0(Auth0):
             raise Auth0Error(error.__str__(), code=error.status_code) from error
 
     def add_group_members_by_emails(
-        self, emails, user_options=None, group_id=None, group_name=None
+        self, emails, user_options=None, group_id=None, group_name=None, progress_callback=None
     ):
         if user_options is None:
             user_options = {}
-        user_ids = self.users.add_users_by_emails(emails, user_options=user_options)
+        user_ids = self.users.add_users_by_emails(
+            emails, user_options=user_options, progress_callback=progress_callback
+        )
         self.groups.add_group_members(user_ids=user_ids, group_id=group_id, group_name=group_name)
         return user_ids
 
     def add_dashboard_member_by_email(self, email, user_options=None):
+        self.add_dashboard_members_by_emails([email], user_options=user_options)
+
+    def add_dashboard_members_by_emails(self, emails, user_options=None):
+        """Give the dashboard role to the users with the given emails in one write"""
         if user_options is None:
             user_options = {}
-        user_ids = self.users.add_users_by_emails([email], user_options=user_options)
-        self.auth0_roles.add_users(settings.DASHBOARD_AUTH0_ROLE_ID, user_ids)
+        user_ids = self.users.add_users_by_emails(emails, user_options=user_options)
+        if user_ids:
+            self.auth0_roles.add_users(settings.DASHBOARD_AUTH0_ROLE_ID, user_ids)
+        return user_ids
 
     def remove_dashboard_role(self, email):
         user_id = self.users.get_user_id_by_email(email, "email")
         self.users.remove_role(user_id, settings.DASHBOARD_AUTH0_ROLE_ID)
 
+    def remove_dashboard_roles(self, emails):
+        """
+        Remove the dashboard role from the users with the given emails. The
+        users are found with batched searches and the role is removed from them
+        concurrently. Returns the emails the role couldn't be removed from,
+        emails without a user don't need it removing.
+        """
+        user_ids = self.users.get_user_ids_by_emails(emails, connection="email")
+
+        def remove_role(user_id):
+            try:
+                self.users.remove_role(user_id, settings.DASHBOARD_AUTH0_ROLE_ID)
+            except (exceptions.Auth0Error, Auth0Error) as error:
+                log.warning(f"Failed to remove the dashboard role from {user_id}: {error}")
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ROLE_REMOVALS) as executor:
+            removed = executor.map(remove_role, user_ids.values())
+            return {email for email, ok in zip(user_ids, removed, strict=True) if not ok}
+
     def clear_up_group(self, group_id):
         """
         Deletes a group from the authorization API
@@ -302,21 +362,13 @@ class ExtendedAuth0(Auth0):
     def get_client_enabled_connections(self, client_ids):
         """
         There is no Auth0 API to get the list of enabled connection for a client,
-        so we have to get all social connections, then check whether the client
-        (client_id) is in the list of enabled_clients
+        so this is looked up in the cached index built from all the connections,
+        see ExtendedConnections.get_index
         """
         if not client_ids:
             return {}
-        connections = self.connections.get_all()
-        enabled_connections = {}
-        for connection in connections:
-            for client_id in client_ids:
-                if client_id not in connection["enabled_clients"]:
-                    continue
-                if client_id not in enabled_connections:
-                    enabled_connections[client_id] = []
-                enabled_connections[client_id].append(connection["name"])
-        return enabled_connections
+        clients = self.connections.get_index()["clients"]
+        return {client_id: clients[client_id] for client_id in client_ids if clients.get(client_id)}
 
     def update_client_auth_connections(
         self, app_name: str, client_id: str, new_conns: dict, existing_conns: list
@@ -333,11 +385,10 @@ class ExtendedAuth0(Auth0):
         removed_connections = list(set(existing_conns) - set(new_connections))
         real_new_connections = list(set(new_connections) - set(existing_conns))
 
-        for connection in self.connections.get_all():
-            if connection["name"] in removed_connections:
-                self.connections.disable_client(connection, client_id)
-            if connection["name"] in real_new_connections:
-                self.connections.enable_client(connection, client_id)
+        for connection in self.connections.get_connections(removed_connections):
+            self.connections.disable_client(connection, client_id)
+        for connection in self.connections.get_connections(real_new_connections):
+            self.connections.enable_client(connection, client_id)
 
 
 class Auth0API(object):
@@ -422,49 +473,93 @@ class ExtendedAPIMethods(object):
         # plus the page is in general Zero based
         return {"include_totals": "true"}, 0, PER_PAGE
 
-    def get_all(self, request_url=None, endpoint=None, has_pagination=False):
-        items = []
-        total = None
-        params = None
-        endpoint = self._get_request_endpoint(endpoint=endpoint)
+    def _get_page(
+        self, request_url, endpoint, page_number, per_page, params, total=None, fields=None
+    ):
+        response = self.all(
+            request_url=request_url,
+            fields=fields,
+            page=page_number,
+            per_page=per_page,
+            extra_params=dict(params) if params else None,
+        )
+
+        if "total" not in response:
+            raise Auth0Error(f"get_all {endpoint}: Missing 'total' property")
+        if endpoint not in response:
+            raise Auth0Error(f"get_all {endpoint}: Missing '{endpoint}' property")
+        if total is not None and total != response["total"]:
+            raise Auth0Error(f"get_all {endpoint}: Total changed")
+        return response["total"], response[endpoint]
 
-        page_number = None
-        per_page = None
+    def _get_pagination(self, endpoint=None, has_pagination=False):
+        endpoint = self._get_request_endpoint(endpoint=endpoint)
         has_pagination_option = has_pagination or self._has_pagination_option()
         if has_pagination_option:
             params, page_number, per_page = self._get_pagination_params()
+        else:
+            params, page_number, per_page = None, None, None
+        return endpoint, has_pagination_option, params, page_number, per_page
 
+    def iter_all(self, request_url=None, endpoint=None, has_pagination=False):
+        """
+        Generator version of get_all, fetching one page at a time. Use it when
+        the caller can stop early or doesn't need the whole list in memory.
+        """
+        endpoint, has_pagination_option, params, page_number, per_page = self._get_pagination(
+            endpoint=endpoint, has_pagination=has_pagination
+        )
+
+        total = None
+        fetched = 0
         while True:
-            response = self.all(
-                request_url=request_url,
-                page=page_number,
-                per_page=per_page,
-                extra_params=params,
+            total, page_items = self._get_page(
+                request_url, endpoint, page_number, per_page, params, total=total
             )
-
-            if "total" not in response:
-                raise Auth0Error(f"get_all {endpoint}: Missing 'total' property")
-            if endpoint not in response:
-                raise Auth0Error(f"get_all {endpoint}: Missing '{endpoint}' property")
-            if total is None:
-                total = response["total"]
-            if total != response["total"]:
-                raise Auth0Error(f"get_all {endpoint}: Total changed")
-            items.extend(response[endpoint])
+            yield from page_items
+            fetched += len(page_items)
 
             if not has_pagination_option:
                 break
-            if len(items) >= total:
+            if fetched >= total:
                 break
-            if len(response[endpoint]) < 1:
+            if len(page_items) < 1:
                 break
             page_number += 1
 
+    def get_all(self, request_url=None, endpoint=None, has_pagination=False, fields=None):
+        """
+        Fetch every item of a paginated resource. The first page tells us the
+        total, the remaining pages are then fetched concurrently. `fields`
+        limits the properties returned for each item.
+        """
+        endpoint, has_pagination_option, params, page_number, per_page = self._get_pagination(
+            endpoint=endpoint, has_pagination=has_pagination
+        )
+
+        total, items = self._get_page(
+            request_url, endpoint, page_number, per_page, params, fields=fields
+        )
+        items = list(items)
+        if not has_pagination_option or not items or len(items) >= total:
+            return items
+
+        # use the size of the first page, in case the API caps per_page lower
+        page_size = len(items)
+        remaining_pages = range(page_number + 1, page_number + math.ceil(total / page_size))
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGES) as executor:
+            pages = executor.map(
+                lambda page: self._get_page(
+                    request_url, endpoint, page, per_page, params, total=total, fields=fields
+                )[1],
+                remaining_pages,
+            )
+            for page_items in pages:
+                items.extend(page_items)
         return items
 
     def search_first_match(self, resource):
-        resources = self.get_all()
-        for other in resources:
+        for other in self.iter_all():
             if all(pair in other.items() for pair in resource.items()):
                 return other
         return None
@@ -481,6 +576,41 @@ class ExtendedAPIMethods(object):
 class ExtendedClients(ExtendedAPIMethods, Clients):
     endpoint = "clients"
 
+    @property
+    def client_ids_cache_ttl(self):
+        return int(settings.AUTH0_CLIENT_IDS_CACHE_TTL)
+
+    def refresh_client_ids(self):
+        """
+        Fetch the ids of all the clients, only asking for the client_id field,
+        and store them in the cache.
+        """
+        client_ids = {client["client_id"] for client in self.get_all(fields=["client_id"])}
+        cache.set(CLIENT_IDS_CACHE_KEY, client_ids, timeout=self.client_ids_cache_ttl)
+        return client_ids
+
+    def get_client_ids(self):
+        client_ids = cache.get(CLIENT_IDS_CACHE_KEY)
+        if client_ids is None:
+            client_ids = self.refresh_client_ids()
+        return client_ids
+
+    def create(self, body):
+        client = super().create(body)
+        client_ids = cache.get(CLIENT_IDS_CACHE_KEY)
+        if client_ids is not None and client.get("client_id"):
+            client_ids.add(client["client_id"])
+            cache.set(CLIENT_IDS_CACHE_KEY, client_ids, timeout=self.client_ids_cache_ttl)
+        return client
+
+    def delete(self, id):
+        response = super().delete(id)
+        client_ids = cache.get(CLIENT_IDS_CACHE_KEY)
+        if client_ids is not None:
+            client_ids.discard(id)
+            cache.set(CLIENT_IDS_CACHE_KEY, client_ids, timeout=self.client_ids_cache_ttl)
+        return response
+
 
 class ExtendedDeviceCredentials(ExtendedAPIMethods, DeviceCredentials):
     endpoint = "device-credentials"
@@ -497,28 +627,95 @@ class ExtendedConnections(ExtendedAPIMethods, Connections):
     def custom_connections():
         return (settings.CUSTOM_AUTH_CONNECTIONS or "").split()
 
-    def disable_client(self, connection, client_id):
-        if client_id in connection["enabled_clients"]:
+    @property
+    def cache_ttl(self):
+        return int(settings.AUTH0_CONNECTIONS_CACHE_TTL)
+
+    def refresh_index(self):
+        """
+        Rebuild the index of which clients are enabled on which connection from
+        a single listing of the connections, and store it in the cache.
+        """
+        index = {"connections": {}, "clients": defaultdict(list)}
+        for connection in self.get_all():
+            index["connections"][connection["name"]] = {
+                "id": connection["id"],
+                "name": connection["name"],
+                "enabled_clients": list(connection.get("enabled_clients") or []),
+            }
+            for client_id in connection.get("enabled_clients") or []:
+                index["clients"][client_id].append(connection["name"])
+        index["clients"] = dict(index["clients"])
+        cache.set(CONNECTIONS_CACHE_KEY, index, timeout=self.cache_ttl)
+        return index
+
+    def get_index(self):
+        index = cache.get(CONNECTIONS_CACHE_KEY)
+        if index is None:
+            index = self.refresh_index()
+        return index
+
+    def get_connections(self, names):
+        connections = self.get_index()["connections"]
+        return [connections[name] for name in names if name in connections]
+
+    def get_by_name(self, name):
+        connections = self.all(
+            fields=["id", "name", "enabled_clients"], extra_params={"name": name}
+        )
+        return connections[0] if connections else None
+
+    def _update_index(self, connection):
+        """Update both sides of the cached index with the connection's enabled clients"""
+        index = cache.get(CONNECTIONS_CACHE_KEY)
+        if index is None:
+            return
+        name = connection["name"]
+        enabled_clients = list(connection["enabled_clients"])
+        previous = index["connections"].get(name, {}).get("enabled_clients", [])
+        index["connections"][name] = {
+            "id": connection["id"],
+            "name": name,
+            "enabled_clients": enabled_clients,
+        }
+        for client_id in set(previous) - set(enabled_clients):
+            index["clients"][client_id] = [
+                other for other in index["clients"].get(client_id, []) if other != name
+            ]
+        for client_id in set(enabled_clients) - set(previous):
+            index["clients"].setdefault(client_id, []).append(name)
+        cache.set(CONNECTIONS_CACHE_KEY, index, timeout=self.cache_ttl)
+
+    def _set_enabled_clients(self, connection, client_id, enabled):
+        # the index may be stale, and the update replaces the whole list of
+        # enabled clients, so start from the current list
+        current = self.get(connection["id"], fields=["enabled_clients"])
+        connection["enabled_clients"] = list(current.get("enabled_clients") or [])
+        if (client_id in connection["enabled_clients"]) == enabled:
+            self._update_index(connection)
+            return
+
+        if enabled:
+            connection["enabled_clients"].append(client_id)
+        else:
             connection["enabled_clients"].remove(client_id)
-            self.update(
-                connection["id"],
-                body={"enabled_clients": connection["enabled_clients"]},
-            )
+        self.update(
+            connection["id"],
+            body={"enabled_clients": connection["enabled_clients"]},
+        )
+        self._update_index(connection)
+
+    def disable_client(self, connection, client_id):
+        self._set_enabled_clients(connection, client_id, enabled=False)
 
     def enable_client(self, connection, client_id):
-        if client_id not in connection["enabled_clients"]:
-            connection["enabled_clients"].append(client_id)
-            self.update(
-                connection["id"],
-                body={"enabled_clients": connection["enabled_clients"]},
-            )
+        self._set_enabled_clients(connection, client_id, enabled=True)
 
     def _get_template_path_for_custom_connection(self, connection_name: str):
         return Path(__file__).parents[0] / Path("auth0_conns") / Path(connection_name)
 
     def get_all_connection_names(self):
-        connections = super(ExtendedConnections, self).get_all()
-        connection_names = [connection["name"] for connection in connections]
+        connection_names = list(self.get_index()["connections"])
         connection_names.extend(ExtendedConnections.custom_connections())
         return connection_names
 
@@ -557,11 +754,23 @@ class ExtendedConnections(ExtendedAPIMethods, Connections):
             body["options"]["scripts"] = scripts_rendered
 
         try:
-            self.create(body)
+            connection = self.create(body)
         except exceptions.Auth0Error as error:
             # Skip the exception when the connection name existed already
             if error.status_code != 409:
                 raise Auth0Error(error.__str__(), code=error.status_code) from error
+            connection = self.get_by_name(input_values["name"])
+
+        # the index only knows about the connections listed when it was built, so
+        # add this one, or clients won't be enabled on it
+        if connection:
+            self._update_index(
+                {
+                    "id": connection["id"],
+                    "name": connection["name"],
+                    "enabled_clients": connection.get("enabled_clients") or [],
+                }
+            )
         return input_values["name"]
 
 
@@ -620,22 +829,59 @@ class ExtendedUsers(ExtendedAPIMethods, Users):
             return response[0]["user_id"]
         return None
 
-    def add_users_by_emails(self, emails, user_options=None):
+    def get_user_ids_by_emails(self, emails, connection=None):
+        """
+        Look up users by email with one search per EMAIL_SEARCH_BATCH_SIZE
+        emails. Returns a dict of lower case email -> user_id for the users
+        that were found.
+        """
+        emails = list(dict.fromkeys(email.lower() for email in emails))
+        user_ids = {}
+        for start in range(0, len(emails), EMAIL_SEARCH_BATCH_SIZE):
+            batch = emails[start : start + EMAIL_SEARCH_BATCH_SIZE]
+            query_string = " OR ".join(f'email:"{email}"' for email in batch)
+            query_string = f"({query_string})"
+            if connection:
+                query_string = f'{query_string} AND identities.connection:"{connection}"'
+            response = self.list(q=query_string, search_engine="v3", per_page=PER_PAGE)
+            if "error" in response:
+                raise Auth0Error("get_user_ids_by_emails", response)
+
+            for user in response.get(self.endpoint, []):
+                user_ids.setdefault(user["email"].lower(), user["user_id"])
+        return user_ids
+
+    def add_users_by_emails(self, emails, user_options=None, progress_callback=None):
+        """
+        Returns the user ids for the given emails, creating the users that
+        don't exist yet. Existing users are found with batched searches and the
+        missing ones are created concurrently. `progress_callback` is called
+        with `done` and `total` as emails are resolved.
+        """
         if user_options is None:
             user_options = {}
-        user_ids_to_add = []
-
-        for email in emails:
-            lookup_response = self.get_users_email_search(email=email, connection="email")
-            if lookup_response:
-                user_ids_to_add.append(lookup_response[0]["user_id"])
-            else:
-                user_ids_to_add.append(
-                    self.create_user(email=email, email_verified=True, **user_options).get(
-                        "user_id"
-                    )
+        emails = list(dict.fromkeys(email.lower() for email in emails))
+        total = len(emails)
+
+        user_ids = self.get_user_ids_by_emails(emails, connection="email")
+        if progress_callback:
+            progress_callback(done=len(user_ids), total=total)
+
+        missing_emails = [email for email in emails if email not in user_ids]
+        if missing_emails:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_USER_CREATES) as executor:
+                created_users = executor.map(
+                    lambda email: self.create_user(
+                        email=email, email_verified=True, **user_options
+                    ),
+                    missing_emails,
                 )
-        return user_ids_to_add
+                for email, user in zip(missing_emails, created_users, strict=True):
+                    user_ids[email] = user.get("user_id")
+                    if progress_callback:
+                        progress_callback(done=len(user_ids), total=total)
+
+        return [user_ids[email] for email in emails]
 
     def get_user_groups(self, user_id):
         return self.auth_extension_users.get_user_groups(user_id)
@@ -699,12 +945,55 @@ class Groups(Auth0API, ExtendedAPIMethods):
     def add_role(self, id, role_id):
         self.client.patch(self._url(id, "roles"), data=[role_id])
 
+    @property
+    def group_ids_cache_ttl(self):
+        return int(settings.AUTH0_GROUP_IDS_CACHE_TTL)
+
+    def refresh_group_ids(self):
+        """
+        Rebuild the group name -> group id index from a single listing of the
+        groups and store it in the cache.
+        """
+        group_ids = {group["name"]: group["_id"] for group in self.get_all()}
+        cache.set(GROUP_IDS_CACHE_KEY, group_ids, timeout=self.group_ids_cache_ttl)
+        return group_ids
+
+    @property
+    def group_id_miss_cache_ttl(self):
+        return int(settings.AUTH0_GROUP_ID_MISS_CACHE_TTL)
+
     def get_group_id(self, group_name):
-        group = self.search_first_match({"name": group_name})
-        if not group:
-            return None
-        else:
-            return group.get("_id")
+        group_ids = cache.get(GROUP_IDS_CACHE_KEY)
+        if group_ids is not None and group_name in group_ids:
+            return group_ids[group_name]
+        # the group may have been created outside of this app since the index
+        # was built, so look again before giving up. Names can come from API
+        # clients, so a name that isn't found is only looked for again once
+        # its miss expires
+        missed = not cache.add(
+            GROUP_ID_MISS_CACHE_KEY.format(group_name),
+            True,
+            timeout=self.group_id_miss_cache_ttl,
+        )
+        if group_ids is None or not missed:
+            group_ids = self.refresh_group_ids()
+        return group_ids.get(group_name)
+
+    def create(self, body):
+        group = super().create(body)
+        group_ids = cache.get(GROUP_IDS_CACHE_KEY)
+        if group_ids is not None and group.get("_id"):
+            group_ids[body["name"]] = group["_id"]
+            cache.set(GROUP_IDS_CACHE_KEY, group_ids, timeout=self.group_ids_cache_ttl)
+        return group
+
+    def delete(self, id):
+        response = super().delete(id)
+        group_ids = cache.get(GROUP_IDS_CACHE_KEY)
+        if group_ids is not None:
+            group_ids = {name: _id for name, _id in group_ids.items() if _id != id}
+            cache.set(GROUP_IDS_CACHE_KEY, group_ids, timeout=self.group_ids_cache_ttl)
+        return response
 
     def _get_pagination_params(self):
         # All the auth extension APIs doesn't have page parameter but the API
@@ -735,6 +1024,17 @@ class Groups(Auth0API, ExtendedAPIMethods):
         else:
             return []
 
+    def iter_group_members(self, group_id):
+        """
+        Generator version of get_group_members, fetching one page at a time
+        """
+        if group_id:
+            yield from self.iter_all(
+                request_url=self._url(group_id, "members"),
+                endpoint="users",
+                has_pagination=True,
+            )
+
     def get_group_roles(self, group_name=None, group_id=None):
         if group_id is None and group_name is None:
             raise Auth0Error("get_group_roles", "Please specify either group_id or group_name.")
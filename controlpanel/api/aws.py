@@ -1214,6 +1214,7 @@ class AWSSQS(AWSService):
 
 class AWSQuicksight(AWSService):
     service_name = "quicksight"
+    _pool = {}
 
     def __init__(self, assume_role_name=None, profile_name=None, region_name=None):
         assume_role_name = assume_role_name or settings.QUICKSIGHT_ASSUMED_ROLE
@@ -1230,6 +1231,19 @@ class AWSQuicksight(AWSService):
         )
         self.client = self.boto3_session.client("quicksight")
 
+    @classmethod
+    def pooled(cls, assume_role_name=None, profile_name=None, region_name=None):
+        """
+        Returns a service shared by every caller with the same role, profile and
+        region, so its client and connections are reused rather than created for
+        each request. boto3 clients are thread safe, and the credentials of the
+        session it was created from refresh themselves.
+        """
+        key = (assume_role_name, profile_name, region_name)
+        if key not in cls._pool:
+            cls._pool[key] = cls(assume_role_name, profile_name, region_name)
+        return cls._pool[key]
+
     def get_user_arn(self, user):
         if not user.justice_email:
             return None
@@ -0,0 +1,104 @@
+# Third-party
+import requests
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+
+# First-party/Local
+from controlpanel.api.github import GithubAPI, GithubAPIException, RepositoryNotFound
+
+log = structlog.getLogger(__name__)
+
+CLOUD_PLATFORM_GITHUB_ORG = "ministryofjustice"
+CLOUD_PLATFORM_REPO_NAME = "cloud-platform-environments"
+CLOUD_PLATFORM_REPO_BRANCH = "main"
+NAMESPACES_PATH = "namespaces/live.cloud-platform.service.justice.gov.uk"
+
+NAMESPACES_CACHE_KEY = "cloud_platform_namespaces"
+
+
+class CloudPlatformNamespaces:
+    """
+    Local index of the namespaces defined in the cloud-platform-environments
+    repository.
+
+    The index is built from a single Git tree API call and kept in the cache,
+    so checking whether a namespace exists is an in-memory lookup. Namespaces
+    missing from the index are checked against the repository contents API,
+    as they may have been created since the last refresh.
+    """
+
+    def __init__(self, github_api_token=None):
+        self.github_api_token = github_api_token
+
+    @property
+    def cache_ttl(self):
+        return int(settings.CLOUD_PLATFORM_NAMESPACES_CACHE_TTL)
+
+    def _github(self):
+        return GithubAPI(self.github_api_token, github_org=CLOUD_PLATFORM_GITHUB_ORG)
+
+    def refresh(self):
+        """
+        Rebuild the index from the repository and store it in the cache.
+        Returns None if the repository could not be read.
+        """
+        try:
+            tree = self._github().get_repository_tree(
+                CLOUD_PLATFORM_REPO_NAME, f"{CLOUD_PLATFORM_REPO_BRANCH}:{NAMESPACES_PATH}"
+            )
+        except (GithubAPIException, requests.exceptions.RequestException) as error:
+            log.warning(f"Failed to refresh the cloud platform namespaces index: {error}")
+            return None
+
+        namespaces = {item["path"] for item in tree if item.get("type") == "tree"}
+        cache.set(NAMESPACES_CACHE_KEY, namespaces, timeout=self.cache_ttl)
+        log.info(f"Refreshed cloud platform namespaces index with {len(namespaces)} namespaces")
+        return namespaces
+
+    def get_index(self):
+        """
+        Returns the cached index, refreshing it if it isn't cached, or None if
+        the refresh failed
+        """
+        namespaces = cache.get(NAMESPACES_CACHE_KEY)
+        if namespaces is None:
+            namespaces = self.refresh()
+        return namespaces
+
+    def _add_to_index(self, namespace):
+        # read the index again, rather than writing back the one looked up, so
+        # namespaces other requests added since aren't lost. Without an index
+        # there is nothing to add to, the next refresh will find the namespace
+        index = cache.get(NAMESPACES_CACHE_KEY)
+        if index is not None:
+            index.add(namespace)
+            cache.set(NAMESPACES_CACHE_KEY, index, timeout=self.cache_ttl)
+
+    def _exists_in_repository(self, namespace):
+        try:
+            self._github().get_repository_contents(
+                CLOUD_PLATFORM_REPO_NAME, f"{NAMESPACES_PATH}/{namespace}"
+            )
+        except RepositoryNotFound:
+            return False
+        return True
+
+    def exists(self, namespace):
+        return self.any_exists([namespace])
+
+    def any_exists(self, namespaces):
+        """
+        Returns True if at least one of the namespaces exists, falling back to
+        the repository only when none of them are in the index.
+        """
+        index = self.get_index() or set()
+        if any(namespace in index for namespace in namespaces):
+            return True
+
+        for namespace in namespaces:
+            if self._exists_in_repository(namespace):
+                # add it now rather than waiting for the next refresh
+                self._add_to_index(namespace)
+                return True
+        return False
@@ -0,0 +1,91 @@
+"""
+Routes reads to a replica of the database (see DB_REPLICA) in views that allow it
+
+Views opt in with `use_replica`, and a view or action can opt back out with
+`use_primary`. Only safe requests read from the replica, see
+`controlpanel.middleware.ReplicaMiddleware`. Once a request writes, it reads from
+the primary for the rest of the request, and the session does for
+DB_REPLICA_STICKY_SECONDS, so it sees what it wrote despite replication lag.
+"""
+
+# Third-party
+from crequest.middleware import CrequestMiddleware
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# request attributes set when a request can read from the replica, and when it
+# has written to the primary
+READ_FROM_REPLICA = "_read_from_replica"
+WROTE_TO_PRIMARY = "_wrote_to_primary"
+# view attribute set by the decorators below
+VIEW_ATTRIBUTE = "read_from_replica"
+
+
+def use_replica(view):
+    """
+    Decorator for views, view classes or viewset actions, that lets safe requests to
+    them read from the replica
+    """
+    setattr(view, VIEW_ATTRIBUTE, True)
+    return view
+
+
+def use_primary(view):
+    """
+    Decorator for views, view classes or viewset actions that have to read from the
+    primary, overriding `use_replica` on the view class
+    """
+    setattr(view, VIEW_ATTRIBUTE, False)
+    return view
+
+
+def reads_from_replica(view_func, method):
+    """
+    Returns whether the view can read from the replica for requests with the HTTP
+    method. The handler of the method, e.g. a viewset action, takes precedence over
+    its class
+    """
+    view_class = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None)
+    handler = None
+    if view_class is not None:
+        # DRF viewsets map methods to actions
+        actions = getattr(view_func, "actions", None) or {}
+        handler = getattr(view_class, actions.get(method.lower(), method.lower()), None)
+    for view in (handler, view_class, view_func):
+        read_from_replica = getattr(view, VIEW_ATTRIBUTE, None)
+        if read_from_replica is not None:
+            return read_from_replica
+    return False
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        request = CrequestMiddleware.get_request()
+        if not settings.DB_REPLICA or not getattr(request, READ_FROM_REPLICA, False):
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # reads in a transaction on the primary should see what it has written
+            return None
+        return settings.DB_REPLICA
+
+    def db_for_write(self, model, **hints):
+        request = CrequestMiddleware.get_request()
+        if request is not None:
+            setattr(request, READ_FROM_REPLICA, False)
+            setattr(request, WROTE_TO_PRIMARY, True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica is a copy of the primary, so objects from either are related
+        if settings.DB_REPLICA and {obj1._state.db, obj2._state.db} <= {
+            DEFAULT_DB_ALIAS,
+            settings.DB_REPLICA,
+        }:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db == settings.DB_REPLICA or connections[db].settings_dict["TEST"]["MIRROR"]:
+            # the replica is migrated by replicating the primary
+            return False
+        return None
@@ -10,9 +10,8 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.exceptions import ValidationError
 
 # First-party/Local
-from controlpanel.api.models import S3Bucket
+from controlpanel.api.models import DashboardAccess, S3Bucket
 from controlpanel.api.permissions import is_superuser
-from controlpanel.utils import get_domain_from_email
 
 
 class SuperusersOnlyFilter(DjangoFilterBackend):
@@ -68,9 +67,9 @@ class AppS3BucketFilter(DjangoFilterBackend):
 
 
 class DashboardFilter(DjangoFilterBackend):
-    SHARED_VIA_VIEWER = "viewer"
-    SHARED_VIA_DOMAIN = "domain"
-    SHARED_VIA_ADMIN = "admin"
+    SHARED_VIA_VIEWER = DashboardAccess.VIA_VIEWER
+    SHARED_VIA_DOMAIN = DashboardAccess.VIA_DOMAIN
+    SHARED_VIA_ADMIN = DashboardAccess.VIA_ADMIN
     SHARED_VIA_CHOICES = {SHARED_VIA_VIEWER, SHARED_VIA_DOMAIN, SHARED_VIA_ADMIN}
 
     def filter_queryset(self, request, queryset, view):
@@ -92,26 +91,11 @@ class DashboardFilter(DjangoFilterBackend):
                 detail={"shared_via": f"Invalid shared_via value. Valid options are: {choices}"}
             )
 
-        domain = get_domain_from_email(email)
-
-        if not shared_via:
-            return queryset.filter(
-                Q(viewers__email__iexact=email)
-                | Q(whitelist_domains__name__iexact=domain)
-                | Q(admins__justice_email__iexact=email)
-            ).distinct()
-
-        shared_via_query = Q()
-        if self.SHARED_VIA_VIEWER in shared_via:
-            shared_via_query |= Q(viewers__email__iexact=email)
-
-        if self.SHARED_VIA_DOMAIN in shared_via:
-            shared_via_query |= Q(whitelist_domains__name__iexact=domain)
-
-        if self.SHARED_VIA_ADMIN in shared_via:
-            shared_via_query |= Q(admins__justice_email__iexact=email)
-
-        return queryset.filter(shared_via_query).distinct()
+        # a single lookup on the access index, see DashboardAccess
+        visible = DashboardAccess.objects.for_email(email, shared_via=shared_via).values(
+            "dashboard_id"
+        )
+        return queryset.filter(pk__in=visible)
 
 
 class UserS3BucketFilter(DjangoFilterBackend):
@@ -7,12 +7,16 @@ from typing import List
 import requests
 import structlog
 from django.conf import settings
+from django.dispatch import Signal
 
 # First-party/Local
 from controlpanel.utils import encrypt_data_by_using_public_key
 
 log = structlog.getLogger(__name__)
 
+# Sent with the rejected `api_token` when GitHub responds 401, e.g. it was revoked
+api_token_rejected = Signal()
+
 
 class GithubAPIException(Exception):
     pass
@@ -38,10 +42,12 @@ class GithubAPI:
         self.github_org = github_org or settings.GITHUB_ORGS[0]
 
         self.headers = {
-            "Authorization": "Bearer {}".format(self.api_token),
             "Content-Type": "application/vnd.github+json",
             "X-GitHub-Api-Version": settings.GITHUB_VERSION,
         }
+        # public repositories can be read without a token, e.g. from scheduled tasks
+        if self.api_token:
+            self.headers["Authorization"] = "Bearer {}".format(self.api_token)
 
     def get_repos(self, page: int) -> List[dict]:
         params = {"page": page, "per_page": 100, "sort": "created", "direction": "desc"}
@@ -82,6 +88,21 @@ class GithubAPI:
 
         return self._process_response(response)
 
+    def get_repository_tree(self, repo_name: str, tree_ish: str):
+        """
+        Lists the entries of a tree with the Git trees API. `tree_ish` can be
+        a SHA or a `<branch>:<path>` expression, so a single call is enough to
+        list a directory of any size.
+        """
+        response = requests.get(
+            self._get_repo_api_url(repo_name=repo_name, api_call=f"git/trees/{tree_ish}"),
+            headers=self.headers,
+        )
+        if response.status_code == 404:
+            raise RepositoryNotFound(f"Tree '{tree_ish}' in {repo_name} not found")
+
+        return self._process_response(response).get("tree", [])
+
     def read_app_deploy_info(self, repo_name: str, deploy_file="deploy.json"):
         response = requests.get(
             self._get_repo_api_url(repo_name=repo_name, api_call=f"contents/{deploy_file}"),
@@ -95,6 +116,8 @@ class GithubAPI:
             return {}
 
     def _process_response(self, response):
+        if response.status_code == 401 and self.api_token:
+            api_token_rejected.send(sender=self.__class__, api_token=self.api_token)
         if response.status_code >= 300:
             response.raise_for_status()
         if not response.text and response.status_code != 204:
@@ -0,0 +1,166 @@
+# Standard library
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+# Third-party
+import sentry_sdk
+import structlog
+from django.db.models import Exists, OuterRef
+
+# First-party/Local
+from controlpanel.api import cluster
+
+log = structlog.getLogger(__name__)
+
+# GitHub secondary rate limits kick in quickly for concurrent writes, so keep
+# the number of in-flight secret updates small
+DEFAULT_MAX_WORKERS = 8
+
+
+def collapse_ip_ranges(ip_ranges):
+    """
+    Collapse an iterable of comma-separated IP range strings into the smallest
+    equivalent list of networks, merging overlapping and adjacent CIDRs.
+    Single hosts are rendered without a prefix length to match how they are
+    usually entered in an IP allowlist.
+    """
+    networks = {4: [], 6: []}
+    for value in ip_ranges:
+        for item in (value or "").split(","):
+            item = item.strip()
+            if not item:
+                continue
+            network = ipaddress.ip_network(item, strict=False)
+            networks[network.version].append(network)
+
+    collapsed = []
+    for version in (4, 6):
+        for network in ipaddress.collapse_addresses(networks[version]):
+            if network.prefixlen == network.max_prefixlen:
+                collapsed.append(str(network.network_address))
+            else:
+                collapsed.append(str(network))
+    return collapsed
+
+
+@dataclass
+class PropagationItem:
+    app: object
+    env_name: str
+    previous_ip_ranges: list
+    ip_ranges: list
+
+    @property
+    def has_changed(self):
+        return self.previous_ip_ranges != self.ip_ranges
+
+    @property
+    def secret_value(self):
+        return ",".join(self.ip_ranges)
+
+
+class IPAllowlistPropagator:
+    """
+    Pushes the effective IP_RANGES secret to every app environment affected by
+    a change to an IPAllowlist.
+
+    The affected (app, env) pairs and all of their allowlists are loaded with a
+    single query, environments whose collapsed set of networks has not changed
+    are skipped, and the remaining GitHub secret writes run concurrently.
+    """
+
+    def __init__(self, github_api_token, max_workers=DEFAULT_MAX_WORKERS, progress_callback=None):
+        self.github_api_token = github_api_token
+        self.max_workers = max_workers
+        self.progress_callback = progress_callback
+
+    def _get_affected_rows(self, ip_allowlist):
+        # First-party/Local
+        from controlpanel.api.models import AppIPAllowList
+
+        linked = AppIPAllowList.objects.filter(
+            app_id=OuterRef("app_id"),
+            deployment_env=OuterRef("deployment_env"),
+            ip_allowlist_id=ip_allowlist.pk,
+        )
+        return (
+            AppIPAllowList.objects.filter(Exists(linked))
+            .select_related("app", "ip_allowlist")
+            .order_by("app_id", "deployment_env", "ip_allowlist_id")
+        )
+
+    def plan(self, ip_allowlist, previous_ip_ranges=None, removed=False):
+        """
+        Work out the secret value for each (app, env) pair the allowlist is
+        linked to. `previous_ip_ranges` is the allowlist's value before an
+        update; `removed` marks the allowlist as being unlinked from every app.
+        """
+        if previous_ip_ranges is None:
+            previous_ip_ranges = ip_allowlist.allowed_ip_ranges
+
+        pairs = {}
+        for row in self._get_affected_rows(ip_allowlist):
+            key = (row.app_id, row.deployment_env)
+            app, previous, current = pairs.setdefault(key, (row.app, [], []))
+            if row.ip_allowlist_id == ip_allowlist.pk:
+                previous.append(previous_ip_ranges)
+                if not removed:
+                    current.append(ip_allowlist.allowed_ip_ranges)
+            else:
+                previous.append(row.ip_allowlist.allowed_ip_ranges)
+                current.append(row.ip_allowlist.allowed_ip_ranges)
+
+        plan = []
+        for (_, env_name), (app, previous, current) in pairs.items():
+            item = PropagationItem(
+                app=app,
+                env_name=env_name,
+                previous_ip_ranges=collapse_ip_ranges(previous),
+                ip_ranges=collapse_ip_ranges(current),
+            )
+            if item.has_changed:
+                plan.append(item)
+            else:
+                log.info(f"IP ranges unchanged for {app.slug} ({env_name}), skipping")
+        return plan
+
+    def _update_secret(self, item):
+        cluster.App(item.app, self.github_api_token).create_or_update_secret(
+            env_name=item.env_name,
+            secret_key=cluster.App.IP_RANGES,
+            secret_value=item.secret_value,
+        )
+
+    def apply(self, plan):
+        """
+        Update the IP_RANGES secret for every item in the plan. Failures are
+        logged and reported rather than raised, so one broken repository does
+        not stop the rest of the propagation.
+        Returns a list of (item, error) tuples for the failed updates.
+        """
+        failures = []
+        total = len(plan)
+        if not total:
+            return failures
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._update_secret, item): item for item in plan}
+            for done, future in enumerate(as_completed(futures), start=1):
+                item = futures[future]
+                error = future.exception()
+                if error:
+                    failures.append((item, error))
+                    log.error(
+                        f"Failed updating IP ranges for {item.app.slug} ({item.env_name}): {error}"
+                    )
+                    sentry_sdk.capture_exception(error)
+                log.info(f"IP ranges propagation progress: {done}/{total}")
+                if self.progress_callback:
+                    self.progress_callback(done=done, total=total, item=item, error=error)
+        return failures
+
+    def propagate(self, ip_allowlist, previous_ip_ranges=None, removed=False):
+        return self.apply(
+            self.plan(ip_allowlist, previous_ip_ranges=previous_ip_ranges, removed=removed)
+        )
@@ -1,6 +1,9 @@
 # Third-party
+from django.db import connections
 from django_prometheus.conf import NAMESPACE
-from prometheus_client import Counter
+from prometheus_client import REGISTRY, Counter
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
 
 login_events = Counter(
     "django_control_panel_login_events",
@@ -8,3 +11,64 @@ login_events = Counter(
     ["model"],
     namespace=NAMESPACE,
 )
+
+
+def _metric_name(name):
+    return f"{NAMESPACE}_{name}" if NAMESPACE else name
+
+
+class DatabasePoolCollector(Collector):
+    """
+    Reports the size of the database connection pools, and how long requests for a
+    connection have waited, when connections are pooled (see DB_POOL)
+    """
+
+    def _families(self):
+        size = GaugeMetricFamily(
+            _metric_name("django_control_panel_db_pool_size"),
+            "Number of connections in the pool, in use or not",
+            labels=["alias"],
+        )
+        available = GaugeMetricFamily(
+            _metric_name("django_control_panel_db_pool_available"),
+            "Number of connections in the pool that aren't in use",
+            labels=["alias"],
+        )
+        waiting = GaugeMetricFamily(
+            _metric_name("django_control_panel_db_pool_requests_waiting"),
+            "Number of requests waiting for a connection from the pool",
+            labels=["alias"],
+        )
+        requests = CounterMetricFamily(
+            _metric_name("django_control_panel_db_pool_requests"),
+            "Number of connections requested from the pool",
+            labels=["alias"],
+        )
+        wait = CounterMetricFamily(
+            _metric_name("django_control_panel_db_pool_wait_seconds"),
+            "Time spent waiting for a connection from the pool",
+            labels=["alias"],
+        )
+        return size, available, waiting, requests, wait
+
+    def describe(self):
+        # registering the collector would otherwise collect the metrics to find
+        # their names, connecting to the database while the apps are loading
+        return self._families()
+
+    def collect(self):
+        size, available, waiting, requests, wait = self._families()
+        for alias in connections:
+            pool = getattr(connections[alias], "pool", None)
+            if pool is None:
+                continue
+            stats = pool.get_stats()
+            size.add_metric([alias], stats.get("pool_size", 0))
+            available.add_metric([alias], stats.get("pool_available", 0))
+            waiting.add_metric([alias], stats.get("requests_waiting", 0))
+            requests.add_metric([alias], stats.get("requests_num", 0))
+            wait.add_metric([alias], stats.get("requests_wait_ms", 0) / 1000)
+        yield from (size, available, waiting, requests, wait)
+
+
+REGISTRY.register(DatabasePoolCollector())
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.16 on 2026-10-19 07:59
+
+import django.db.models.deletion
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0083_app_is_comprehend_enabled"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AppCustomerGroup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "created",
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name="modified"
+                    ),
+                ),
+                ("env_name", models.CharField(max_length=100)),
+                ("group_id", models.CharField(max_length=128, unique=True)),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "app",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="customer_groups",
+                        to="api.app",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "control_panel_api_app_customer_group",
+                "ordering": ("app", "env_name"),
+            },
+        ),
+        migrations.CreateModel(
+            name="AppCustomer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("user_id", models.CharField(max_length=128)),
+                ("email", models.CharField(max_length=254)),
+                ("name", models.CharField(blank=True, max_length=254)),
+                ("nickname", models.CharField(blank=True, max_length=128)),
+                (
+                    "group",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="customers",
+                        to="api.appcustomergroup",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "control_panel_api_app_customer",
+                "ordering": ("email", "user_id"),
+                "indexes": [
+                    models.Index(
+                        fields=["group", "email", "user_id"], name="app_customer_page_idx"
+                    ),
+                    models.Index(
+                        fields=["group", "email"],
+                        name="app_customer_search_idx",
+                        opclasses=["int8_ops", "varchar_pattern_ops"],
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("group", "user_id"), name="unique_app_customer_group_user"
+                    )
+                ],
+            },
+        ),
+    ]
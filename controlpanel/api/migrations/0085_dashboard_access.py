@@ -0,0 +1,113 @@
+# Generated by Django 5.2.16 on 2026-10-19 08:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_dashboard_access(apps, schema_editor):
+    """
+    Build the access index from the existing admin, viewer and domain access.
+    """
+    DashboardAccess = apps.get_model("api", "DashboardAccess")
+    sources = [
+        (
+            "admin",
+            apps.get_model("api", "DashboardAdminAccess")
+            .objects.exclude(user__justice_email__isnull=True)
+            .exclude(user__justice_email=""),
+            "user__justice_email",
+            "added_by_id",
+        ),
+        (
+            "viewer",
+            apps.get_model("api", "DashboardViewerAccess").objects.all(),
+            "viewer__email",
+            "shared_by_id",
+        ),
+        (
+            "domain",
+            apps.get_model("api", "DashboardDomainAccess").objects.all(),
+            "domain__name",
+            "added_by_id",
+        ),
+    ]
+    for via, queryset, principal_field, shared_by_field in sources:
+        records = queryset.order_by("created").values_list(
+            "dashboard_id", principal_field, shared_by_field, "created"
+        )
+        # ordered oldest first, so the earliest record of any duplicates is kept
+        DashboardAccess.objects.bulk_create(
+            [
+                DashboardAccess(
+                    dashboard_id=dashboard_id,
+                    principal=principal.lower(),
+                    via=via,
+                    shared_by_id=shared_by_id,
+                    shared_on=created,
+                )
+                for dashboard_id, principal, shared_by_id, created in records.iterator()
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0084_app_customer_mirror"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardAccess",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("principal", models.CharField(max_length=254)),
+                (
+                    "via",
+                    models.CharField(
+                        choices=[("admin", "Admin"), ("viewer", "Viewer"), ("domain", "Domain")],
+                        max_length=6,
+                    ),
+                ),
+                ("shared_on", models.DateTimeField()),
+                (
+                    "dashboard",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="access_index",
+                        to="api.dashboard",
+                    ),
+                ),
+                (
+                    "shared_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "control_panel_api_dashboard_access",
+                "indexes": [
+                    models.Index(
+                        fields=["principal", "via", "dashboard"], name="dashboard_access_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dashboard", "principal", "via"), name="unique_dashboard_access"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_dashboard_access, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.16 on 2026-10-19
+
+import structlog
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import migrations
+
+log = structlog.getLogger(__name__)
+
+# trigram indexes on the upper case fields, which serve the case insensitive
+# `icontains` and `istartswith` lookups of the global search, the user list and
+# the admin's search fields
+TRIGRAM_INDEXES = {
+    "app_name_trgm_idx": ("App", "name"),
+    "app_slug_trgm_idx": ("App", "slug"),
+    "app_repo_url_trgm_idx": ("App", "repo_url"),
+    "s3bucket_name_trgm_idx": ("S3Bucket", "name"),
+    "user_username_trgm_idx": ("User", "username"),
+    "user_email_trgm_idx": ("User", "email"),
+    "user_name_trgm_idx": ("User", "name"),
+    "dashboard_name_trgm_idx": ("Dashboard", "name"),
+    "dashboard_quicksight_id_trgm_idx": ("Dashboard", "quicksight_id"),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Create the pg_trgm extension and the indexes. Searching works without them,
+    scanning the tables instead, so they can be skipped when the extension isn't
+    available if DB_PG_TRGM_OPTIONAL is set.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            if not settings.DB_PG_TRGM_OPTIONAL:
+                raise ImproperlyConfigured(
+                    "The pg_trgm extension needed by the search indexes isn't available, "
+                    "set DB_PG_TRGM_OPTIONAL to True to migrate without them"
+                )
+            log.warning("The pg_trgm extension isn't available, skipped the search indexes")
+            return
+
+    quote_name = schema_editor.quote_name
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, (model_name, field_name) in TRIGRAM_INDEXES.items():
+        model = apps.get_model("api", model_name)
+        column = model._meta.get_field(field_name).column
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote_name(index_name)} "
+            f"ON {quote_name(model._meta.db_table)} "
+            f"USING gin (UPPER({quote_name(column)}::text) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    for index_name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(index_name)}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0087_user_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
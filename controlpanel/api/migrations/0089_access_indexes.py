@@ -0,0 +1,72 @@
+# Generated by Django 5.2.16 on 2026-10-19 11:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0088_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dashboardvieweraccess",
+            index=models.Index(fields=["viewer", "dashboard"], name="dashboard_viewer_access_idx"),
+        ),
+        migrations.AlterField(
+            model_name="dashboardvieweraccess",
+            name="viewer",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="api.dashboardviewer",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tooldeployment",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["user", "tool_type"],
+                name="tooldeployment_user_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tooldeployment",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["tool"],
+                name="tooldeployment_tool_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userapp",
+            index=models.Index(
+                condition=models.Q(("is_admin", True)), fields=["app"], name="userapp_app_admin_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userapp",
+            index=models.Index(
+                condition=models.Q(("is_admin", True)),
+                fields=["user"],
+                name="userapp_user_admin_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="users3bucket",
+            index=models.Index(
+                condition=models.Q(("is_admin", True)),
+                fields=["s3bucket"],
+                name="users3bucket_bucket_admin_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="users3bucket",
+            index=models.Index(
+                condition=models.Q(("is_admin", True)),
+                fields=["user"],
+                name="users3bucket_user_admin_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.16 on 2026-10-19
+
+from django.db import migrations
+
+TASK_NAME = "Sync app customers from Auth0"
+
+
+def schedule_task(apps, schema_editor):
+    """
+    Run the customers sync hourly with celery beat. The schedule can be changed
+    in the celery beat admin, so an existing task is left as it is.
+    """
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    # the beat admin can create duplicate schedules, so use any of them
+    interval = IntervalSchedule.objects.filter(every=1, period="hours").first()
+    if interval is None:
+        interval = IntervalSchedule.objects.create(every=1, period="hours")
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "controlpanel.api.tasks.customers.sync_app_customers",
+            "interval": interval,
+            "description": "Reconcile the app customers mirror with the Auth0 groups",
+        },
+    )
+
+
+def unschedule_task(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0089_access_indexes"),
+        ("django_celery_beat", "0018_improve_crontab_helptext"),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_task, unschedule_task),
+    ]
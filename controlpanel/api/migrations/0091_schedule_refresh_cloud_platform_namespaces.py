@@ -0,0 +1,43 @@
+# Generated by Django 5.2.16 on 2026-10-19
+
+from django.db import migrations
+
+TASK_NAME = "Refresh cloud platform namespaces"
+
+
+def schedule_task(apps, schema_editor):
+    """
+    Refresh the namespaces index every 30 minutes with celery beat, well within
+    the default cache TTL of an hour. The schedule can be changed in the celery
+    beat admin, so an existing task is left as it is.
+    """
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    # the beat admin can create duplicate schedules, so use any of them
+    interval = IntervalSchedule.objects.filter(every=30, period="minutes").first()
+    if interval is None:
+        interval = IntervalSchedule.objects.create(every=30, period="minutes")
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "controlpanel.api.tasks.cloud_platform.refresh_cloud_platform_namespaces",
+            "interval": interval,
+            "description": "Rebuild the cached index of cloud platform namespaces",
+        },
+    )
+
+
+def unschedule_task(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0090_schedule_sync_app_customers"),
+        ("django_celery_beat", "0018_improve_crontab_helptext"),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_task, unschedule_task),
+    ]
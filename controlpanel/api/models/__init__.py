@@ -6,16 +6,19 @@ from controlpanel.api.models.ip_allowlist import IPAllowlist
 # isort: on
 # First-party/Local
 from controlpanel.api.models.app import App
+from controlpanel.api.models.app_customer import AppCustomer, AppCustomerGroup
 from controlpanel.api.models.app_ip_allowlist import AppIPAllowList
 from controlpanel.api.models.apps3bucket import AppS3Bucket
 from controlpanel.api.models.dashboard import (
     Dashboard,
+    DashboardAccess,
     DashboardAdminAccess,
     DashboardDomainAccess,
     DashboardViewerAccess,
 )
 from controlpanel.api.models.dashboard_domain import DashboardDomain
 from controlpanel.api.models.dashboard_viewer import DashboardViewer
+from controlpanel.api.models.email_notification import EmailNotification
 from controlpanel.api.models.feedback import Feedback
 from controlpanel.api.models.iam_managed_policy import IAMManagedPolicy
 from controlpanel.api.models.justice_domain import JusticeDomain
@@ -17,7 +17,9 @@ from django_extensions.db.models import TimeStampedModel
 # First-party/Local
 from controlpanel.api import auth0, cluster, tasks
 from controlpanel.api.exceptions import AddCustomerError, DeleteCustomerError
+from controlpanel.api.ip_ranges import collapse_ip_ranges
 from controlpanel.api.models import IPAllowlist
+from controlpanel.api.models.app_customer import AppCustomerGroup
 from controlpanel.utils import github_repository_name, s3_slugify, webapp_release_name
 
 BASE_CLOUD_PLATFORM_ASSUME_ROLE_POLICY = {
@@ -139,12 +141,26 @@ class App(TimeStampedModel):
         return self.get_auth_client(env_name).get("group_id")
 
     def customers(self, env_name=None):
-        return (
-            auth0.ExtendedAuth0().groups.get_group_members(group_id=self.get_group_id(env_name))
-            or []
-        )
+        group_id = self.get_group_id(env_name)
+        customer_group = AppCustomerGroup.objects.synced(group_id)
+        if customer_group:
+            return customer_group.customers.as_auth0_users()
+
+        return auth0.ExtendedAuth0().groups.get_group_members(group_id=group_id) or []
+
+    def customer_paginated(self, page, group_id, per_page=25, search=None):
+        """
+        Customers are read from the local mirror once the group has been
+        synced, Auth0 is only called for groups which haven't been yet.
+        Auth0 can't search the members of a group, so searching syncs the group
+        first if needed.
+        """
+        customer_group = AppCustomerGroup.objects.synced(group_id)
+        if customer_group is None and search:
+            customer_group = self.sync_customer_group(group_id)
+        if customer_group:
+            return customer_group.customers.search(search).page(page, per_page)
 
-    def customer_paginated(self, page, group_id, per_page=25):
         return (
             auth0.ExtendedAuth0().groups.get_group_members_paginated(
                 group_id, page=page, per_page=per_page
@@ -152,6 +168,40 @@ class App(TimeStampedModel):
             or []
         )
 
+    def customers_after(self, group_id, after=None, after_id=None, per_page=25, search=None):
+        """
+        Keyset paginated customers, starting after the customer with the given
+        email and user_id. Returns None if the group hasn't been synced yet.
+        """
+        customer_group = AppCustomerGroup.objects.synced(group_id)
+        if customer_group is None:
+            return None
+        customers = customer_group.customers.search(search)
+        return {
+            "total": customers.count(),
+            "users": customers.after(after, after_id)[:per_page].as_auth0_users(),
+        }
+
+    def sync_customer_group(self, group_id, authz=None):
+        """
+        Copy the members of one of the app's Auth0 groups to the local mirror
+        """
+        authz = authz or auth0.ExtendedAuth0()
+        members = authz.groups.get_group_members(group_id=group_id)
+        env_name = self.get_auth0_group_list().get(group_id, "")
+        return AppCustomerGroup.objects.sync(self, env_name, group_id, members)
+
+    def sync_customers(self):
+        """
+        Copy the members of all the app's Auth0 groups to the local mirror
+        """
+        group_ids = list(self.get_auth0_group_list())
+        self.customer_groups.exclude(group_id__in=group_ids).delete()
+
+        authz = auth0.ExtendedAuth0()
+        for group_id in group_ids:
+            self.sync_customer_group(group_id, authz=authz)
+
     def auth0_connections(self, env_name):
         client_id = self.get_auth_client(env_name).get("client_id")
         connections = auth0.ExtendedAuth0().get_client_enabled_connections([client_id])
@@ -177,28 +227,47 @@ class App(TimeStampedModel):
 
     def auth0_clients_status(self):
         """Check the status of the auth0-clients stored in the app_conf field"""
-        status = {}
-        for env_name, client_info in (
-            (self.app_conf or {}).get(self.KEY_WORD_FOR_AUTH_SETTINGS) or {}
-        ).items():
-            if client_info.get("client_id"):
-                try:
-                    auth0.ExtendedAuth0().clients.get(client_info.get("client_id"))
-                    status[env_name] = {"client_id": client_info.get("client_id"), "ok": True}
-                except Auth0Error as error:
+        return App.auth0_clients_status_for([self])[self.pk]
+
+    @staticmethod
+    def auth0_clients_status_for(apps):
+        """
+        Check the status of the auth0-clients of each of the apps, returned by
+        app pk. All the clients are checked against a single (cached) listing
+        of the client ids, however many apps and environments there are.
+        """
+        client_ids, error_msg = None, None
+        try:
+            client_ids = auth0.ExtendedAuth0().clients.get_client_ids()
+        except (Auth0Error, auth0.Auth0Error) as error:
+            error_msg = error.__str__()
+
+        statuses = {}
+        for app in apps:
+            status = statuses[app.pk] = {}
+            for env_name, client_info in (
+                (app.app_conf or {}).get(App.KEY_WORD_FOR_AUTH_SETTINGS) or {}
+            ).items():
+                client_id = client_info.get("client_id")
+                if not client_id:
+                    continue
+                if client_ids is not None and client_id in client_ids:
+                    status[env_name] = {"client_id": client_id, "ok": True}
+                else:
                     status[env_name] = {
-                        "client_id": client_info.get("client_id"),
+                        "client_id": client_id,
                         "ok": False,
-                        "error_msg": error.__str__(),
+                        "error_msg": error_msg or "The client does not exist",
                     }
-        return status
+        return statuses
 
     @property
     def app_allowed_ip_ranges(self):
-        allowed_ip_ranges = self.ip_allowlists.values_list("allowed_ip_ranges", flat=True).order_by(
-            "pk"
-        )
-        cleaned_ip_ranges = ",".join(list(set(allowed_ip_ranges))).replace(" ", "")
+        # read through all(), so prefetched allowlists are used
+        allowed_ip_ranges = {
+            ip_allowlist.allowed_ip_ranges for ip_allowlist in self.ip_allowlists.all()
+        }
+        cleaned_ip_ranges = ",".join(allowed_ip_ranges).replace(" ", "")
         return cleaned_ip_ranges
 
     def env_allowed_ip_ranges(self, env_name):
@@ -210,8 +279,8 @@ class App(TimeStampedModel):
             .values_list("allowed_ip_ranges", flat=True)
             .order_by("pk")
         )
-        cleaned_ip_ranges = ",".join(list(allowed_ip_ranges)).replace(" ", "")
-        return cleaned_ip_ranges
+        # overlapping and adjacent networks are merged to keep the secret small
+        return ",".join(collapse_ip_ranges(allowed_ip_ranges))
 
     def env_allowed_ip_ranges_names(self, env_name):
         related_item_ids = self.appipallowlists.filter(deployment_env=env_name).values_list(
@@ -230,20 +299,31 @@ class App(TimeStampedModel):
         )
         return list(related_item_ids)
 
-    def add_customers(self, emails, env_name=None, group_id=None):
+    def add_customers(self, emails, env_name=None, group_id=None, progress_callback=None):
         emails = list(filter(None, emails))
         if emails:
             if not group_id:
                 group_id = self.get_group_id(env_name)
             try:
-                auth0.ExtendedAuth0().add_group_members_by_emails(
+                user_ids = auth0.ExtendedAuth0().add_group_members_by_emails(
                     emails=emails,
                     user_options={"connection": "email"},
                     group_id=group_id,
+                    progress_callback=progress_callback,
                 )
             except auth0.Auth0Error as e:
                 raise AddCustomerError from e
 
+            # user ids are returned in the order of the de-duplicated emails
+            emails = dict.fromkeys(email.lower() for email in emails)
+            AppCustomerGroup.objects.add_members(
+                group_id,
+                [
+                    {"email": email, "user_id": user_id, "nickname": email.partition("@")[0]}
+                    for email, user_id in zip(emails, user_ids or [], strict=False)
+                ],
+            )
+
     def delete_customers(self, user_ids, env_name=None, group_id=None):
         try:
             if not group_id:
@@ -254,6 +334,7 @@ class App(TimeStampedModel):
             )
         except auth0.Auth0Error as e:
             raise DeleteCustomerError from e
+        AppCustomerGroup.objects.remove_members(group_id, user_ids)
 
     def delete_customer_by_email(self, email, group_id=None, env_name=None):
         """
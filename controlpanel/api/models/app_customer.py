@@ -0,0 +1,166 @@
+# Third-party
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django_extensions.db.models import TimeStampedModel
+
+
+class AppCustomerGroupManager(models.Manager):
+    def synced(self, group_id):
+        """
+        Returns the mirror of the group if it has been synced with Auth0 at
+        least once, otherwise None.
+        """
+        return self.filter(group_id=group_id, synced_at__isnull=False).first()
+
+    def add_members(self, group_id, members):
+        """Write through customers added to the group in Auth0"""
+        group = self.synced(group_id)
+        if group is None:
+            return
+        AppCustomer.objects.bulk_create(
+            [AppCustomer.from_auth0(group, member) for member in members if member.get("user_id")],
+            ignore_conflicts=True,
+        )
+
+    def remove_members(self, group_id, user_ids):
+        """Write through customers removed from the group in Auth0"""
+        AppCustomer.objects.filter(group__group_id=group_id, user_id__in=user_ids).delete()
+
+    def sync(self, app, env_name, group_id, members):
+        """
+        Replace the mirrored members of the group with `members`, the list of
+        users returned by the authorization extension.
+        """
+        members = {member["user_id"]: member for member in members if member.get("user_id")}
+        with transaction.atomic():
+            group, _ = self.select_for_update().update_or_create(
+                group_id=group_id, defaults={"app": app, "env_name": env_name}
+            )
+            existing = {customer.user_id: customer for customer in group.customers.all()}
+
+            group.customers.filter(user_id__in=set(existing) - set(members)).delete()
+
+            to_create = []
+            to_update = []
+            for user_id, member in members.items():
+                customer = existing.get(user_id)
+                if customer is None:
+                    to_create.append(AppCustomer.from_auth0(group, member))
+                elif customer.update_from_auth0(member):
+                    to_update.append(customer)
+            AppCustomer.objects.bulk_create(to_create, ignore_conflicts=True)
+            AppCustomer.objects.bulk_update(to_update, ["email", "name", "nickname"])
+
+            group.synced_at = timezone.now()
+            group.save(update_fields=["synced_at", "modified"])
+        return group
+
+
+class AppCustomerGroup(TimeStampedModel):
+    """
+    Local mirror of an app environment's Auth0 authorization extension group,
+    so customers can be listed and searched without calling Auth0.
+    `synced_at` is empty until the group has been copied from Auth0, and the
+    mirror shouldn't be read before then.
+    """
+
+    app = models.ForeignKey("App", on_delete=models.CASCADE, related_name="customer_groups")
+    env_name = models.CharField(max_length=100)
+    group_id = models.CharField(max_length=128, unique=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    objects = AppCustomerGroupManager()
+
+    class Meta:
+        db_table = "control_panel_api_app_customer_group"
+        ordering = ("app", "env_name")
+
+    def __repr__(self):
+        return f"<AppCustomerGroup: {self.app_id}|{self.env_name}>"
+
+
+class AppCustomerQuerySet(models.QuerySet):
+    def search(self, term):
+        if not term:
+            return self
+        return self.filter(email__startswith=term.strip().lower())
+
+    def after(self, email, user_id=None):
+        """
+        Keyset pagination on the (email, user_id) ordering, using the last
+        customer of the previous page.
+        """
+        if not email:
+            return self
+        condition = Q(email__gt=email)
+        if user_id:
+            condition |= Q(email=email, user_id__gt=user_id)
+        return self.filter(condition)
+
+    def as_auth0_users(self):
+        # Auth0 leaves out the fields a user doesn't have, rather than blank
+        return [
+            {field: value for field, value in user.items() if value}
+            for user in self.values("email", "user_id", "name", "nickname")
+        ]
+
+    def page(self, page, per_page):
+        """Page numbered slice, in the same format as the Auth0 group members API"""
+        start = (page - 1) * per_page
+        return {
+            "total": self.count(),
+            "users": self[start : start + per_page].as_auth0_users(),
+        }
+
+
+class AppCustomer(models.Model):
+    group = models.ForeignKey(AppCustomerGroup, on_delete=models.CASCADE, related_name="customers")
+    user_id = models.CharField(max_length=128)
+    # stored lower case, so prefix searches can use the index
+    email = models.CharField(max_length=254)
+    name = models.CharField(max_length=254, blank=True)
+    nickname = models.CharField(max_length=128, blank=True)
+
+    objects = AppCustomerQuerySet.as_manager()
+
+    class Meta:
+        db_table = "control_panel_api_app_customer"
+        ordering = ("email", "user_id")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["group", "user_id"], name="unique_app_customer_group_user"
+            ),
+        ]
+        indexes = [
+            # keyset pagination within a group
+            models.Index(fields=["group", "email", "user_id"], name="app_customer_page_idx"),
+            # prefix search on email, LIKE can't use the index above unless
+            # the database collation is "C"
+            models.Index(
+                fields=["group", "email"],
+                name="app_customer_search_idx",
+                opclasses=["int8_ops", "varchar_pattern_ops"],
+            ),
+        ]
+
+    def __str__(self):
+        return self.email
+
+    @classmethod
+    def from_auth0(cls, group, member):
+        customer = cls(group=group, user_id=member["user_id"])
+        customer.update_from_auth0(member)
+        return customer
+
+    def update_from_auth0(self, member):
+        """Copy the fields of an Auth0 user, returns True if any changed"""
+        values = {
+            "email": (member.get("email") or "").lower(),
+            "name": member.get("name") or "",
+            "nickname": member.get("nickname") or "",
+        }
+        changed = any(getattr(self, field) != value for field, value in values.items())
+        for field, value in values.items():
+            setattr(self, field, value)
+        return changed
@@ -1,14 +1,22 @@
 # Third-party
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
 from django_extensions.db.models import TimeStampedModel
 from simple_history.models import HistoricalRecords
+from simple_history.utils import bulk_create_with_history
 
 # First-party/Local
 from controlpanel import utils
+from controlpanel.api import auth0
 from controlpanel.api.aws import AWSQuicksight, arn
+from controlpanel.api.exceptions import AddViewerError
+from controlpanel.api.models.dashboard_domain import DashboardDomain
 from controlpanel.api.models.dashboard_viewer import DashboardViewer
+from controlpanel.api.models.email_notification import EmailNotification
 
 
 class DashboardAdminAccess(TimeStampedModel):
@@ -31,7 +39,8 @@ class DashboardViewerAccess(TimeStampedModel):
     dashboard = models.ForeignKey(
         "Dashboard", on_delete=models.CASCADE, related_name="viewer_access"
     )
-    viewer = models.ForeignKey("DashboardViewer", on_delete=models.CASCADE)
+    # dashboard_viewer_access_idx starts with the viewer, so serves its lookups
+    viewer = models.ForeignKey("DashboardViewer", on_delete=models.CASCADE, db_index=False)
     shared_by = models.ForeignKey(
         "User", on_delete=models.SET_NULL, null=True, related_name="dashboard_viewers_shared_set"
     )
@@ -40,6 +49,10 @@ class DashboardViewerAccess(TimeStampedModel):
     class Meta:
         db_table = "control_panel_api_dashboard_viewer_access"
         ordering = ["-created"]
+        indexes = [
+            # whether a viewer has been shared a dashboard
+            models.Index(fields=["viewer", "dashboard"], name="dashboard_viewer_access_idx"),
+        ]
         verbose_name_plural = "dashboard viewer access records"
 
 
@@ -127,64 +140,93 @@ class Dashboard(TimeStampedModel):
 
     def add_viewers(self, emails, shared_by):
         """
-        Add viewers to the dashboard and notify them.
+        Add viewers to the dashboard and queue emails notifying them. Viewers
+        that are new are given the dashboard role in Auth0 with one batched
+        write, and the viewers and their access are created in bulk.
 
         Args:
             emails: List of email addresses to add as viewers.
             shared_by: User object representing who shared the dashboard.
 
         Returns:
-            List of emails that could not be notified.
+            List of the queued EmailNotification, one per viewer.
         """
-        not_notified = []
-        inviter_email = (
-            shared_by.justice_email.lower() if shared_by and shared_by.justice_email else None
-        )
-        for email in emails:
-            viewer, _ = DashboardViewer.objects.get_or_create(email=email.lower())
-            DashboardViewerAccess.objects.get_or_create(
-                dashboard=self,
-                viewer=viewer,
-                defaults={"shared_by": shared_by},
-            )
+        emails = list(dict.fromkeys(email.lower() for email in emails))
+        if not emails:
+            return []
 
+        existing = set(
+            DashboardViewer.objects.filter(email__in=emails).values_list("email", flat=True)
+        )
+        new_emails = [email for email in emails if email not in existing]
+        if new_emails:
             try:
-                utils.govuk_notify_send_email(
-                    email_address=email,
-                    template_id=settings.NOTIFY_DASHBOARD_ACCESS_TEMPLATE_ID,
-                    personalisation={
-                        "dashboard": self.name,
-                        "dashboard_link": self.url,
-                        "dashboard_home": settings.DASHBOARD_SERVICE_URL,
-                        "dashboard_admin": inviter_email,
-                        "dashboard_description": self.description,
-                    },
+                auth0.ExtendedAuth0().add_dashboard_members_by_emails(
+                    new_emails, user_options={"connection": "email"}
                 )
-            except utils.GovukNotifyEmailError:
-                not_notified.append(email)
+            except auth0.Auth0Error as e:
+                raise AddViewerError from e
+            # bulk_create doesn't call DashboardViewer.save, which would add
+            # them to Auth0 one at a time
+            DashboardViewer.objects.bulk_create(
+                [DashboardViewer(email=email) for email in new_emails], ignore_conflicts=True
+            )
 
-        return not_notified
+        with transaction.atomic():
+            viewers = DashboardViewer.objects.filter(email__in=emails)
+            with_access = set(
+                self.viewer_access.filter(viewer__in=viewers).values_list("viewer_id", flat=True)
+            )
+            bulk_create_with_history(
+                [
+                    DashboardViewerAccess(dashboard=self, viewer=viewer, shared_by=shared_by)
+                    for viewer in viewers
+                    if viewer.pk not in with_access
+                ],
+                DashboardViewerAccess,
+                default_user=shared_by,
+            )
+            # bulk_create doesn't send post_save, which keeps the index in sync
+            DashboardAccess.objects.sync([self.pk])
+
+        inviter_email = (
+            shared_by.justice_email.lower() if shared_by and shared_by.justice_email else None
+        )
+        return EmailNotification.objects.queue(
+            emails,
+            template_id=settings.NOTIFY_DASHBOARD_ACCESS_TEMPLATE_ID,
+            personalisation={
+                "dashboard": self.name,
+                "dashboard_link": self.url,
+                "dashboard_home": settings.DASHBOARD_SERVICE_URL,
+                "dashboard_admin": inviter_email,
+                "dashboard_description": self.description,
+            },
+        )
 
     def delete_viewers(self, viewers, admin):
         """
-        Remove the given viewers from the dashboard.
+        Remove the given viewers from the dashboard and queue emails notifying
+        them. Returns the queued EmailNotification, one per viewer.
         """
         emails = [viewer.email for viewer in viewers]
-        for viewer in viewers:
-            # use delete so that django-simple-history keeps a record of it
-            self.viewer_access.get(viewer=viewer).delete()
-
-        for email in emails:
-            utils.govuk_notify_send_email(
-                email_address=email,
-                template_id=settings.NOTIFY_DASHBOARD_REVOKED_TEMPLATE_ID,
-                personalisation={
-                    "dashboard": self.name,
-                    "dashboard_link": self.url,
-                    "dashboard_home": settings.DASHBOARD_SERVICE_URL,
-                    "revoked_by": admin.justice_email,
-                },
-            )
+        # a queryset delete still sends post_delete for each record, so
+        # django-simple-history keeps a record of it, but the index is only
+        # synced once they've all been deleted
+        with transaction.atomic():
+            self.viewer_access.filter(viewer__in=viewers).delete()
+            DashboardAccess.objects.sync([self.pk])
+
+        return EmailNotification.objects.queue(
+            emails,
+            template_id=settings.NOTIFY_DASHBOARD_REVOKED_TEMPLATE_ID,
+            personalisation={
+                "dashboard": self.name,
+                "dashboard_link": self.url,
+                "dashboard_home": settings.DASHBOARD_SERVICE_URL,
+                "revoked_by": admin.justice_email,
+            },
+        )
 
     def delete_admin(self, user, admin):
         """
@@ -206,12 +248,10 @@ class Dashboard(TimeStampedModel):
         """
         Get the QuickSight embed URL for the dashboard.
         """
-        assume_role_name = settings.QUICKSIGHT_ASSUMED_ROLE
-        quicksight_region = settings.QUICKSIGHT_ACCOUNT_REGION
-        quicksight_client = AWSQuicksight(
-            assume_role_name=assume_role_name,
+        quicksight_client = AWSQuicksight.pooled(
+            assume_role_name=settings.QUICKSIGHT_ASSUMED_ROLE,
             profile_name="control_panel_api",
-            region_name=quicksight_region,
+            region_name=settings.QUICKSIGHT_ACCOUNT_REGION,
         )
 
         response = quicksight_client.generate_embed_url_for_anonymous_user(
@@ -219,3 +259,206 @@ class Dashboard(TimeStampedModel):
         )
 
         return response
+
+
+class DashboardAccessQuerySet(models.QuerySet):
+    def for_email(self, email, shared_via=None):
+        """
+        Access to dashboards granted to the email, optionally only the access
+        shared via the given ways (see DashboardAccess.VIA_CHOICES)
+        """
+        principals = [email.lower(), utils.get_domain_from_email(email).lower()]
+        queryset = self.filter(principal__in=principals)
+        if shared_via:
+            queryset = queryset.filter(via__in=shared_via)
+        return queryset
+
+    def shared_with(self, email, dashboard):
+        """
+        The access through which the dashboard was shared with the email, with
+        the user who shared it, or None. Access shared via the email's domain
+        takes precedence over access shared with them as a viewer.
+        """
+        access = {
+            item.via: item
+            for item in self.for_email(
+                email, shared_via=[DashboardAccess.VIA_DOMAIN, DashboardAccess.VIA_VIEWER]
+            )
+            .filter(dashboard=dashboard, shared_by__isnull=False)
+            .select_related("shared_by")
+        }
+        return access.get(DashboardAccess.VIA_DOMAIN) or access.get(DashboardAccess.VIA_VIEWER)
+
+
+class DashboardAccessManager(models.Manager.from_queryset(DashboardAccessQuerySet)):
+    def sync(self, dashboard_ids):
+        """
+        Rebuild the access index of the given dashboards from the admin,
+        viewer and domain access records.
+        """
+        dashboard_ids = set(dashboard_ids)
+        if not dashboard_ids:
+            return
+
+        with transaction.atomic():
+            # concurrent syncs of a dashboard could both insert its records after
+            # both deleted the old ones, so they take turns, reading the access
+            # records once it's their turn
+            dashboard_ids = list(
+                Dashboard.objects.select_for_update()
+                .filter(pk__in=dashboard_ids)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            self.filter(dashboard_id__in=dashboard_ids).delete()
+            self.bulk_create(self._build(dashboard_ids))
+            # the API uses `modified` as the version of a dashboard's metadata,
+            # which includes who it is shared with
+            Dashboard.objects.filter(pk__in=dashboard_ids).update(modified=timezone.now())
+
+    def _build(self, dashboard_ids):
+        """
+        The access index records of the given dashboards
+        """
+        sources = [
+            (
+                DashboardAccess.VIA_ADMIN,
+                DashboardAdminAccess.objects.exclude(user__justice_email__isnull=True).exclude(
+                    user__justice_email=""
+                ),
+                "user__justice_email",
+                "added_by_id",
+            ),
+            (
+                DashboardAccess.VIA_VIEWER,
+                DashboardViewerAccess.objects.all(),
+                "viewer__email",
+                "shared_by_id",
+            ),
+            (
+                DashboardAccess.VIA_DOMAIN,
+                DashboardDomainAccess.objects.all(),
+                "domain__name",
+                "added_by_id",
+            ),
+        ]
+        access = {}
+        for via, queryset, principal_field, shared_by_field in sources:
+            records = (
+                queryset.filter(dashboard_id__in=dashboard_ids)
+                .order_by("-created")
+                .values_list("dashboard_id", principal_field, shared_by_field, "created")
+            )
+            # ordered newest first, so the earliest record of any duplicates wins
+            for dashboard_id, principal, shared_by_id, created in records:
+                access[(dashboard_id, principal.lower(), via)] = DashboardAccess(
+                    dashboard_id=dashboard_id,
+                    principal=principal.lower(),
+                    via=via,
+                    shared_by_id=shared_by_id,
+                    shared_on=created,
+                )
+        return access.values()
+
+
+class DashboardAccess(models.Model):
+    """
+    Denormalised index of who can see each dashboard, built from the admin,
+    viewer and domain access records, so the dashboards visible to an email
+    can be found with a single indexed lookup. `principal` is the lower case
+    email of an admin or viewer, or the name of a domain.
+
+    The index is kept up to date by the signal handlers below, anything
+    writing access records without sending signals, or deleting a queryset of
+    them, needs to call DashboardAccess.objects.sync afterwards.
+    """
+
+    VIA_ADMIN = "admin"
+    VIA_VIEWER = "viewer"
+    VIA_DOMAIN = "domain"
+    VIA_CHOICES = [
+        (VIA_ADMIN, "Admin"),
+        (VIA_VIEWER, "Viewer"),
+        (VIA_DOMAIN, "Domain"),
+    ]
+
+    dashboard = models.ForeignKey(Dashboard, on_delete=models.CASCADE, related_name="access_index")
+    principal = models.CharField(max_length=254)
+    via = models.CharField(max_length=6, choices=VIA_CHOICES)
+    shared_by = models.ForeignKey("User", on_delete=models.SET_NULL, null=True, related_name="+")
+    shared_on = models.DateTimeField()
+
+    objects = DashboardAccessManager()
+
+    class Meta:
+        db_table = "control_panel_api_dashboard_access"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dashboard", "principal", "via"], name="unique_dashboard_access"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["principal", "via", "dashboard"], name="dashboard_access_idx"),
+        ]
+
+    def __repr__(self):
+        return f"<DashboardAccess: {self.dashboard_id}|{self.via}|{self.principal}>"
+
+
+@receiver(post_save, sender=DashboardAdminAccess)
+@receiver(post_delete, sender=DashboardAdminAccess)
+@receiver(post_save, sender=DashboardViewerAccess)
+@receiver(post_delete, sender=DashboardViewerAccess)
+@receiver(post_save, sender=DashboardDomainAccess)
+@receiver(post_delete, sender=DashboardDomainAccess)
+def sync_dashboard_access(sender, instance, origin=None, **kwargs):
+    # the index is deleted along with the dashboard
+    origin_model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    if origin_model is Dashboard:
+        return
+    # deleting a queryset of access records sends post_delete for every record,
+    # so it syncs their dashboards once itself (see Dashboard.delete_viewers)
+    if isinstance(origin, models.QuerySet) and origin_model is sender:
+        return
+    DashboardAccess.objects.sync([instance.dashboard_id])
+
+
+@receiver(m2m_changed, sender=DashboardAdminAccess)
+@receiver(m2m_changed, sender=DashboardViewerAccess)
+@receiver(m2m_changed, sender=DashboardDomainAccess)
+def sync_dashboard_access_m2m(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Adding to or removing from e.g. `dashboard.admins` creates and deletes the
+    through records in bulk, without sending their post_save/post_delete
+    """
+    if action == "pre_clear" and reverse:
+        # the dashboards are only known before they are cleared
+        instance._cleared_dashboard_ids = list(instance.dashboards.values_list("pk", flat=True))
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        DashboardAccess.objects.sync([instance.pk])
+    elif action == "post_clear":
+        DashboardAccess.objects.sync(getattr(instance, "_cleared_dashboard_ids", []))
+    else:
+        DashboardAccess.objects.sync(pk_set or [])
+
+
+@receiver(post_save, sender=DashboardViewer)
+@receiver(post_save, sender=DashboardDomain)
+def sync_renamed_dashboard_access(sender, instance, created, **kwargs):
+    if not created:
+        DashboardAccess.objects.sync(instance.dashboards.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender="api.User")
+def sync_dashboard_admin_access(sender, instance, created, update_fields=None, **kwargs):
+    # the index has the admins' justice_email, which most saves don't change
+    if getattr(instance, "_justice_email_changed", False) and (
+        update_fields is None or "justice_email" in update_fields
+    ):
+        DashboardAccess.objects.sync(instance.dashboards.values_list("pk", flat=True))
+    elif getattr(instance, "_dashboard_admin_details_changed", False):
+        # the API shows the admins' names and emails as part of the dashboards'
+        # metadata, which `modified` is the version of
+        instance.dashboards.update(modified=timezone.now())
@@ -1,10 +1,30 @@
 # Third-party
 from django.db import models
+from django.db.models import Exists, OuterRef, Value
+from django.db.models.functions import StrIndex, Substr
 from django_extensions.db.models import TimeStampedModel
 
 # First-party/Local
 from controlpanel.api import auth0
 from controlpanel.api.exceptions import AddViewerError, DeleteViewerError
+from controlpanel.api.models.dashboard_domain import DashboardDomain
+
+
+class DashboardViewerQuerySet(models.QuerySet):
+    def stale(self):
+        """
+        Viewers that no dashboard is shared with, either directly or through a
+        domain that has been granted access to a dashboard, found with a single
+        query.
+        """
+        granted_domains = DashboardDomain.objects.filter(
+            dashboards__isnull=False, name__iexact=OuterRef("domain")
+        )
+        return (
+            self.annotate(domain=Substr("email", StrIndex("email", Value("@")) + 1))
+            .filter(dashboards__isnull=True)
+            .exclude(Exists(granted_domains))
+        )
 
 
 class DashboardViewer(TimeStampedModel):
@@ -15,6 +35,8 @@ class DashboardViewer(TimeStampedModel):
 
     email = models.EmailField(blank=False, unique=True)
 
+    objects = DashboardViewerQuerySet.as_manager()
+
     class Meta:
         db_table = "control_panel_api_dashboard_viewer"
 
@@ -0,0 +1,112 @@
+# Third-party
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django_extensions.db.models import TimeStampedModel
+from notifications_python_client.notifications import NotificationsAPIClient
+
+# First-party/Local
+from controlpanel import utils
+from controlpanel.api.tasks.notifications import send_email_notifications
+
+
+class EmailNotificationQuerySet(models.QuerySet):
+    def queue(self, email_addresses, template_id, personalisation):
+        """
+        Record an email with the same template and personalisation to each
+        address, and send them in batches from the background once the current
+        transaction commits. Returns the notifications.
+        """
+        notifications = self.bulk_create(
+            [
+                self.model(
+                    email_address=email_address,
+                    template_id=template_id,
+                    personalisation=personalisation,
+                )
+                for email_address in email_addresses
+            ]
+        )
+        ids = [notification.pk for notification in notifications]
+        batch_size = int(settings.NOTIFY_BATCH_SIZE)
+        for start in range(0, len(ids), batch_size):
+            send_email_notifications.delay_on_commit(ids[start : start + batch_size])
+        return notifications
+
+    def send(self, retry=True):
+        """
+        Send the pending notifications with one Notify client. Returns the ids
+        of those that failed for a reason that may be temporary, which are left
+        pending when `retry` is True, otherwise marked as failed.
+        """
+        pending = list(self.filter(status=EmailNotification.STATUS_PENDING).order_by("pk"))
+        if not pending:
+            return []
+        client = NotificationsAPIClient(settings.NOTIFY_API_KEY)
+        to_retry = []
+        for notification in pending:
+            if not notification.send(client=client, retry=retry):
+                to_retry.append(notification.pk)
+        return to_retry
+
+
+class EmailNotification(TimeStampedModel):
+    """
+    An email sent with GOV.UK Notify from a background task, so the status of
+    each recipient's email can be followed after the request that sent it.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    email_address = models.EmailField()
+    template_id = models.CharField(max_length=100)
+    personalisation = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    # the id of the notification in Notify
+    notify_id = models.CharField(max_length=100, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = EmailNotificationQuerySet.as_manager()
+
+    class Meta:
+        db_table = "control_panel_api_email_notification"
+        ordering = ("-created",)
+
+    def __str__(self):
+        return f"{self.email_address} ({self.status})"
+
+    def send(self, client=None, retry=False):
+        """
+        Send the email, returns False if it failed for a reason that may be
+        temporary and `retry` is True, so it's left pending.
+        """
+        self.attempts += 1
+        try:
+            response = utils.govuk_notify_send_email(
+                email_address=self.email_address,
+                template_id=self.template_id,
+                personalisation=self.personalisation,
+                client=client,
+            )
+        except utils.GovukNotifyEmailError as error:
+            self.error = str(error.__cause__ or error)
+            if retry and error.is_temporary:
+                self.save(update_fields=["attempts", "error", "modified"])
+                return False
+            self.status = self.STATUS_FAILED
+        else:
+            self.status = self.STATUS_SENT
+            self.notify_id = (response or {}).get("id", "")
+            self.sent_at = timezone.now()
+            self.error = ""
+        self.save()
+        return True
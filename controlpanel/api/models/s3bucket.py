@@ -131,6 +131,13 @@ class S3Bucket(TimeStampedModel):
         )
 
     def access_level(self, user):
+        if "users3buckets" in getattr(self, "_prefetched_objects_cache", {}):
+            # avoid a query per bucket when listing buckets
+            for bucket_access in self.users3buckets.all():
+                if bucket_access.user_id == user.pk:
+                    return "admin" if bucket_access.is_admin else bucket_access.access_level
+            return "None"
+
         try:
             bucket_access = self.users3buckets.get(user=user)
             if bucket_access.is_admin:
@@ -1,10 +1,22 @@
 # Third-party
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
 from django_extensions.db.models import TimeStampedModel
 
 # First-party/Local
 from controlpanel.utils import format_uk_time
 
+# Cache key of the events shown in the status banner on every page
+ACTIVE_EVENTS_CACHE_KEY = "status_page_events:active"
+
+
+class StatusPageEventQuerySet(models.QuerySet):
+    def active(self):
+        return self.exclude(
+            status__in=[StatusPageEvent.STATUS_COMPLETED, StatusPageEvent.STATUS_RESOLVED]
+        )
+
 
 class StatusPageEvent(TimeStampedModel):
     POST_TYPE_INCIDENT = "incident"
@@ -52,6 +64,8 @@ class StatusPageEvent(TimeStampedModel):
     href = models.URLField(unique=True)
     raw_payload = models.JSONField()
 
+    objects = StatusPageEventQuerySet.as_manager()
+
     class Meta:
         ordering = ["-modified"]
         verbose_name = "Pager Duty Status Page Event"
@@ -60,6 +74,24 @@ class StatusPageEvent(TimeStampedModel):
     def __str__(self):
         return f"[{self.post_type.upper()}] {self.title}"
 
+    @classmethod
+    def get_active_events(cls):
+        """
+        Returns the events that haven't completed or been resolved, from the
+        cache when possible. The cache is invalidated when events are changed,
+        and expires after STATUS_BANNER_CACHE_TTL in case one is missed.
+        """
+        events = cache.get(ACTIVE_EVENTS_CACHE_KEY)
+        if events is None:
+            events = list(cls.objects.active())
+            cache.set(ACTIVE_EVENTS_CACHE_KEY, events, int(settings.STATUS_BANNER_CACHE_TTL))
+        return events
+
+    @classmethod
+    def invalidate_active_events(cls):
+        # once committed, otherwise the old events could be cached again first
+        transaction.on_commit(lambda: cache.delete(ACTIVE_EVENTS_CACHE_KEY))
+
     @property
     def label_colour(self):
         return {
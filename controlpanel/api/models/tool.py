@@ -6,7 +6,7 @@ from datetime import timedelta
 import structlog
 from django.conf import settings
 from django.db import models
-from django.db.models import JSONField
+from django.db.models import JSONField, Q
 from django.dispatch import receiver
 from django.utils import timezone
 from django_celery_beat.models import ClockedSchedule, PeriodicTask
@@ -198,6 +198,17 @@ class ToolDeployment(TimeStampedModel):
     class Meta:
         ordering = ["-created"]
         db_table = "control_panel_api_tool_deployment"
+        indexes = [
+            # a user's active deployment of a type of tool, and a tool's active deployments
+            models.Index(
+                fields=["user", "tool_type"],
+                condition=Q(is_active=True),
+                name="tooldeployment_user_active_idx",
+            ),
+            models.Index(
+                fields=["tool"], condition=Q(is_active=True), name="tooldeployment_tool_active_idx"
+            ),
+        ]
 
     def __init__(self, *args, **kwargs):
         # TODO these may not be necessary but leaving for now
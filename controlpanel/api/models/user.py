@@ -1,19 +1,84 @@
+# Standard library
+import hashlib
+from datetime import timedelta
+
 # Third-party
+import structlog
 from crequest.middleware import CrequestMiddleware
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.contrib.auth.signals import user_logged_in
+from django.contrib.auth.models import UserManager as BaseUserManager
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.contrib.postgres.indexes import OpClass
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.functional import cached_property
+from nacl.exceptions import CryptoError
 
 # First-party/Local
 from controlpanel.api import auth0, cluster, slack
+from controlpanel.api.github import api_token_rejected
 from controlpanel.api.signals import prometheus_login_event
-from controlpanel.utils import sanitize_dns_label
+from controlpanel.utils import (
+    decrypt_data_by_using_secret_key,
+    encrypt_data_by_using_secret_key,
+    sanitize_dns_label,
+)
+
+log = structlog.getLogger(__name__)
 
 QUICKSIGHT_EMBED_AUTHOR_PERMISSION = "quicksight_embed_author_access"
 QUICKSIGHT_EMBED_READER_PERMISSION = "quicksight_embed_reader_access"
 
+# Cache keys of a user's encrypted GitHub token, and of the user a token belongs to
+GITHUB_API_TOKEN_CACHE_KEY = "github_api_token:{}"
+GITHUB_API_TOKEN_USER_CACHE_KEY = "github_api_token_user:{}"
+
+
+def _github_api_token_digest(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class UserQuerySet(models.QuerySet):
+    def _unused_filter(self):
+        cutoff = timezone.now() - timedelta(days=User.UNUSED_AFTER_DAYS)
+        return Q(last_login__isnull=True) | Q(last_login__lt=cutoff)
+
+    def with_is_unused(self):
+        """
+        Annotate each user with `is_unused`, whether they haven't logged in
+        for UNUSED_AFTER_DAYS days, or ever.
+        """
+        return self.annotate(
+            is_unused=models.ExpressionWrapper(
+                self._unused_filter(), output_field=models.BooleanField()
+            )
+        )
+
+    def unused(self):
+        return self.filter(self._unused_filter())
+
+    def search(self, term):
+        """
+        Users whose username, email or name starts with the term, ignoring
+        case, which can use the indexes on the upper case fields, or the trigram
+        indexes on them where pg_trgm is available (see migration 0088).
+        """
+        term = term.strip()
+        if not term:
+            return self
+        return self.filter(
+            Q(username__istartswith=term) | Q(email__istartswith=term) | Q(name__istartswith=term)
+        )
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
+
 
 class User(AbstractUser):
     # States in which a user can be in while migrating to the new platform.
@@ -48,9 +113,29 @@ class User(AbstractUser):
 
     REQUIRED_FIELDS = ["email", "auth0_id"]
 
+    # users who haven't logged in for this many days are shown as unused
+    UNUSED_AFTER_DAYS = 90
+
+    objects = UserManager()
+
     class Meta:
         db_table = "control_panel_api_user"
         ordering = ("username",)
+        indexes = [
+            # the istartswith lookups used to search users compare upper case
+            # values with LIKE, which can only use an index with a pattern opclass.
+            # These are kept where the trigram indexes are skipped without pg_trgm
+            models.Index(
+                OpClass(Upper("username"), name="text_pattern_ops"),
+                name="user_username_upper_idx",
+            ),
+            models.Index(
+                OpClass(Upper("email"), name="text_pattern_ops"), name="user_email_upper_idx"
+            ),
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"), name="user_name_upper_idx"
+            ),
+        ]
         permissions = [
             (QUICKSIGHT_EMBED_AUTHOR_PERMISSION, "Can access embedded QuickSight as an author"),
             (QUICKSIGHT_EMBED_READER_PERMISSION, "Can access embedded QuickSight as a reader"),
@@ -91,17 +176,59 @@ class User(AbstractUser):
     def github_api_token(self):
         if not hasattr(self, "_github_api_token"):
             self._github_api_token = None
+        if not getattr(self, "_github_api_token", None):
+            self._github_api_token = self._get_cached_github_api_token()
         if not getattr(self, "_github_api_token", None):
             auth0_user = auth0.ExtendedAuth0().users.get(self.auth0_id)
             for identity in auth0_user["identities"]:
                 if identity["provider"] == "github":
                     self._github_api_token = identity.get("access_token")
+            self._cache_github_api_token(self._github_api_token)
         return self._github_api_token
 
     @github_api_token.setter
     def github_api_token(self, value):
         self._github_api_token = value
 
+    def _get_cached_github_api_token(self):
+        encrypted = cache.get(GITHUB_API_TOKEN_CACHE_KEY.format(self.auth0_id))
+        if not encrypted:
+            return None
+        try:
+            return decrypt_data_by_using_secret_key(encrypted)
+        except CryptoError:
+            log.warning(f"Failed to decrypt the cached GitHub token of {self.auth0_id}")
+            return None
+
+    def _cache_github_api_token(self, token):
+        """
+        Keep the token, encrypted, for a short time so that it doesn't have to
+        be fetched from Auth0 on every request.
+        """
+        if not token:
+            return
+        timeout = int(settings.GITHUB_API_TOKEN_CACHE_TTL)
+        cache.set_many(
+            {
+                GITHUB_API_TOKEN_CACHE_KEY.format(self.auth0_id): encrypt_data_by_using_secret_key(
+                    token
+                ),
+                GITHUB_API_TOKEN_USER_CACHE_KEY.format(_github_api_token_digest(token)): (
+                    self.auth0_id
+                ),
+            },
+            timeout=timeout,
+        )
+
+    def clear_github_api_token(self):
+        """Forget the GitHub token, so the next access fetches it from Auth0"""
+        keys = [GITHUB_API_TOKEN_CACHE_KEY.format(self.auth0_id)]
+        token = getattr(self, "_github_api_token", None) or self._get_cached_github_api_token()
+        if token:
+            keys.append(GITHUB_API_TOKEN_USER_CACHE_KEY.format(_github_api_token_digest(token)))
+        cache.delete_many(keys)
+        self._github_api_token = None
+
     @property
     def slug(self):
         return sanitize_dns_label(self.username)
@@ -190,6 +317,13 @@ class User(AbstractUser):
         existing = User.objects.filter(pk=self.pk).first()
         if not existing and self.is_iam_user:
             cluster.User(self).create()
+        # see sync_dashboard_admin_access
+        self._justice_email_changed = (
+            bool(existing) and existing.justice_email != self.justice_email
+        )
+        self._dashboard_admin_details_changed = bool(existing) and (
+            existing.name != self.name or existing.email != self.email
+        )
 
         already_superuser = existing and existing.is_superuser
         if self.is_superuser and not already_superuser:
@@ -227,4 +361,24 @@ class User(AbstractUser):
         return reverse("manage-user", kwargs={"pk": self.pk})
 
 
+def clear_github_api_token_on_logout(sender, user, request, **kwargs):
+    if user is not None:
+        user.clear_github_api_token()
+
+
+def clear_rejected_github_api_token(sender, api_token, **kwargs):
+    digest = _github_api_token_digest(api_token)
+    user_id = cache.get(GITHUB_API_TOKEN_USER_CACHE_KEY.format(digest))
+    if user_id:
+        log.info(f"GitHub rejected the cached token of {user_id}, clearing it")
+        cache.delete_many(
+            [
+                GITHUB_API_TOKEN_CACHE_KEY.format(user_id),
+                GITHUB_API_TOKEN_USER_CACHE_KEY.format(digest),
+            ]
+        )
+
+
 user_logged_in.connect(prometheus_login_event)
+user_logged_out.connect(clear_github_api_token_on_logout)
+api_token_rejected.connect(clear_rejected_github_api_token)
@@ -1,5 +1,6 @@
 # Third-party
 from django.db import models
+from django.db.models import Q
 from django_extensions.db.models import TimeStampedModel
 
 
@@ -12,3 +13,10 @@ class UserApp(TimeStampedModel):
         db_table = "control_panel_api_userapp"
         unique_together = (("app", "user"),)
         ordering = ("id",)
+        indexes = [
+            # the admins of an app, and the apps a user is an admin of
+            models.Index(fields=["app"], condition=Q(is_admin=True), name="userapp_app_admin_idx"),
+            models.Index(
+                fields=["user"], condition=Q(is_admin=True), name="userapp_user_admin_idx"
+            ),
+        ]
@@ -1,5 +1,6 @@
 # Third-party
 from django.db import models
+from django.db.models import Q
 
 # First-party/Local
 from controlpanel.api import cluster, tasks
@@ -26,6 +27,17 @@ class UserS3Bucket(AccessToS3Bucket):
         # one record per user/s3bucket
         unique_together = ("user", "s3bucket")
         ordering = ("id",)
+        indexes = [
+            # the admins of a bucket, and the buckets a user is an admin of
+            models.Index(
+                fields=["s3bucket"],
+                condition=Q(is_admin=True),
+                name="users3bucket_bucket_admin_idx",
+            ),
+            models.Index(
+                fields=["user"], condition=Q(is_admin=True), name="users3bucket_user_admin_idx"
+            ),
+        ]
         verbose_name = "S3 User Access"
         verbose_name_plural = "S3 User Access records"
 
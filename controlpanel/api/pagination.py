@@ -2,56 +2,53 @@
 from django.conf import settings
 from django.core.paginator import InvalidPage, Paginator
 from rest_framework import serializers
-from rest_framework.pagination import PageNumberPagination, _positive_int
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.utils.urls import replace_query_param
 
 
-class CustomPageNumberPagination(PageNumberPagination):
-    """This Pagination class allows a request to pass the page_size query param
-    for usual pagination functionality but adds custom whereby a value of
-    page_size=0 will return all items
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination on the primary key, which doesn't count the rows or use an
+    offset, so the cost of a page doesn't grow with the size of the table
     """
 
+    ordering = "pk"
     page_size_query_param = "page_size"
+    max_page_size = int(settings.API_MAX_PAGE_SIZE)
 
-    def paginate_queryset(self, queryset, request, view=None):
-        """Override to check for page_size=0 if so then return all items else
-        execute original parent functionality
-        """
-        page_size = self.get_page_size(request)
-
-        if not self._page_size_is_all(page_size):
-            return super().paginate_queryset(queryset, request, view)
 
-        paginator = self.django_paginator_class(queryset, queryset.count() or 1)
-        self.page = paginator.page(1)
+class CustomPageNumberPagination(PageNumberPagination):
+    """This Pagination class allows a request to pass the page_size query param,
+    up to API_MAX_PAGE_SIZE. A request with the cursor query param, empty for the
+    first page, is paginated with KeysetPagination instead
+    """
 
-        return list(self.page)
+    page_size_query_param = "page_size"
+    max_page_size = int(settings.API_MAX_PAGE_SIZE)
+    keyset_pagination_class = KeysetPagination
 
-    def get_page_size(self, request):
-        """Override to set strict=False to allow a 0 value"""
-        if self.page_size_query_param:
-            try:
-                return _positive_int(
-                    request.query_params[self.page_size_query_param],
-                    strict=False,
-                    cutoff=self.max_page_size,
-                )
-            except (KeyError, ValueError):
-                pass
+    def paginate_queryset(self, queryset, request, view=None):
+        """Override to use keyset pagination when the request has a cursor"""
+        self.keyset_paginator = None
+        if self.keyset_pagination_class.cursor_query_param in request.query_params:
+            self.keyset_paginator = self.keyset_pagination_class()
+            return self.keyset_paginator.paginate_queryset(queryset, request, view)
 
-        return self.page_size
+        return super().paginate_queryset(queryset, request, view)
 
-    def _page_size_is_all(self, page_size):
-        """If page_size is specified as 0 we use that to mean return all"""
-        return page_size == 0
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
 
 
 class DashboardPaginator(CustomPageNumberPagination):
-    """Custom paginator for dashboards that allows for a page_size of 0 to return all items."""
+    """Custom paginator for dashboards that includes the page numbers to link to."""
 
     def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return super().get_paginated_response(data)
         return Response(
             {
                 "count": self.page.paginator.count,
@@ -106,3 +103,34 @@ class Auth0ApiPagination(Auth0Paginator):
                 "results": self.object_list,
             }
         )
+
+
+class CustomerKeysetPagination:
+    """
+    Keyset pagination of app customers, the next link carries the email and
+    user_id of the last customer on the page rather than a page number
+    """
+
+    def __init__(self, request, object_list, total_count, per_page):
+        self.request = request
+        self.object_list = object_list
+        self.total_count = total_count
+        self.per_page = per_page
+
+    def get_next_link(self):
+        if len(self.object_list) < self.per_page:
+            return None
+        last = self.object_list[-1]
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, "after", last["email"])
+        return replace_query_param(url, "after_id", last["user_id"])
+
+    def get_paginated_response(self):
+        return Response(
+            {
+                "count": self.total_count,
+                "next": self.get_next_link(),
+                "previous": None,
+                "results": self.object_list,
+            }
+        )
@@ -0,0 +1,168 @@
+"""
+Request scoped cache for the object permissions defined in `controlpanel.api.rules`
+
+List pages check permissions on every row, often several times, and the predicates
+would otherwise query for the user's access to each object. The cache loads which
+apps, buckets and dashboards a user has access to once per request, and remembers
+the result of each permission check.
+"""
+
+# Third-party
+from crequest.middleware import CrequestMiddleware
+from django.db.models import BooleanField, CharField, Value
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rules.permissions import ObjectPermissionBackend
+
+REQUEST_ATTRIBUTE = "_permission_cache"
+
+APP_ADMIN = "app_admin"
+BUCKET_ACCESS = "bucket_access"
+DASHBOARD_ADMIN = "dashboard_admin"
+
+
+class PermissionCache:
+    """
+    The access a user has to apps, buckets and dashboards, and the results of the
+    permission checks made, for the duration of a request
+    """
+
+    def __init__(self):
+        self.results = {}
+        self._access = {}
+
+    def clear(self):
+        self.results.clear()
+        self._access.clear()
+
+    def _access_querysets(self, user):
+        # First-party/Local
+        from controlpanel.api.models import DashboardAdminAccess, UserApp, UserS3Bucket
+
+        # each is a list of (kind, object id, access level, is admin), so they
+        # can be loaded together with a union
+        return {
+            APP_ADMIN: UserApp.objects.filter(user_id=user.pk, is_admin=True).values_list(
+                Value(APP_ADMIN, output_field=CharField()),
+                "app_id",
+                Value("", output_field=CharField()),
+                "is_admin",
+            ),
+            BUCKET_ACCESS: UserS3Bucket.objects.filter(user_id=user.pk).values_list(
+                Value(BUCKET_ACCESS, output_field=CharField()),
+                "s3bucket_id",
+                "access_level",
+                "is_admin",
+            ),
+            DASHBOARD_ADMIN: DashboardAdminAccess.objects.filter(user_id=user.pk).values_list(
+                Value(DASHBOARD_ADMIN, output_field=CharField()),
+                "dashboard_id",
+                Value("", output_field=CharField()),
+                Value(True, output_field=BooleanField()),
+            ),
+        }
+
+    def _store(self, user, kinds, rows):
+        for kind in kinds:
+            self._access[(user.pk, kind)] = {}
+        for kind, object_id, access_level, is_admin in rows:
+            self._access[(user.pk, kind)][object_id] = {
+                "access_level": access_level,
+                "is_admin": is_admin,
+            }
+
+    def preload(self, user):
+        """
+        Load all the access the user has in one query, for list views that
+        check permissions on many objects
+        """
+        if not user.pk:
+            return
+        querysets = {
+            kind: queryset.order_by()
+            for kind, queryset in self._access_querysets(user).items()
+            if (user.pk, kind) not in self._access
+        }
+        if not querysets:
+            return
+        first, *others = querysets.values()
+        self._store(user, querysets, first.union(*others, all=True))
+
+    def access(self, user, kind):
+        """
+        Returns a dict of the ids of the objects of `kind` the user has access to,
+        to the access level and whether they're an admin
+        """
+        if not user.pk:
+            return {}
+        if (user.pk, kind) not in self._access:
+            self._store(user, [kind], self._access_querysets(user)[kind])
+        return self._access[(user.pk, kind)]
+
+
+def get_permission_cache():
+    """
+    Returns the permission cache of the current request, or None outside of a
+    request, e.g. in a background task, where permissions aren't cached
+    """
+    request = CrequestMiddleware.get_request()
+    if request is None:
+        return None
+    cache = getattr(request, REQUEST_ATTRIBUTE, None)
+    if cache is None:
+        cache = PermissionCache()
+        setattr(request, REQUEST_ATTRIBUTE, cache)
+    return cache
+
+
+def preload_permissions(user):
+    """
+    Load the access the user has to apps, buckets and dashboards in one query,
+    so checking their permissions on each object in a list doesn't query
+    """
+    cache = get_permission_cache()
+    if cache is not None:
+        cache.preload(user)
+
+
+@receiver(post_save, sender="api.User")
+@receiver(post_save, sender="api.UserApp")
+@receiver(post_delete, sender="api.UserApp")
+@receiver(post_save, sender="api.UserS3Bucket")
+@receiver(post_delete, sender="api.UserS3Bucket")
+@receiver(post_save, sender="api.DashboardAdminAccess")
+@receiver(post_delete, sender="api.DashboardAdminAccess")
+@receiver(m2m_changed, sender="api.DashboardAdminAccess")
+def clear_permission_cache(**kwargs):
+    """
+    Signal receiver clearing the cache of the current request when access changes
+    """
+    cache = get_permission_cache()
+    if cache is not None:
+        cache.clear()
+
+
+class CachedObjectPermissionBackend(ObjectPermissionBackend):
+    """
+    Remembers the result of each permission check on an object for the rest of
+    the request
+    """
+
+    def has_perm(self, user, perm, *args, **kwargs):
+        obj = args[0] if args else None
+        cache = get_permission_cache()
+        if obj is not None and getattr(obj, "pk", None) is None:
+            # not a saved model instance, so it can't be identified
+            cache = None
+        if cache is None or kwargs:
+            return super().has_perm(user, perm, *args, **kwargs)
+
+        key = (
+            user.pk,
+            perm,
+            type(obj),
+            obj.pk if obj is not None else None,
+        )
+        if key not in cache.results:
+            cache.results[key] = super().has_perm(user, perm, *args, **kwargs)
+        return cache.results[key]
@@ -16,6 +16,12 @@ from controlpanel.api.models import (
     UserApp,
     UserS3Bucket,
 )
+from controlpanel.api.permission_cache import (
+    APP_ADMIN,
+    BUCKET_ACCESS,
+    DASHBOARD_ADMIN,
+    get_permission_cache,
+)
 
 
 @predicate
@@ -36,7 +42,10 @@ def is_app_admin(user, obj):
         return True
 
     if isinstance(obj, App):
-        return user in obj.admins
+        cache = get_permission_cache()
+        if cache is not None:
+            return obj.pk in cache.access(user, APP_ADMIN)
+        return obj.userapps.filter(user_id=user.pk, is_admin=True).exists()
 
     if isinstance(obj, AppS3Bucket):
         return is_app_admin(user, obj.app)
@@ -95,11 +104,13 @@ def has_bucket_access(user, obj, **kwargs):
         return True
 
     if isinstance(obj, S3Bucket):
-        try:
-            UserS3Bucket.objects.get(user=user, s3bucket=obj, **kwargs)
-        except UserS3Bucket.DoesNotExist:
-            return False
-        return True
+        cache = get_permission_cache()
+        if cache is not None:
+            access = cache.access(user, BUCKET_ACCESS).get(obj.pk)
+            return access is not None and all(
+                access[field] == value for field, value in kwargs.items()
+            )
+        return UserS3Bucket.objects.filter(user_id=user.pk, s3bucket=obj, **kwargs).exists()
 
     if isinstance(obj, AppS3Bucket) or isinstance(obj, UserS3Bucket):
         return has_bucket_access(user, obj.s3bucket)
@@ -259,6 +270,9 @@ def is_dashboard_admin(user, obj):
         return True
 
     if isinstance(obj, Dashboard):
+        cache = get_permission_cache()
+        if cache is not None:
+            return obj.pk in cache.access(user, DASHBOARD_ADMIN)
         return obj.is_admin(user)
 
     return False
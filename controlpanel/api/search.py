@@ -0,0 +1,86 @@
+"""
+Search across apps, buckets, users and dashboards from one place
+
+Terms are matched anywhere in the fields, ignoring case, which the `pg_trgm` GIN
+indexes on the upper case fields serve (see migration 0088). Matches are ranked
+exact first, then by prefix, then shortest first, and limited, so a search doesn't
+depend on the size of the tables.
+"""
+
+# Third-party
+from django.conf import settings
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Least, Length
+
+# First-party/Local
+from controlpanel.api.models import App, Dashboard, S3Bucket, User
+
+# the fields searched for each kind of result, the first is the one shown
+SEARCH_FIELDS = {
+    "apps": ("name", "slug", "repo_url"),
+    "buckets": ("name",),
+    "users": ("username", "email", "name"),
+    "dashboards": ("name", "quicksight_id"),
+}
+# shorter terms match too much to use the trigram indexes
+MIN_TERM_LENGTH = 3
+
+
+def _match_rank(field, term):
+    return Case(
+        When(**{f"{field}__iexact": term}, then=Value(0)),
+        When(**{f"{field}__istartswith": term}, then=Value(1)),
+        When(**{f"{field}__icontains": term}, then=Value(2)),
+        default=Value(3),
+        output_field=IntegerField(),
+    )
+
+
+def ranked(queryset, fields, term, limit):
+    """
+    The objects in the queryset with a field containing the term, best matches first
+    """
+    matches = Q()
+    for field in fields:
+        matches |= Q(**{f"{field}__icontains": term})
+    ranks = [_match_rank(field, term) for field in fields]
+    return (
+        queryset.filter(matches)
+        .annotate(search_rank=Least(*ranks) if len(ranks) > 1 else ranks[0])
+        .order_by("search_rank", Length(fields[0]), fields[0])[:limit]
+    )
+
+
+def searchable(user):
+    """
+    Returns a queryset for each kind of result that the user can find. Superusers
+    can find everything, other users the apps, buckets and dashboards they have
+    access to.
+    """
+    if user.is_superuser:
+        return {
+            "apps": App.objects.all(),
+            "buckets": S3Bucket.objects.filter(is_deleted=False),
+            "users": User.objects.all(),
+            "dashboards": Dashboard.objects.all(),
+        }
+    return {
+        "apps": App.objects.filter(userapps__user=user),
+        "buckets": S3Bucket.objects.filter(users3buckets__user=user, is_deleted=False),
+        "dashboards": Dashboard.objects.filter(admins=user),
+    }
+
+
+def search(user, term, limit=None):
+    """
+    Returns the best matches for the term of each kind the user can find, or
+    nothing when the term is too short
+    """
+    term = term.strip()
+    if len(term) < MIN_TERM_LENGTH:
+        return {}
+    limit = limit or int(settings.SEARCH_RESULTS_LIMIT)
+    return {
+        kind: list(ranked(queryset, SEARCH_FIELDS[kind], term, limit))
+        for kind, queryset in searchable(user).items()
+    }
@@ -17,6 +17,7 @@ from controlpanel.api.models import (
     App,
     AppS3Bucket,
     Dashboard,
+    DashboardAccess,
     IPAllowlist,
     S3Bucket,
     ToolDeployment,
@@ -24,7 +25,7 @@ from controlpanel.api.models import (
     UserApp,
     UserS3Bucket,
 )
-from controlpanel.utils import get_domain_from_email, start_background_task
+from controlpanel.utils import start_background_task
 
 
 class AppS3BucketSerializer(serializers.ModelSerializer):
@@ -296,6 +297,11 @@ class AppCustomersQueryParamsSerializer(serializers.Serializer):
     env_name = serializers.CharField(max_length=64, required=True)
     page = serializers.IntegerField(min_value=1, required=False, default=1)
     per_page = serializers.IntegerField(min_value=1, required=False, default=25)
+    search = serializers.CharField(max_length=254, required=False, allow_blank=True)
+    # email and user_id of the last customer of the previous page, switches
+    # to keyset pagination
+    after = serializers.CharField(max_length=254, required=False, allow_blank=True)
+    after_id = serializers.CharField(max_length=128, required=False)
 
     def __init__(self, *args, **kwargs):
         self.app = kwargs.pop("app")
@@ -571,8 +577,6 @@ class DashboardListSerializer(serializers.ModelSerializer):
 
 
 class DashboardDetailSerializer(DashboardListSerializer):
-    embed_url = serializers.SerializerMethodField()
-    anonymous_user_arn = serializers.SerializerMethodField()
     shared_by_email = serializers.SerializerMethodField()
     shared_by_name = serializers.SerializerMethodField()
     shared_on = serializers.SerializerMethodField()
@@ -580,62 +584,34 @@ class DashboardDetailSerializer(DashboardListSerializer):
 
     class Meta(DashboardListSerializer.Meta):
         fields = DashboardListSerializer.Meta.fields + (
-            "embed_url",
-            "anonymous_user_arn",
             "shared_by_email",
             "shared_by_name",
             "shared_on",
             "shared_via_domain",
         )
 
-    def _get_embed_url(self, dashboard):
-        if hasattr(self, "_embed_url"):
-            return self._embed_url
-
-        self._embed_url = dashboard.get_embed_url()
-        return self._embed_url
-
     def _get_access_data(self, dashboard):
         if hasattr(self, "_access_data"):
             return self._access_data
 
         self._access_data = {}
-        email = self.context["request"].query_params.get("email")
-        if not email:
-            return self._access_data
-        domain_access = (
-            dashboard.domain_access.filter(domain__name__iexact=get_domain_from_email(email))
-            .select_related("added_by")
-            .first()
-        )
-        if domain_access and domain_access.added_by:
-            self._access_data["shared_by_email"] = domain_access.added_by.justice_email
-            self._access_data["shared_by_name"] = domain_access.added_by.name
-            self._access_data["shared_on"] = domain_access.created
-            self._access_data["shared_via_domain"] = True
-            return self._access_data
-
-        viewer_access = (
-            dashboard.viewer_access.filter(viewer__email__iexact=email)
-            .select_related("shared_by")
-            .first()
-        )
-        if viewer_access and viewer_access.shared_by:
-            self._access_data["shared_by_email"] = viewer_access.shared_by.justice_email
-            self._access_data["shared_by_name"] = viewer_access.shared_by.name
-            self._access_data["shared_on"] = viewer_access.created
-            return self._access_data
+        if "dashboard_access" in self.context:
+            # already looked up by the view
+            item = self.context["dashboard_access"]
+        else:
+            email = self.context["request"].query_params.get("email")
+            if not email:
+                return self._access_data
+            item = DashboardAccess.objects.shared_with(email, dashboard)
+        if item:
+            self._access_data["shared_by_email"] = item.shared_by.justice_email
+            self._access_data["shared_by_name"] = item.shared_by.name
+            self._access_data["shared_on"] = item.shared_on
+            if item.via == DashboardAccess.VIA_DOMAIN:
+                self._access_data["shared_via_domain"] = True
 
         return self._access_data
 
-    def get_embed_url(self, dashboard):
-        response = self._get_embed_url(dashboard)
-        return response["EmbedUrl"]
-
-    def get_anonymous_user_arn(self, dashboard):
-        response = self._get_embed_url(dashboard)
-        return response["AnonymousUserArn"]
-
     def get_shared_by_email(self, dashboard):
         return self._get_access_data(dashboard).get("shared_by_email")
 
@@ -647,3 +623,10 @@ class DashboardDetailSerializer(DashboardListSerializer):
 
     def get_shared_via_domain(self, dashboard):
         return self._get_access_data(dashboard).get("shared_via_domain", False)
+
+
+class DashboardEmbedUrlSerializer(serializers.Serializer):
+    """The response of QuickSight's GenerateEmbedUrlForAnonymousUser"""
+
+    embed_url = serializers.CharField(source="EmbedUrl")
+    anonymous_user_arn = serializers.CharField(source="AnonymousUserArn")
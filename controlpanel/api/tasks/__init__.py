@@ -1,6 +1,9 @@
 # First-party/Local
 from controlpanel.api.tasks.app import AppCreateAuth, AppCreateRole
+from controlpanel.api.tasks.cloud_platform import refresh_cloud_platform_namespaces
+from controlpanel.api.tasks.customers import sync_app_customers
 from controlpanel.api.tasks.dashboards import prune_dashboard_viewers
+from controlpanel.api.tasks.notifications import send_email_notifications
 from controlpanel.api.tasks.s3bucket import (
     S3BucketArchive,
     S3BucketArchiveObject,
@@ -0,0 +1,15 @@
+# Third-party
+from celery import shared_task
+
+# First-party/Local
+from controlpanel.api.cloud_platform import CloudPlatformNamespaces
+
+
+@shared_task(acks_on_failure_or_timeout=False)
+def refresh_cloud_platform_namespaces():
+    """
+    Rebuild the cached index of cloud platform namespaces used when registering
+    apps. Runs every 30 minutes with celery beat, scheduled by migration 0091,
+    so the index is warm before it expires.
+    """
+    CloudPlatformNamespaces().refresh()
@@ -0,0 +1,25 @@
+# Third-party
+import structlog
+from auth0.exceptions import Auth0Error
+from celery import shared_task
+
+# First-party/Local
+from controlpanel.api import auth0
+from controlpanel.utils import _get_model
+
+log = structlog.getLogger(__name__)
+
+
+@shared_task(acks_on_failure_or_timeout=False)
+def sync_app_customers():
+    """
+    Reconcile the local mirror of app customers with the Auth0 authorization
+    extension groups, picking up any changes made outside of the control panel.
+    Runs hourly with celery beat, scheduled by migration 0090.
+    """
+    App = _get_model("App")
+    for app in App.objects.filter(app_conf__has_key=App.KEY_WORD_FOR_AUTH_SETTINGS):
+        try:
+            app.sync_customers()
+        except (Auth0Error, auth0.Auth0Error) as error:
+            log.warning(f"Failed to sync customers of {app.name}: {error}")
@@ -1,33 +1,64 @@
+# Standard library
+from time import monotonic
+
 # Third-party
 import structlog
+from auth0.exceptions import Auth0Error
 from celery import shared_task
 
 # First-party/Local
-from controlpanel.api.auth0 import Auth0Error
-from controlpanel.api.models.dashboard_domain import DashboardDomain
+from controlpanel.api import auth0
 from controlpanel.api.models.dashboard_viewer import DashboardViewer
 
 log = structlog.getLogger(__name__)
 
 
 @shared_task(acks_on_failure_or_timeout=False)
-def prune_dashboard_viewers():
+def prune_dashboard_viewers(dry_run=False):
     """
     Remove dashboard viewers that are not associated with any dashboards.
     This also checks that the viewer can still access dashboards if they
     have a valid domain. This will remove the auth0 role required to access
     View MOJ dashboards.
+
+    The stale viewers are found with one query, the Auth0 role is removed from
+    them in batches, and the viewers it was removed from are deleted at once.
+    With `dry_run` nothing is removed. Returns a summary of the counts and how
+    long each step took.
     """
-    domains = (
-        DashboardDomain.objects.filter(dashboards__isnull=False)
-        .distinct()
-        .values_list("name", flat=True)
+    timings = {}
+    started = monotonic()
+    emails = list(DashboardViewer.objects.stale().values_list("email", flat=True))
+    timings["query"] = monotonic() - started
+
+    summary = {"stale": len(emails), "deleted": 0, "failed": 0, "dry_run": dry_run}
+    if dry_run or not emails:
+        summary["timings"] = timings
+        log.info("Pruned dashboard viewers", emails=emails if dry_run else [], **summary)
+        return summary
+
+    started = monotonic()
+    try:
+        failed = auth0.ExtendedAuth0().remove_dashboard_roles(emails)
+    except (Auth0Error, auth0.Auth0Error) as error:
+        log.warning(f"Failed to look up dashboard viewers in Auth0: {error}")
+        failed = {email.lower() for email in emails}
+    timings["auth0"] = monotonic() - started
+
+    started = monotonic()
+    # the queryset delete doesn't call DashboardViewer.delete, which removes
+    # the role from one viewer at a time. Viewers that have been shared a
+    # dashboard since they were found are kept. The failed emails are lower
+    # case, like the ones Auth0 users are found by, older viewers may not be
+    _, deleted = (
+        DashboardViewer.objects.stale()
+        .filter(email__in=[email for email in emails if email.lower() not in failed])
+        .delete()
+    )
+    timings["delete"] = monotonic() - started
+
+    summary.update(
+        deleted=deleted.get(DashboardViewer._meta.label, 0), failed=len(failed), timings=timings
     )
-    viewers = DashboardViewer.objects.filter(dashboards__isnull=True)
-    for viewer in viewers:
-        viewer_domain = viewer.email.split("@")[-1]
-        if viewer_domain not in domains:
-            try:
-                viewer.delete()
-            except Auth0Error:
-                log.info(f"Failed to remove viewer {viewer.email} from Auth0")
+    log.info("Pruned dashboard viewers", **summary)
+    return summary
@@ -0,0 +1,31 @@
+# Third-party
+import structlog
+from celery import shared_task
+from django.conf import settings
+
+# First-party/Local
+from controlpanel.utils import _get_model
+
+log = structlog.getLogger(__name__)
+
+
+@shared_task(bind=True, acks_on_failure_or_timeout=False)
+def send_email_notifications(self, notification_ids):
+    """
+    Send a batch of queued GOV.UK Notify emails. Emails that failed for a reason
+    that may be temporary, e.g. rate limiting or a Notify outage, are retried
+    with an exponential backoff, until NOTIFY_MAX_RETRIES when they're marked as
+    failed.
+    """
+    EmailNotification = _get_model("EmailNotification")
+    max_retries = int(settings.NOTIFY_MAX_RETRIES)
+    to_retry = EmailNotification.objects.filter(pk__in=notification_ids).send(
+        retry=self.request.retries < max_retries
+    )
+    if to_retry:
+        log.warning(f"Failed to send {len(to_retry)} emails, retrying")
+        raise self.retry(
+            args=[to_retry],
+            countdown=int(settings.NOTIFY_RETRY_BACKOFF) * 2**self.request.retries,
+            max_retries=max_retries,
+        )
@@ -11,7 +11,7 @@ from rest_framework.response import Response
 # First-party/Local
 from controlpanel.api import permissions, serializers
 from controlpanel.api.models import App
-from controlpanel.api.pagination import Auth0ApiPagination
+from controlpanel.api.pagination import Auth0ApiPagination, CustomerKeysetPagination
 
 
 class AppByNameViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
@@ -48,10 +48,14 @@ class AppByNameViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
         validated_params = serializer.validated_data
 
         group_id = app.get_group_id(validated_params["env_name"])
+        if "after" in validated_params:
+            return self._customers_after(request, app, group_id, validated_params)
+
         customers = app.customer_paginated(
             page=validated_params["page"],
             group_id=group_id,
             per_page=validated_params["per_page"],
+            search=validated_params.get("search"),
         )
         customers_serializer = self.get_serializer(data=customers["users"], many=True)
         customers_serializer.is_valid(raise_exception=True)
@@ -64,6 +68,28 @@ class AppByNameViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
             per_page=validated_params["per_page"],
         ).get_paginated_response()
 
+    def _customers_after(self, request, app, group_id, validated_params):
+        customers = app.customers_after(
+            group_id,
+            after=validated_params["after"],
+            after_id=validated_params.get("after_id"),
+            per_page=validated_params["per_page"],
+            search=validated_params.get("search"),
+        )
+        if customers is None:
+            raise ValidationError(
+                {"after": "Customers of this environment haven't been synced yet, use page."}
+            )
+        customers_serializer = self.get_serializer(data=customers["users"], many=True)
+        customers_serializer.is_valid(raise_exception=True)
+
+        return CustomerKeysetPagination(
+            request=request,
+            object_list=customers_serializer.validated_data,
+            total_count=customers["total"],
+            per_page=validated_params["per_page"],
+        ).get_paginated_response()
+
     @customers.mapping.post
     def add_customers(self, request, *args, **kwargs):
         app = self.get_object()
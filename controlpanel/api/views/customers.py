@@ -13,9 +13,11 @@ from rest_framework.response import Response
 
 # First-party/Local
 from controlpanel.api import permissions, serializers
+from controlpanel.api.db_routers import use_replica
 from controlpanel.api.models import App
 
 
+@use_replica
 class AppCustomersAPIView(GenericAPIView):
     queryset = App.objects.all()
     serializer_class = serializers.AppCustomerSerializer
@@ -1,18 +1,31 @@
+# Standard library
+import hashlib
+
 # Third-party
 import structlog
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 # First-party/Local
 from controlpanel.api import permissions
+from controlpanel.api.db_routers import use_replica
 from controlpanel.api.filters import DashboardFilter
-from controlpanel.api.models.dashboard import Dashboard
+from controlpanel.api.models.dashboard import Dashboard, DashboardAccess
 from controlpanel.api.pagination import DashboardPaginator
-from controlpanel.api.serializers import DashboardDetailSerializer, DashboardListSerializer
+from controlpanel.api.serializers import (
+    DashboardDetailSerializer,
+    DashboardEmbedUrlSerializer,
+    DashboardListSerializer,
+)
 
 log = structlog.getLogger(__name__)
 
 
+@use_replica
 class DashboardViewSet(ReadOnlyModelViewSet):
     """
     A ViewSet for managing dashboards.
@@ -29,19 +42,81 @@ class DashboardViewSet(ReadOnlyModelViewSet):
     def get_serializer_class(self):
         if self.action == "retrieve":
             return DashboardDetailSerializer
+        if self.action == "embed_url":
+            return DashboardEmbedUrlSerializer
         return DashboardListSerializer
 
     def retrieve(self, request, *args, **kwargs):
         """
         Require an email, even when viewing as a superuser, as the response includes fields that are
-        specific to a user.
+        specific to a user. A HEAD request only checks the dashboard is visible to the email.
+
+        The ETag and Last-Modified time are the version of the dashboard's metadata as seen by the
+        email, so clients can revalidate it with If-None-Match or If-Modified-Since, and request an
+        embed URL only when they render the dashboard. They are checked before serializing it.
+        """
+        email = request.query_params.get("email")
+        if not email:
+            return Response({"error": "Email query parameter is required."}, status=400)
+        if request.method == "HEAD":
+            # fast path to check access, without serializing the dashboard
+            exists = (
+                self.filter_queryset(self.get_queryset())
+                .filter(quicksight_id=kwargs[self.lookup_field])
+                .exists()
+            )
+            return Response(status=status.HTTP_200_OK if exists else status.HTTP_404_NOT_FOUND)
+
+        dashboard = self.get_object()
+        log.info(f"{dashboard.name} requested by {email}", audit="dashboard_audit")
+        access = DashboardAccess.objects.shared_with(email, dashboard)
+        etag, last_modified = self._get_version(dashboard, access)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            context = self.get_serializer_context()
+            context["dashboard_access"] = access
+            response = Response(self.get_serializer(dashboard, context=context).data)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        # can be stored, but has to be revalidated every time it's used
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def _get_version(self, dashboard, access):
+        """
+        The ETag and Last-Modified time of the dashboard for the email it was shared with through
+        the given access. The dashboard's `modified` time changes whenever who it is shared with
+        does, but the user who shared it has no modified time, so their details are only part of
+        the ETag, which takes precedence over If-Modified-Since.
+        """
+        version = [dashboard.pk, dashboard.modified.timestamp()]
+        last_modified = dashboard.modified
+        if access:
+            version += [
+                access.via,
+                access.shared_on.timestamp(),
+                access.shared_by_id,
+                access.shared_by.justice_email,
+                access.shared_by.name,
+            ]
+            last_modified = max(last_modified, access.shared_on)
+        etag = quote_etag(hashlib.sha256(repr(version).encode()).hexdigest())
+        return etag, int(last_modified.timestamp())
+
+    @action(detail=True, methods=["get"], url_path="embed-url")
+    def embed_url(self, request, *args, **kwargs):
+        """
+        Issue a QuickSight embed URL for the dashboard. Each URL can only be used once, so this
+        should be requested when the dashboard is about to be rendered.
         """
         if not request.query_params.get("email"):
             return Response({"error": "Email query parameter is required."}, status=400)
-        response = super().retrieve(request, *args, **kwargs)
-        dashboard_name = response.data["name"]
+
+        dashboard = self.get_object()
         log.info(
-            f"{dashboard_name} requested by {request.query_params.get('email')}",
+            f"Embed URL for {dashboard.name} issued to {request.query_params.get('email')}",
             audit="dashboard_audit",
         )
-        return response
+        serializer = self.get_serializer(dashboard.get_embed_url())
+        return Response(serializer.data)
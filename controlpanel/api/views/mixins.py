@@ -0,0 +1,31 @@
+# Third-party
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+
+# First-party/Local
+from controlpanel.utils import aiter_chunks, iter_queryset
+
+
+class ExportMixin:
+    """
+    Adds an `export` endpoint streaming every object in the list as JSON lines,
+    for clients that need all of them rather than a page at a time. It's only
+    allowed for superusers, and clients with the `export:<resource>` scope.
+    """
+
+    # the relations the serializer follows, fetched for each chunk of objects
+    export_prefetch_related = ()
+
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.prefetch_related(*self.export_prefetch_related)
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        renderer = JSONRenderer()
+        lines = (
+            renderer.render(serializer_class(obj, context=context).data) + b"\n"
+            for obj in iter_queryset(queryset)
+        )
+        return StreamingHttpResponse(aiter_chunks(lines), content_type="application/x-ndjson")
@@ -10,21 +10,24 @@ from rest_framework.response import Response
 from controlpanel.api import filters, permissions, serializers
 from controlpanel.api.elasticsearch import bucket_hits_aggregation
 from controlpanel.api.models import App, AppS3Bucket, S3Bucket, User, UserApp, UserS3Bucket
+from controlpanel.api.views.mixins import ExportMixin
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ExportMixin, viewsets.ModelViewSet):
     resource = "user"
 
     queryset = User.objects.all()
     serializer_class = serializers.UserSerializer
+    export_prefetch_related = ("groups", "userapps__app", "users3buckets__s3bucket")
     filter_backends = (DjangoFilterBackend,)
     permission_classes = (permissions.UserPermissions | permissions.JWTTokenResourcePermissions,)
 
 
-class AppViewSet(viewsets.ModelViewSet):
+class AppViewSet(ExportMixin, viewsets.ModelViewSet):
     resource = "app"
 
     serializer_class = serializers.AppSerializer
+    export_prefetch_related = ("userapps__user", "apps3buckets__s3bucket", "ip_allowlists")
     filter_backends = (DjangoFilterBackend,)
     permission_classes = (permissions.AppPermissions | permissions.AppJwtPermissions,)
     filterset_fields = ("name", "repo_url", "slug")
@@ -51,23 +54,24 @@ class AppViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class AppS3BucketViewSet(viewsets.ModelViewSet):
+class AppS3BucketViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = AppS3Bucket.objects.all()
     serializer_class = serializers.AppS3BucketSerializer
     permission_classes = (permissions.AppS3BucketPermissions,)
     filter_backends = (filters.AppS3BucketFilter,)
 
 
-class UserS3BucketViewSet(viewsets.ModelViewSet):
+class UserS3BucketViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = UserS3Bucket.objects.all()
     serializer_class = serializers.UserS3BucketSerializer
     filter_backends = (filters.UserS3BucketFilter,)
     permission_classes = (permissions.UserS3BucketPermissions,)
 
 
-class S3BucketViewSet(viewsets.ModelViewSet):
+class S3BucketViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = S3Bucket.objects.all()
     serializer_class = serializers.S3BucketSerializer
+    export_prefetch_related = ("apps3buckets__app", "users3buckets__user")
     filter_backends = (filters.S3BucketFilter,)
     permission_classes = (permissions.S3BucketPermissions,)
     filterset_fields = ("is_data_warehouse",)
@@ -87,6 +91,6 @@ class S3BucketViewSet(viewsets.ModelViewSet):
         return Response(serializers.ESBucketHitsSerializer(result).data)
 
 
-class UserAppViewSet(viewsets.ModelViewSet):
+class UserAppViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = UserApp.objects.all()
     serializer_class = serializers.UserAppSerializer
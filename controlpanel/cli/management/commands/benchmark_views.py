@@ -0,0 +1,143 @@
+# Standard library
+import asyncio
+from time import monotonic, time
+
+# Third-party
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+# First-party/Local
+from controlpanel.api.models import User
+
+DEFAULT_VIEWS = ["list-apps", "list-warehouse-datasources", "list-users", "app-list"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the requests per second of representative views as a superuser, served "
+        "by the ASGI handler like the web app, with database connections closed after "
+        "each request and with pooled connections"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="Username of the superuser to make requests as")
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=100,
+            help="How many requests to make to each view (default: 100)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="How many requests to make at the same time (default: 4)",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path of a view to request, instead of the default views. Can be repeated",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"], is_superuser=True)
+        except User.DoesNotExist:
+            raise CommandError(f"Superuser {options['username']} not found") from None
+
+        scope = self.get_scope(user)
+        paths = options["paths"] or [reverse(name) for name in DEFAULT_VIEWS]
+        handler = ASGIHandler()
+        settings_dict = connection.settings_dict
+        conn_max_age, pool = settings_dict["CONN_MAX_AGE"], settings_dict["OPTIONS"].get("pool")
+        # each request runs in its own thread, with its own connection, so only
+        # the pool reuses them
+        settings_dict["CONN_MAX_AGE"] = 0
+        connection.close()
+        try:
+            for path in paths:
+                closed, pooled = (
+                    self.requests_per_second(handler, scope, path, pool_options, options)
+                    for pool_options in (None, pool or settings.DB_POOL_OPTIONS)
+                )
+                self.stdout.write(
+                    f"{path}: {closed:.1f} requests/s closing connections, "
+                    f"{pooled:.1f} requests/s with pooled connections"
+                )
+        finally:
+            connection.close_pool()
+            settings_dict["CONN_MAX_AGE"] = conn_max_age
+            settings_dict["OPTIONS"].pop("pool", None)
+            if pool:
+                settings_dict["OPTIONS"]["pool"] = pool
+
+    def get_scope(self, user):
+        """
+        Returns the ASGI scope of a request with a session for the user, which
+        won't need its OIDC token refreshing while the views are requested
+        """
+        client = Client()
+        client.force_login(user)
+        session = client.session
+        session["oidc_id_token_expiration"] = time() + 3600
+        session.save()
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "query_string": b"",
+            "headers": [
+                (b"host", settings.ALLOWED_HOSTS[0].encode()),
+                (b"cookie", f"{settings.SESSION_COOKIE_NAME}={session.session_key}".encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("127.0.0.1", 80),
+        }
+
+    def requests_per_second(self, handler, scope, path, pool_options, options):
+        connection.close_pool()
+        connection.settings_dict["OPTIONS"].pop("pool", None)
+        if pool_options:
+            connection.settings_dict["OPTIONS"]["pool"] = pool_options
+
+        started = monotonic()
+        asyncio.run(self.make_requests(handler, {**scope, "path": path}, options))
+        return options["requests"] / (monotonic() - started)
+
+    async def make_requests(self, handler, scope, options):
+        concurrency = asyncio.Semaphore(options["concurrency"])
+
+        async def request():
+            async with concurrency:
+                await self.request(handler, scope)
+
+        await asyncio.gather(*(request() for _ in range(options["requests"])))
+
+    async def request(self, handler, scope):
+        disconnected = asyncio.Event()
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+        status = None
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # the handler listens for the client disconnecting until it responds
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await handler(scope, receive, send)
+        disconnected.set()
+        if status != 200:
+            raise CommandError(f"{scope['path']} responded with {status}")
@@ -1,9 +1,15 @@
 # Standard library
 import csv
+import json
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from time import sleep, time
 
 # Third-party
-from auth0.exceptions import Auth0Error
+from auth0.exceptions import Auth0Error, RateLimitError
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
@@ -12,6 +18,18 @@ from controlpanel.api import auth0
 
 
 class Command(BaseCommand):
+    """
+    The clean up is done in two steps. First the full list of deletions is
+    planned, from a single read of the roles, clients, groups and group members,
+    and saved to PLAN_FILE_NAME. The deletions are then executed, a stage at a
+    time as e.g. a group can't be deleted before its members nor a role before
+    its group, with a bounded number running concurrently within each stage.
+
+    Each deletion done is recorded in PROGRESS_FILE_NAME, so if the command is
+    interrupted, running it again executes the saved plan from where it stopped
+    rather than planning again.
+    """
+
     help = "Clear up the auth0 resources for app migration"
 
     CSV_OUTPUT_FILE_NAME = "./users_list.csv"
@@ -33,8 +51,30 @@ class Command(BaseCommand):
 
     SKIP_GROUP_NAMES = []
 
+    PLAN_FILE_NAME = "./clear_up_auth0_resources_plan.json"
+    PROGRESS_FILE_NAME = "./clear_up_auth0_resources_progress.txt"
+
+    STAGES = ["delete_group_members", "delete_group", "delete_role", "delete_permission"]
+    MAX_WORKERS = 4
+    MAX_RETRIES = 5
+
     def add_arguments(self, parser):
-        pass
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=self.MAX_WORKERS,
+            help="The maximum number of Auth0 requests to make at the same time",
+        )
+        parser.add_argument(
+            "--plan-only",
+            action="store_true",
+            help="Only plan the deletions and save them, without deleting anything",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Discard the saved plan and progress, and plan the deletions again",
+        )
 
     def _get_auth0_client_name(self, app_name, env_name):
         return settings.AUTH0_CLIENT_NAME_PATTERN.format(app_name=app_name, env=env_name)
@@ -102,28 +142,61 @@ class Command(BaseCommand):
             self._log_info("Done!")
         return collect_removable_roles
 
-    def clear_up_unused_groups(self, auth0_instance, collect_removable_groups):
-        for cnt, group in enumerate(collect_removable_groups):
-            self._log_info(f"{cnt}----delete the group ({group['name']})")
-            if group.get("members"):
-                auth0_instance.groups.delete_group_members(group.get("members"), group["_id"])
-            auth0_instance.groups.delete(group["_id"])
+    def _operation(self, action, description, **args):
+        key = ":".join(
+            [action] + [str(value) for value in args.values() if not isinstance(value, list)]
+        )
+        return {"key": key, "action": action, "description": description, "args": args}
 
-    def clear_up_unused_permission_related_resources(
-        self, auth0_instance, collect_removable_roles, auth0_groups
-    ):
-        for cnt, role in enumerate(collect_removable_roles):
+    def plan_unused_groups(self, collect_removable_groups):
+        operations = []
+        for group in collect_removable_groups:
+            operations.extend(self._plan_group_deletion(group))
+        return operations
+
+    def _plan_group_deletion(self, group):
+        operations = []
+        if group.get("members"):
+            operations.append(
+                self._operation(
+                    "delete_group_members",
+                    f"delete the members of the group ({group['name']})",
+                    group_id=group["_id"],
+                    user_ids=group["members"],
+                )
+            )
+        operations.append(
+            self._operation(
+                "delete_group", f"delete the group ({group['name']})", group_id=group["_id"]
+            )
+        )
+        return operations
+
+    def plan_unused_permission_related_resources(self, collect_removable_roles, auth0_groups):
+        operations = []
+        for role in collect_removable_roles:
             group = auth0_groups.get(role["_id"])
             if not group:
                 self._log_info(f"{role['applicationId']} cannot find the group")
             else:
-                self._log_info(f"{cnt}----{role['applicationId']} find the group ({group['name']})")
-                if group.get("members"):
-                    auth0_instance.groups.delete_group_members(group.get("members"), group["_id"])
-                auth0_instance.groups.delete(group["_id"])
-            auth0_instance.roles.delete(role["_id"])
+                self._log_info(f"{role['applicationId']} find the group ({group['name']})")
+                operations.extend(self._plan_group_deletion(group))
+            operations.append(
+                self._operation(
+                    "delete_role",
+                    f"delete the role ({role['name']}) of {role['applicationId']}",
+                    role_id=role["_id"],
+                )
+            )
             for permission_id in role["permissions"]:
-                auth0_instance.permissions.delete(permission_id)
+                operations.append(
+                    self._operation(
+                        "delete_permission",
+                        f"delete the permission of {role['applicationId']}",
+                        permission_id=permission_id,
+                    )
+                )
+        return operations
 
     def clear_up_some_apps_members(self, auth0_instance, group_ids):
         for group_id in group_ids:
@@ -201,43 +274,211 @@ class Command(BaseCommand):
             f.write(",".join(data))
             f.write("\n")
 
-    def clear_up_ancient_users_from_groups(self, auth0_instance, auth0_groups):
-        for group in auth0_groups.values():
-            if group["name"] in self.SKIP_GROUP_NAMES:
-                continue
+    def _get_member_info(self, auth0_instance, member_id):
+        try:
+            return auth0_instance.users.get(member_id)
+        except Auth0Error as error:
+            if error.status_code == 404:
+                return None
+            raise
+
+    def plan_ancient_users_removal(
+        self, auth0_instance, auth0_groups, skip_group_ids=(), concurrency=MAX_WORKERS
+    ):
+        groups = [
+            group
+            for group in auth0_groups.values()
+            if group["name"] not in self.SKIP_GROUP_NAMES and group["_id"] not in skip_group_ids
+        ]
+        # each user is only looked up once, however many groups they are in
+        member_ids = list(
+            {member_id for group in groups for member_id in group.get("members") or []}
+        )
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            members = dict(
+                zip(
+                    member_ids,
+                    executor.map(
+                        lambda member_id: self._get_member_info(auth0_instance, member_id),
+                        member_ids,
+                    ),
+                    strict=True,
+                )
+            )
 
+        operations = []
+        for group in groups:
             self._log_info(
                 f"group ({group['name']}) has {len(group.get('members') or [])} number of users."
             )
             ancient_users = []
             non_exist_users = []
             for member_id in group.get("members") or []:
-                try:
-                    user_info = auth0_instance.users.get(member_id)
-                    if self._is_ancient_user(user_info):
-                        ancient_users.append(member_id)
-                        self._log_remove_group_member(group, user_info)
-                        self._log_info(f"Removing the member {user_info['email']}")
-                        auth0_instance.groups.delete_group_members([member_id], group["_id"])
-                except Auth0Error as error:
-                    if error.status_code == 404:
-                        non_exist_users.append(member_id)
-                        self._log_info(f"Removing the member {member_id}")
-                        auth0_instance.groups.delete_group_members([member_id], group["_id"])
+                user_info = members[member_id]
+                if user_info is None:
+                    non_exist_users.append(member_id)
+                elif self._is_ancient_user(user_info):
+                    ancient_users.append(member_id)
+                    self._log_remove_group_member(group, user_info)
 
             self._log_info(
                 f"group ({group['name']}) has {len(ancient_users)} number of ancient users, "
                 f"{len(non_exist_users)} number of non-existed users"
             )
+            if ancient_users or non_exist_users:
+                operations.append(
+                    self._operation(
+                        "delete_group_members",
+                        f"remove {len(ancient_users) + len(non_exist_users)} members from the "
+                        f"group ({group['name']})",
+                        group_id=group["_id"],
+                        user_ids=ancient_users + non_exist_users,
+                    )
+                )
+        return operations
 
-    def handle(self, *args, **options):
-        auth0_instance = auth0.ExtendedAuth0()
+    def plan(self, auth0_instance, concurrency=MAX_WORKERS):
         auth0_roles, auth0_clients, auth0_groups, collect_removable_groups = (
             self.load_auth0_resources(auth0_instance)
         )
         collect_removable_roles = self.collect_unused_roles(auth0_roles, auth0_clients)
-        self.clear_up_unused_permission_related_resources(
-            auth0_instance, collect_removable_roles, auth0_groups
+        operations = self.plan_unused_permission_related_resources(
+            collect_removable_roles, auth0_groups
+        )
+        operations.extend(self.plan_unused_groups(collect_removable_groups))
+        deleted_group_ids = {
+            operation["args"]["group_id"]
+            for operation in operations
+            if operation["action"] == "delete_group"
+        }
+        operations.extend(
+            self.plan_ancient_users_removal(
+                auth0_instance, auth0_groups, deleted_group_ids, concurrency=concurrency
+            )
+        )
+        return operations
+
+    def load_or_create_plan(self, auth0_instance, restart=False, concurrency=MAX_WORKERS):
+        if restart:
+            for file_name in (self.PLAN_FILE_NAME, self.PROGRESS_FILE_NAME):
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+
+        if os.path.exists(self.PLAN_FILE_NAME):
+            self._log_info(f"Resuming the plan saved in {self.PLAN_FILE_NAME}")
+            with open(self.PLAN_FILE_NAME) as f:
+                return json.load(f)
+
+        operations = self.plan(auth0_instance, concurrency=concurrency)
+        with open(self.PLAN_FILE_NAME, "w") as f:
+            json.dump(operations, f, indent=2)
+        self._log_info(f"Planned {len(operations)} deletions, saved in {self.PLAN_FILE_NAME}")
+        return operations
+
+    def _read_progress(self):
+        if not os.path.exists(self.PROGRESS_FILE_NAME):
+            return set()
+        with open(self.PROGRESS_FILE_NAME) as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def _execute_operation(self, auth0_instance, operation):
+        args = operation["args"]
+        actions = {
+            "delete_group_members": lambda: auth0_instance.groups.delete_group_members(
+                args["user_ids"], args["group_id"]
+            ),
+            "delete_group": lambda: auth0_instance.groups.delete(args["group_id"]),
+            "delete_role": lambda: auth0_instance.roles.delete(args["role_id"]),
+            "delete_permission": lambda: auth0_instance.permissions.delete(args["permission_id"]),
+        }
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            try:
+                actions[operation["action"]]()
+                return "deleted"
+            except RateLimitError as error:
+                if attempt == self.MAX_RETRIES:
+                    raise
+                # reset_at is the epoch time at which the rate limit resets
+                sleep(max(error.reset_at - time(), 2**attempt))
+            except Auth0Error as error:
+                # deleted by a previous, interrupted run
+                if error.status_code == 404:
+                    return "not found"
+                raise
+
+    def execute_plan(self, auth0_instance, operations, concurrency=MAX_WORKERS):
+        """
+        Run the planned deletions, returns a Counter of the outcome of each
+        kind of deletion
+        """
+        summary = Counter()
+        done = self._read_progress()
+        progress_lock = threading.Lock()
+
+        def run(operation):
+            try:
+                outcome = self._execute_operation(auth0_instance, operation)
+            except (Auth0Error, auth0.Auth0Error) as error:
+                self._log_info(f"Failed to {operation['description']}: {error}")
+                return "failed"
+            with progress_lock:
+                with open(self.PROGRESS_FILE_NAME, "a") as f:
+                    f.write(f"{operation['key']}\n")
+            self._log_info(f"Done: {operation['description']}")
+            return outcome
+
+        for stage in self.STAGES:
+            pending = []
+            for operation in operations:
+                if operation["action"] != stage:
+                    continue
+                if operation["key"] in done:
+                    summary[(stage, "already done")] += 1
+                else:
+                    pending.append(operation)
+
+            self._log_info(f"Starting {len(pending)} {stage} operations")
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for outcome in executor.map(run, pending):
+                    summary[(stage, outcome)] += 1
+
+            if summary[(stage, "failed")]:
+                # the later stages depend on this one
+                self._log_info(f"Stopping as some {stage} operations failed")
+                break
+        return summary
+
+    def report(self, summary):
+        self._log_info("Summary:")
+        for stage in self.STAGES:
+            outcomes = {
+                outcome: count for (action, outcome), count in summary.items() if action == stage
+            }
+            if outcomes:
+                counts = ", ".join(f"{count} {outcome}" for outcome, count in outcomes.items())
+                self._log_info(f"  {stage}: {counts}")
+        if not summary:
+            self._log_info("  nothing to delete")
+
+    def handle(self, *args, **options):
+        auth0_instance = auth0.ExtendedAuth0()
+        concurrency = options["concurrency"]
+        if concurrency < 1:
+            raise CommandError("--concurrency must be at least 1")
+
+        operations = self.load_or_create_plan(
+            auth0_instance, restart=options["restart"], concurrency=concurrency
         )
-        self.clear_up_unused_groups(auth0_instance, collect_removable_groups)
-        self.clear_up_ancient_users_from_groups(auth0_instance, auth0_groups)
+        if options["plan_only"]:
+            return
+
+        summary = self.execute_plan(auth0_instance, operations, concurrency=concurrency)
+        self.report(summary)
+        if any(outcome == "failed" for _, outcome in summary):
+            raise CommandError(
+                f"Some deletions failed, run the command again to resume the plan in "
+                f"{self.PLAN_FILE_NAME}"
+            )
+        os.remove(self.PLAN_FILE_NAME)
+        if os.path.exists(self.PROGRESS_FILE_NAME):
+            os.remove(self.PROGRESS_FILE_NAME)
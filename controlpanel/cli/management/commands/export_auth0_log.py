@@ -1,10 +1,15 @@
 # Standard library
+import gzip
+import json
+import os
 from datetime import datetime
-from time import time
+from pathlib import Path
+from time import sleep, time
 
 # Third-party
-import pandas
+from auth0.exceptions import RateLimitError
 from auth0.management.logs import Logs
+from auth0.rest import RestClientOptions
 from django.core.management.base import BaseCommand, CommandError
 
 # First-party/Local
@@ -22,66 +27,136 @@ class Command(BaseCommand):
     900<YYYY><MM><DD><HH><MM>....
     and the length is 56
     We will generate the log_id based on the start_date and end_date based on the above format
+
+    Each page of logs is appended to a gzip compressed NDJSON file as soon as
+    it is read, and the last log_id written and the size of the file are saved
+    to a checkpoint file next to it. Running the command again with the same
+    output file truncates it to that size, dropping any page that wasn't
+    checkpointed, and resumes from the log_id, so a failed export doesn't have
+    to start again from scratch.
     """
 
     help = "Export auth log from auth0"
 
-    BASE_CSV_FILE_FOR_AUTH0_LOG = "auth0_log_result"
+    BASE_FILE_FOR_AUTH0_LOG = "auth0_log_result"
 
     LOG_ID_LENGTH = 56
     LOG_ID_PREFIX = "900"
-    BREAKING_POINT_FOR_STORAGE = 500
     LOG_AMOUNT_TO_TAKE = 100
 
+    MAX_RETRIES = 10
+    # seconds to wait when the rate limit response doesn't say when it resets
+    DEFAULT_BACKOFF = 2
+
     def add_arguments(self, parser):
         parser.add_argument(
             "start_date", type=str, help="start date (format: YYYY-MM-DD for the log"
         )
         parser.add_argument("end_date", type=str, help="end date (format: YYYY-MM-DD) for the log")
-
-    def read_logs_by_log_id(self, auth0_logs, require_header, start_log_id, end_id, csv_file_name):
-        logs = auth0_logs.search(from_param=start_log_id, take=self.LOG_AMOUNT_TO_TAKE)
-        is_empty = len(logs) == 0
-        if is_empty:
-            return True, None
-        df = pandas.DataFrame(logs)
-        df.to_csv(csv_file_name, mode="a", header=require_header, index=False, compression="gzip")
-        current_end_log_id = logs[-1].get("log_id")
-        if current_end_log_id >= end_id:
-            return True, None
-        return False, current_end_log_id
+        parser.add_argument(
+            "--output",
+            type=str,
+            help="The file to write the logs to, defaults to "
+            f"{self.BASE_FILE_FOR_AUTH0_LOG}_<start_date>_<end_date>.ndjson.gz. "
+            "If a checkpoint exists for it the export is resumed",
+        )
 
     def generate_log_id(self, date_in_string):
         log_id = f"{self.LOG_ID_PREFIX}{date_in_string.replace('-', '')}"
         return log_id.ljust(self.LOG_ID_LENGTH, "0")
 
-    def export_auth0_to_csv(self, start_date: str, end_date: str):
+    def get_logs_client(self):
         auth0_instance = auth0.ExtendedAuth0()
-        auth0_logs = Logs(auth0_instance.domain, auth0_instance._token, timeout=30)
+        # rate limits are handled by search_logs, so the backoff can be reported
+        return Logs(
+            auth0_instance.domain,
+            auth0_instance._token,
+            timeout=30,
+            rest_options=RestClientOptions(timeout=30, retries=0),
+        )
 
-        start_log_id = self.generate_log_id(start_date)
+    def search_logs(self, auth0_logs, from_log_id):
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            try:
+                return auth0_logs.search(from_param=from_log_id, take=self.LOG_AMOUNT_TO_TAKE)
+            except RateLimitError as error:
+                if attempt == self.MAX_RETRIES:
+                    raise CommandError(
+                        f"Rate limited by Auth0 {attempt} times, run the command again to "
+                        f"resume from {from_log_id}"
+                    ) from error
+                # reset_at is the epoch time at which the rate limit resets
+                wait = error.reset_at - time() if error.reset_at > 0 else 0
+                wait = max(wait, self.DEFAULT_BACKOFF * 2 ** (attempt - 1))
+                self.stdout.write(f"Rate limited by Auth0, waiting {wait:.0f} seconds")
+                sleep(wait)
+
+    def read_checkpoint(self, checkpoint_file):
+        """
+        Returns the last log_id exported and the size of the output file after
+        it was written, or (None, 0) without a checkpoint
+        """
+        if checkpoint_file.exists():
+            checkpoint = json.loads(checkpoint_file.read_text())
+            return checkpoint["log_id"], checkpoint["size"]
+        return None, 0
+
+    def write_checkpoint(self, checkpoint_file, log_id, size):
+        # replace the file in one go, so a crash can't leave half a checkpoint in it
+        tmp_file = checkpoint_file.with_name(f"{checkpoint_file.name}.tmp")
+        tmp_file.write_text(json.dumps({"log_id": log_id, "size": size}))
+        os.replace(tmp_file, checkpoint_file)
+
+    def export_auth0_logs(self, start_date: str, end_date: str, output=None):
+        auth0_logs = self.get_logs_client()
+
+        output_file = Path(
+            output or f"{self.BASE_FILE_FOR_AUTH0_LOG}_{start_date}_{end_date}.ndjson.gz"
+        )
+        checkpoint_file = output_file.with_name(f"{output_file.name}.checkpoint")
         end_log_id = self.generate_log_id(end_date)
-        base_csv_file_name = f"{self.BASE_CSV_FILE_FOR_AUTH0_LOG}_{int(time())}"
 
-        file_cnt = 1
-        page_no = 1
+        next_log_id, size = self.read_checkpoint(checkpoint_file)
+        if next_log_id:
+            if not output_file.exists() or output_file.stat().st_size < size:
+                raise CommandError(
+                    f"{output_file} is shorter than when it was checkpointed, remove "
+                    f"{checkpoint_file} to export again from scratch"
+                )
+            self.stdout.write(f"Resuming the export to {output_file} from {next_log_id}")
+            # drop what was written after the checkpoint, which could be a
+            # truncated gzip member or a page the resumed export will write again
+            os.truncate(output_file, size)
+        else:
+            next_log_id = self.generate_log_id(start_date)
+            # don't append to the logs of a previous, finished export
+            output_file.unlink(missing_ok=True)
+
+        page_no = 0
+        total = 0
         is_finished = False
-        require_header = True
-        next_log_id = start_log_id
         while not is_finished:
-            csv_file_name = f"{base_csv_file_name}_{file_cnt}.csv.gzip"
-            is_finished, next_log_id = self.read_logs_by_log_id(
-                auth0_logs, require_header, next_log_id, end_log_id, csv_file_name
-            )
-            if page_no == self.BREAKING_POINT_FOR_STORAGE:
-                page_no = 1
-                file_cnt += 1
-                require_header = True
-                self.stdout.write(f"Finished the file {file_cnt} for storing logs")
-            else:
-                page_no += 1
-                require_header = False
-                self.stdout.write(f"----Finished processing the page {page_no} of logs")
+            page = self.search_logs(auth0_logs, next_log_id)
+            logs = [log for log in page if log.get("log_id", "") < end_log_id]
+            # an empty page, or one reaching the end date, is the last one
+            is_finished = len(logs) < len(page) or not page
+            if not logs:
+                break
+
+            # every page is a complete gzip member, which readers concatenate
+            with gzip.open(output_file, "at", encoding="utf-8") as log_file:
+                for log in logs:
+                    log_file.write(json.dumps(log, default=str))
+                    log_file.write("\n")
+            next_log_id = logs[-1]["log_id"]
+            self.write_checkpoint(checkpoint_file, next_log_id, output_file.stat().st_size)
+
+            page_no += 1
+            total += len(logs)
+            self.stdout.write(f"----Finished processing the page {page_no} of logs")
+
+        checkpoint_file.unlink(missing_ok=True)
+        self.stdout.write(f"Exported {total} logs to {output_file}")
 
     def validate_date_string(self, date_string):
         try:
@@ -92,4 +167,4 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.validate_date_string(options["start_date"])
         self.validate_date_string(options["end_date"])
-        self.export_auth0_to_csv(options["start_date"], options["end_date"])
+        self.export_auth0_logs(options["start_date"], options["end_date"], options["output"])
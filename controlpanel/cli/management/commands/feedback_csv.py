@@ -1,7 +1,6 @@
 # Standard library
-import csv
 from datetime import datetime, timedelta, timezone
-from io import StringIO
+from tempfile import TemporaryFile
 
 # Third-party
 from django.conf import settings
@@ -10,6 +9,7 @@ from django.core.management.base import BaseCommand
 # First-party/Local
 from controlpanel.api.aws import AWSBucket
 from controlpanel.api.models import Feedback
+from controlpanel.utils import iter_csv, iter_queryset
 
 
 class Command(BaseCommand):
@@ -36,30 +36,33 @@ class Command(BaseCommand):
             timeframe = today - timedelta(weeks=options["weeks"])
             feedback_items = Feedback.objects.filter(date_added__gte=timeframe)
 
-        if not feedback_items:
+        if not feedback_items.exists():
             self.stdout.write(f"No feedback found for the past {options['weeks']} weeks")
             return
 
         filename = f"feedback_{today}.csv"
-        csv_buffer = StringIO()
-        writer = csv.writer(csv_buffer, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL)
-        writer.writerow(self.csv_headings)
-        for feedback in feedback_items:
-            row = [
+        rows = (
+            [
                 feedback.get_satisfaction_rating_display(),
                 feedback.suggestions,
                 feedback.date_added.date(),
             ]
-            writer.writerow(row)
+            for feedback in iter_queryset(feedback_items)
+        )
+
+        # the CSV is written to a temporary file, rather than built in memory,
+        # and the file is uploaded
+        with TemporaryFile() as csv_file:
+            csv_file.writelines(line.encode() for line in iter_csv(self.csv_headings, rows))
+            csv_file.seek(0)
 
-        try:
-            csv_value = csv_buffer.getvalue()
-            bucket = AWSBucket()
+            try:
+                bucket = AWSBucket()
 
-            if not bucket.exists(settings.FEEDBACK_BUCKET_NAME):
-                bucket.create(settings.FEEDBACK_BUCKET_NAME)
+                if not bucket.exists(settings.FEEDBACK_BUCKET_NAME):
+                    bucket.create(settings.FEEDBACK_BUCKET_NAME)
 
-            bucket.write_to_bucket(settings.FEEDBACK_BUCKET_NAME, filename, csv_value)
-            self.stdout.write(f"Feedback data written to {settings.FEEDBACK_BUCKET_NAME}")
-        except Exception as e:
-            self.stdout.write(f"Failed to write to S3 bucket: {e}")
+                bucket.write_to_bucket(settings.FEEDBACK_BUCKET_NAME, filename, csv_file)
+                self.stdout.write(f"Feedback data written to {settings.FEEDBACK_BUCKET_NAME}")
+            except Exception as e:
+                self.stdout.write(f"Failed to write to S3 bucket: {e}")
@@ -1,5 +1,4 @@
 # Standard library
-import csv
 from datetime import datetime
 
 # Third-party
@@ -7,6 +6,7 @@ from django.core.management import BaseCommand
 
 # First-party/Local
 from controlpanel.api import auth0
+from controlpanel.utils import iter_csv
 
 
 class Command(BaseCommand):
@@ -22,8 +22,7 @@ class Command(BaseCommand):
         auth_instance = auth0.ExtendedAuth0()
         group_id = auth_instance.groups.get_group_id(group_name)
         timestamp = datetime.now().strftime("%d-%m-%Y_%H%M")
-        with open(f"{group_name}_customers_{timestamp}.csv", "w") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Email"])
-            for customer in auth_instance.groups.get_group_members(group_id):
-                writer.writerow([customer["email"]])
+        # the members are written a page at a time, rather than fetched first
+        customers = auth_instance.groups.iter_group_members(group_id)
+        with open(f"{group_name}_customers_{timestamp}.csv", "w", newline="") as f:
+            f.writelines(iter_csv(["Email"], ([customer["email"]] for customer in customers)))
@@ -0,0 +1,32 @@
+# Third-party
+from django.core.management.base import BaseCommand
+
+# First-party/Local
+from controlpanel.api.tasks.dashboards import prune_dashboard_viewers
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove dashboard viewers that no dashboard is shared with, and their access to "
+        "the dashboard service in Auth0. This is also run nightly by celery beat"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many viewers would be removed",
+        )
+
+    def handle(self, *args, **options):
+        summary = prune_dashboard_viewers(dry_run=options["dry_run"])
+        timings = ", ".join(
+            f"{step} {seconds:.2f}s" for step, seconds in summary["timings"].items()
+        )
+        if summary["dry_run"]:
+            self.stdout.write(f"{summary['stale']} dashboard viewers would be removed ({timings})")
+            return
+        self.stdout.write(
+            f"Removed {summary['deleted']} of {summary['stale']} stale dashboard viewers, "
+            f"failed to remove {summary['failed']} from Auth0 ({timings})"
+        )
@@ -3,6 +3,7 @@ import asyncio
 import json
 import os
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from time import sleep
 
@@ -13,9 +14,9 @@ from django.conf import settings
 from django.db import transaction
 
 # First-party/Local
-from controlpanel.api import cluster
 from controlpanel.api.cluster import TOOL_DEPLOY_FAILED, TOOL_DEPLOYING, TOOL_RESTARTING
 from controlpanel.api.helm import HelmReleaseNotFound
+from controlpanel.api.ip_ranges import IPAllowlistPropagator
 from controlpanel.api.models import App, IPAllowlist, ToolDeployment, User
 from controlpanel.utils import PatchedAsyncHttpConsumer, sanitize_dns_label, send_sse
 
@@ -101,41 +102,76 @@ class SSEConsumer(PatchedAsyncHttpConsumer):
 
 
 class BackgroundTaskConsumer(SyncConsumer):
-    def app_ip_ranges_update(self, message):
+    def ip_allowlist_update(self, message):
+        """
+        Push the new IP_RANGES secret to every app environment using the
+        updated IP allowlist. Expects the allowlist's `previous_ip_ranges` so
+        environments whose effective ranges are unchanged can be skipped.
+        """
         user = User.objects.get(auth0_id=message["user_id"])
-        app = App.objects.get(pk=message["app_id"])
+        ip_allowlist = IPAllowlist.objects.get(pk=message["ip_allowlist_id"])
 
-        app_manager_ins = cluster.App(app, user.github_api_token)
-        deployment_env_names = app_manager_ins.get_deployment_envs()
+        IPAllowlistPropagator(
+            user.github_api_token,
+            progress_callback=partial(update_ip_allowlist_status, user, ip_allowlist),
+        ).propagate(ip_allowlist, previous_ip_ranges=message.get("previous_ip_ranges"))
 
-        for env_name in deployment_env_names:
-            app_manager_ins.create_or_update_secret(
-                env_name=env_name,
-                secret_key=cluster.App.IP_RANGES,
-                secret_value=app.env_allowed_ip_ranges(env_name=env_name),
-            )
-
-    def app_ip_ranges_delete(self, message):
+    def ip_allowlist_delete(self, message):
+        """
+        Update the IP_RANGES secret of the app environments using a deleted IP
+        allowlist, unlink it from the environments that were updated and then
+        remove it. If any update fails the allowlist is kept, still marked as
+        deleted and linked to those environments, so deleting it again retries.
+        """
         user = User.objects.get(auth0_id=message["user_id"])
-        app = App.objects.get(pk=message["app_id"])
-        ip_range = IPAllowlist.objects.get(pk=message["ip_range_id"])
+        ip_allowlist = IPAllowlist.objects.get(pk=message["ip_allowlist_id"])
 
-        with transaction.atomic():
-            app.ip_allowlists.remove(ip_range)
+        propagator = IPAllowlistPropagator(
+            user.github_api_token,
+            progress_callback=partial(update_ip_allowlist_status, user, ip_allowlist),
+        )
+        failures = propagator.apply(propagator.plan(ip_allowlist, removed=True))
+
+        unlinked = ip_allowlist.appipallowlists.all()
+        for item, _ in failures:
+            unlinked = unlinked.exclude(app=item.app, deployment_env=item.env_name)
+        unlinked.delete()
 
-            app_manager_ins = cluster.App(app, user.github_api_token)
-            deployment_env_names = app_manager_ins.get_deployment_envs()
-            for env_name in deployment_env_names:
-                app_manager_ins.create_or_update_secret(
-                    env_name=env_name,
-                    secret_key=cluster.App.IP_RANGES,
-                    secret_value=app.env_allowed_ip_ranges(env_name=env_name),
-                )
+        if failures:
+            log.warning(
+                f"Kept deleted IP allowlist {ip_allowlist.name}, failed updating "
+                f"{len(failures)} app environments"
+            )
+            return
 
         # Check whether the ip_range has been used by anywhere,
         # then remove it permanently, race condition?
-        if ip_range.apps.count() == 0:
-            ip_range.delete()
+        if ip_allowlist.apps.count() == 0:
+            ip_allowlist.delete()
+
+    def app_customers_add(self, message):
+        """
+        Import a list of customers into an app's auth0 group, sending the
+        progress to the user who requested it.
+        """
+        user = User.objects.get(auth0_id=message["user_id"])
+        app = App.objects.get(pk=message["app_id"])
+        group_id = message["group_id"]
+
+        try:
+            app.add_customers(
+                message["emails"],
+                group_id=group_id,
+                progress_callback=partial(update_customers_status, user, app, group_id),
+            )
+        except App.AddCustomerError as error:
+            log.error(f"Failed adding customers to {app.name}: {error}")
+            self._send_to_sentry(error)
+            update_customers_status(user, app, group_id, done=0, total=0, status="Failed")
+            return
+
+        total = len(message["emails"])
+        update_customers_status(user, app, group_id, done=total, total=total, status="Completed")
 
     def tool_deploy(self, message):
         """
@@ -250,6 +286,47 @@ def update_home_status(home_directory, status):
     )
 
 
+def update_ip_allowlist_status(user, ip_allowlist, done, total, item, error=None):
+    """
+    Update the user with the progress of an IP allowlist propagation task.
+    """
+    payload = {
+        "ip_allowlist_id": ip_allowlist.id,
+        "app": item.app.slug,
+        "env": item.env_name,
+        "done": done,
+        "total": total,
+        "status": "Failed" if error else "Updated",
+    }
+    send_sse(
+        user.auth0_id,
+        {
+            "event": "ipAllowlistStatus",
+            "data": json.dumps(payload),
+        },
+    )
+
+
+def update_customers_status(user, app, group_id, done, total, status="Adding"):
+    """
+    Update the user with the progress of an app customers import task.
+    """
+    payload = {
+        "app_id": app.id,
+        "group_id": group_id,
+        "done": done,
+        "total": total,
+        "status": status,
+    }
+    send_sse(
+        user.auth0_id,
+        {
+            "event": "customersStatus",
+            "data": json.dumps(payload),
+        },
+    )
+
+
 def wait_for_deployment(tool_deployment, id_token):
     status = TOOL_DEPLOYING
     while status == TOOL_DEPLOYING:
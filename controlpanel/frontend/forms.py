@@ -829,10 +829,10 @@ class AddDashboardViewersForm(ErrorSummaryMixin, forms.Form):
         return new_emails
 
     def save(self):
-        """Add viewers to the dashboard and return tuple of (added_emails, not_notified)."""
+        """Add viewers to the dashboard, queue their notifications and return the added emails."""
         emails = self.cleaned_data["emails"]
-        not_notified = self.dashboard.add_viewers(emails, self.shared_by)
-        return emails, not_notified
+        self.dashboard.add_viewers(emails, self.shared_by)
+        return emails
 
 
 class CreateIAMManagedPolicyForm(forms.Form):
@@ -1,15 +1,16 @@
 # Standard library
-import csv
 from datetime import datetime, timedelta
 
 # Third-party
 from django.contrib import messages
-from django.http import HttpResponse
+from django.db.models import QuerySet
 from django.utils import timezone
 from rules.contrib.views import PermissionRequiredMixin
 
 # First-party/Local
 from controlpanel.api.models.status_post import StatusPageEvent
+from controlpanel.api.permission_cache import preload_permissions
+from controlpanel.utils import iter_queryset, streaming_csv_response
 
 
 class PolicyAccessMixin(PermissionRequiredMixin):
@@ -36,6 +37,17 @@ class PolicyAccessMixin(PermissionRequiredMixin):
         return super().get_success_url()
 
 
+class PreloadPermissionsMixin:
+    """
+    Loads the user's access to apps, buckets and dashboards in one query before
+    the list is rendered, so the permissions checked on each row don't query.
+    """
+
+    def get_context_data(self, **kwargs):
+        preload_permissions(self.request.user)
+        return super().get_context_data(**kwargs)
+
+
 class CsvWriterMixin(PermissionRequiredMixin):
     """
     Allows exporting a list of models to a CSV file.
@@ -48,21 +60,19 @@ class CsvWriterMixin(PermissionRequiredMixin):
     model_attributes = []
 
     def write_csv(self, models):
+        """
+        Returns a response streaming the models, dicts or a values() queryset,
+        as a CSV file
+        """
         timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        if isinstance(models, QuerySet):
+            models = iter_queryset(models)
 
-        response = HttpResponse(
-            content_type="text/csv",
-            headers={
-                "Content-Disposition": f'attachment; filename="{self.filename}_{timestamp}.csv"'
-            },
+        response = streaming_csv_response(
+            self.csv_headings,
+            ([model[attribute] for attribute in self.model_attributes] for model in models),
         )
-
-        writer = csv.writer(response)
-        writer.writerow(self.csv_headings)
-        for model in models:
-            row = [model[attribute] for attribute in self.model_attributes]
-            writer.writerow(row)
-
+        response["Content-Disposition"] = f'attachment; filename="{self.filename}_{timestamp}.csv"'
         return response
 
 
@@ -73,15 +83,12 @@ class StatusPageEventMixin:
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        events = StatusPageEvent.objects.exclude(
-            status__in=[StatusPageEvent.STATUS_COMPLETED, StatusPageEvent.STATUS_RESOLVED]
-        )
-        events_present = events.exists()
-        if events_present:
-            latest_update_time = events.order_by("modified").last().modified
+        events = StatusPageEvent.get_active_events()
+        if events:
+            latest_update_time = max(event.modified for event in events)
             show_posts_timespan = latest_update_time + timedelta(days=1)
             context["show_pagerduty_posts"] = timezone.now() < show_posts_timespan
             context["pagerduty_posts"] = events
 
-        context["display_service_info"] = events_present
+        context["display_service_info"] = bool(events)
         return context
@@ -0,0 +1,43 @@
+moj.Modules.customersStatus = {
+  eventType: "customersStatus",
+  hidden: "govuk-visually-hidden",
+  listenerClass: ".customers-status",
+
+  init() {
+    const listeners = document.querySelectorAll(this.listenerClass);
+    if (listeners) {
+      this.bindEvents(listeners);
+    }
+  },
+
+  bindEvents(listeners) {
+    listeners.forEach(listener => {
+      moj.Modules.eventStream.addEventListener(
+        this.eventType,
+        this.buildEventHandler(listener)
+      );
+    });
+  },
+
+  buildEventHandler(listener) {
+    const customersStatus = this;
+    return event => {
+      const data = JSON.parse(event.data);
+      if (data.group_id !== listener.dataset.groupId) {
+        return;
+      }
+      listener.classList.remove(customersStatus.hidden);
+      switch (data.status.toUpperCase()) {
+        case "ADDING":
+          listener.innerText = `Adding customers: ${data.done} of ${data.total} processed`;
+          break;
+        case "COMPLETED":
+          listener.innerText = `Added ${data.total} customers, refresh the page to see them`;
+          break;
+        case "FAILED":
+          listener.innerText = "Failed adding customers, check that the environment exists";
+          break;
+      }
+    };
+  },
+};
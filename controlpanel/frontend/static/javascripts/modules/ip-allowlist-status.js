@@ -0,0 +1,43 @@
+moj.Modules.ipAllowlistStatus = {
+  eventType: "ipAllowlistStatus",
+  hidden: "govuk-visually-hidden",
+  listenerClass: ".ip-allowlist-status",
+
+  init() {
+    const listeners = document.querySelectorAll(this.listenerClass);
+    if (listeners) {
+      this.bindEvents(listeners);
+    }
+  },
+
+  bindEvents(listeners) {
+    listeners.forEach(listener => {
+      moj.Modules.eventStream.addEventListener(
+        this.eventType,
+        this.buildEventHandler(listener)
+      );
+    });
+  },
+
+  buildEventHandler(listener) {
+    const ipAllowlistStatus = this;
+    const failed = [];
+    return event => {
+      const data = JSON.parse(event.data);
+      if (String(data.ip_allowlist_id) !== listener.dataset.ipAllowlistId) {
+        return;
+      }
+      listener.classList.remove(ipAllowlistStatus.hidden);
+      if (data.status.toUpperCase() === "FAILED") {
+        failed.push(`${data.app} (${data.env})`);
+      }
+      if (data.done < data.total) {
+        listener.innerText = `Updating app environments: ${data.done} of ${data.total} processed`;
+      } else if (failed.length) {
+        listener.innerText = `Failed updating the IP ranges of ${failed.join(", ")}`;
+      } else {
+        listener.innerText = `Updated ${data.total} app environments, refresh the page to see the changes`;
+      }
+    };
+  },
+};
@@ -80,6 +80,7 @@ urlpatterns = [
         views.GrantPolicyAccess.as_view(),
         name="grant-datasource-policy-access",
     ),
+    path("search/", views.Search.as_view(), name="search"),
     path("tools/", views.ToolList.as_view(), name="list-tools"),
     path(
         "tools/restart/",
@@ -87,6 +88,7 @@ urlpatterns = [
         name="restart-tool",
     ),
     path("users/", views.UserList.as_view(), name="list-users"),
+    path("users/unused/", views.UnusedUserList.as_view(), name="list-unused-users"),
     path("users/<str:pk>/", views.UserDetail.as_view(), name="manage-user"),
     path("user/", views.UserDetailRedirect.as_view(), name="manage-user-redirect"),
     path("users/<str:pk>/delete/", views.UserDelete.as_view(), name="delete-user"),
@@ -114,6 +114,7 @@ from controlpanel.frontend.views.release import (
     ReleaseList,
 )
 from controlpanel.frontend.views.reset import ResetHome
+from controlpanel.frontend.views.search import Search
 from controlpanel.frontend.views.task import TaskDetail, TaskList
 from controlpanel.frontend.views.tool import RestartTool, ToolList
 from controlpanel.frontend.views.user import (
@@ -123,6 +124,7 @@ from controlpanel.frontend.views.user import (
     ResetMFA,
     SetQuicksightAccess,
     SetSuperadmin,
+    UnusedUserList,
     UserDelete,
     UserDetail,
     UserDetailRedirect,
@@ -26,8 +26,10 @@ from rules.contrib.views import PermissionRequiredMixin
 
 # First-party/Local
 from controlpanel.api import auth0, cluster
+from controlpanel.api.cloud_platform import CLOUD_PLATFORM_REPO_NAME, CloudPlatformNamespaces
+from controlpanel.api.db_routers import use_replica
 from controlpanel.api.exceptions import BucketAlreadyExistsError
-from controlpanel.api.github import GithubAPI, RepositoryNotFound
+from controlpanel.api.github import RepositoryNotFound
 from controlpanel.api.models import (
     App,
     AppIPAllowList,
@@ -47,14 +49,15 @@ from controlpanel.frontend.forms import (
     RemoveCustomerByEmailForm,
     UpdateAppAuth0ConnectionsForm,
 )
-from controlpanel.frontend.mixins import CsvWriterMixin, PolicyAccessMixin
+from controlpanel.frontend.mixins import CsvWriterMixin, PolicyAccessMixin, PreloadPermissionsMixin
 from controlpanel.frontend.views.apps_mng import AppManager
 from controlpanel.oidc import OIDCLoginRequiredMixin
+from controlpanel.utils import start_background_task
 
 log = structlog.getLogger(__name__)
 
 
-class AppList(OIDCLoginRequiredMixin, PermissionRequiredMixin, ListView):
+class AppList(OIDCLoginRequiredMixin, PermissionRequiredMixin, PreloadPermissionsMixin, ListView):
     context_object_name = "apps"
     model = App
     permission_required = "api.list_app"
@@ -65,6 +68,7 @@ class AppList(OIDCLoginRequiredMixin, PermissionRequiredMixin, ListView):
         return qs.filter(userapps__user=self.request.user)
 
 
+@use_replica
 class AdminAppList(AppList):
     permission_required = "api.is_superuser"
     template_name = "webapp-admin-list.html"
@@ -72,6 +76,7 @@ class AdminAppList(AppList):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["all_webapps"] = True
+        context["auth0_clients_status"] = App.auth0_clients_status_for(context["apps"])
         return context
 
     def get_queryset(self):
@@ -213,17 +218,9 @@ class CreateApp(OIDCLoginRequiredMixin, PermissionRequiredMixin, CreateView):
         """
 
         namespaces = [f"{form_namespace}-dev", f"{form_namespace}-prod"]
-        cloud_platform_repo_name = "cloud-platform-environments"
-
-        for namespace in namespaces:
-            path = f"namespaces/live.cloud-platform.service.justice.gov.uk/{namespace}"
-            try:
-                return GithubAPI(self.request.user.github_api_token).get_repository_contents(
-                    cloud_platform_repo_name, path
-                )
-            except RepositoryNotFound:
-                continue
-        raise RepositoryNotFound(f"No namespace found in {cloud_platform_repo_name} repository.")
+        if CloudPlatformNamespaces(self.request.user.github_api_token).any_exists(namespaces):
+            return True
+        raise RepositoryNotFound(f"No namespace found in {CLOUD_PLATFORM_REPO_NAME} repository.")
 
     def form_valid(self, form):
         try:
@@ -648,11 +645,22 @@ class AddCustomers(OIDCLoginRequiredMixin, PermissionRequiredMixin, UpdateView):
         return HttpResponseRedirect(self.get_success_url())
 
     def form_valid(self, form):
-        self.get_object().add_customers(
-            form.cleaned_data["customer_email"],
-            group_id=self.kwargs.get("group_id"),
+        emails = form.cleaned_data["customer_email"]
+        # large customer lists can take minutes to import, so it is done by
+        # a worker which reports its progress back to the page
+        start_background_task(
+            "app_customers.add",
+            {
+                "user_id": self.request.user.id,
+                "app_id": self.get_object().id,
+                "group_id": str(self.kwargs.get("group_id")),
+                "emails": emails,
+            },
+        )
+        messages.success(
+            self.request,
+            f"Adding {len(emails)} customer{pluralize(emails)}, this may take a few minutes",
         )
-        messages.success(self.request, "Successfully added customers")
         return HttpResponseRedirect(self.get_success_url())
 
     def get_form_kwargs(self):
@@ -680,7 +688,7 @@ class AppCustomersPageView(OIDCLoginRequiredMixin, PermissionRequiredMixin, Deta
         group_id = context["group_id"]
         if group_id:
             try:
-                customers = app.customer_paginated(page_no, group_id)
+                customers = app.customer_paginated(page_no, group_id, search=context["search"])
             except Auth0Error as error:
                 customers = {}
                 read_customer_error_msg = error.__str__()
@@ -695,6 +703,7 @@ class AppCustomersPageView(OIDCLoginRequiredMixin, PermissionRequiredMixin, Deta
         context["groups_dict"] = app.get_auth0_group_list()
         context["group_id"] = self._confirm_group_id(context)
         context["page_no"] = page_no = self.kwargs.get("page_no")
+        context["search"] = self.request.GET.get("search", "").strip()
         customers, read_customer_error_msg = self._get_customer_list(context, page_no, app)
         context["auth_errors"] = {context["group_id"]: read_customer_error_msg}
         context["customers"] = customers.get("users", [])
@@ -42,20 +42,13 @@ class AppManager:
         return new_app
 
     def trigger_tasks_for_ip_range_removal(self, user, deleted_object):
-        affected_app_ids = list(
-            AppIPAllowList.objects.filter(ip_allowlist_id=deleted_object.id)
-            .values_list("app_id", flat=True)
-            .distinct()
+        start_background_task(
+            "ip_allowlist.delete",
+            {
+                "user_id": user.id,
+                "ip_allowlist_id": deleted_object.id,
+            },
         )
-        for app_id in affected_app_ids:
-            start_background_task(
-                "app_ip_ranges.delete",
-                {
-                    "user_id": user.id,
-                    "app_id": app_id,
-                    "ip_range_id": deleted_object.id,
-                },
-            )
 
     def _format_ip_string_to_list(self, ip_range_string):
         return {item.strip() for item in ip_range_string.split(",")}
@@ -69,15 +62,14 @@ class AppManager:
         if self._has_ip_ranges_changed(
             pre_update_obj.allowed_ip_ranges, updated_obj.allowed_ip_ranges
         ):
-            affected_app_ids = list(
-                AppIPAllowList.objects.filter(ip_allowlist_id=updated_obj.id)
-                .values_list("app_id", flat=True)
-                .distinct()
+            start_background_task(
+                "ip_allowlist.update",
+                {
+                    "user_id": user.id,
+                    "ip_allowlist_id": updated_obj.id,
+                    "previous_ip_ranges": pre_update_obj.allowed_ip_ranges,
+                },
             )
-            for app_id in list(set(affected_app_ids)):
-                start_background_task(
-                    "app_ip_ranges.update", {"user_id": user.id, "app_id": app_id}
-                )
 
     def _create_app(self, **kwargs):
         return App.objects.create(**kwargs)
@@ -15,6 +15,7 @@ from rules.contrib.views import PermissionRequiredMixin
 # First-party/Local
 from controlpanel import utils
 from controlpanel.api import aws
+from controlpanel.api.db_routers import use_replica
 from controlpanel.api.models import (
     Dashboard,
     DashboardAdminAccess,
@@ -30,13 +31,16 @@ from controlpanel.frontend.forms import (
     RegisterDashboardForm,
     UpdateDashboardForm,
 )
+from controlpanel.frontend.mixins import PreloadPermissionsMixin
 from controlpanel.oidc import OIDCLoginRequiredMixin
 from controlpanel.utils import build_success_message
 
 log = structlog.getLogger(__name__)
 
 
-class DashboardList(OIDCLoginRequiredMixin, PermissionRequiredMixin, ListView):
+class DashboardList(
+    OIDCLoginRequiredMixin, PermissionRequiredMixin, PreloadPermissionsMixin, ListView
+):
     context_object_name = "dashboards"
     model = Dashboard
     template_name = "dashboard-list.html"
@@ -53,6 +57,7 @@ class DashboardList(OIDCLoginRequiredMixin, PermissionRequiredMixin, ListView):
         return context
 
 
+@use_replica
 class AdminDashboardList(DashboardList):
     template_name = "dashboard-admin-list.html"
 
@@ -174,15 +179,7 @@ class RegisterDashboardPreview(OIDCLoginRequiredMixin, PermissionRequiredMixin,
                 )
 
             # Add any additional viewers from the emails list
-            not_notified = dashboard.add_viewers(preview_data.get("emails", []), user)
-            if not_notified:
-                messages.error(
-                    request,
-                    (
-                        f"Failed to notify {', '.join(not_notified)}. "
-                        "You may wish to email them your dashboard link."
-                    ),
-                )
+            dashboard.add_viewers(preview_data.get("emails", []), user)
 
         request.session["success_message"] = build_success_message(
             heading=f"You've shared '{dashboard.name}'",
@@ -418,16 +415,7 @@ class RevokeDashboardViewer(OIDCLoginRequiredMixin, PermissionRequiredMixin, Del
         dashboard = self.object.dashboard
         viewer = self.object.viewer
 
-        try:
-            dashboard.delete_viewers([viewer], admin=self.request.user)
-        except utils.GovukNotifyEmailError:
-            messages.error(
-                self.request,
-                (
-                    f"Failed to notify {viewer.email}. "
-                    "You may wish to email them to let them know their viewer access has been removed."  # noqa
-                ),
-            )
+        dashboard.delete_viewers([viewer], admin=self.request.user)
 
         self.request.session["success_message"] = build_success_message(
             heading=f"You have removed viewers from {dashboard.name}", message=None
@@ -467,7 +455,7 @@ class AddDashboardViewers(OIDCLoginRequiredMixin, PermissionRequiredMixin, FormV
         return context
 
     def form_valid(self, form):
-        emails, not_notified = form.save()
+        emails = form.save()
 
         log.info(
             f"{self.request.user.justice_email} granted {', '.join(emails)} "
@@ -480,15 +468,6 @@ class AddDashboardViewers(OIDCLoginRequiredMixin, PermissionRequiredMixin, FormV
             "message": None,
         }
 
-        if not_notified:
-            messages.error(
-                self.request,
-                (
-                    f"Failed to notify {', '.join(not_notified)}. "
-                    "You may wish to email them your dashboard link."
-                ),
-            )
-
         return HttpResponseRedirect(self.get_success_url())
 
     def get_success_url(self):
@@ -8,6 +8,7 @@ import structlog
 from django.conf import settings
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
 from django.db import transaction
 from django.db.models import Prefetch
 from django.http import Http404, HttpResponseRedirect
@@ -21,6 +22,7 @@ from rules.contrib.views import PermissionRequiredMixin
 
 # First-party/Local
 from controlpanel.api import cluster, tasks
+from controlpanel.api.db_routers import use_replica
 from controlpanel.api.elasticsearch import bucket_hits_aggregation
 from controlpanel.api.exceptions import BucketAlreadyExistsError
 from controlpanel.api.models import IAMManagedPolicy, PolicyS3Bucket, S3Bucket, User, UserS3Bucket
@@ -30,6 +32,7 @@ from controlpanel.frontend.forms import (
     CreateDatasourceForm,
     GrantAccessForm,
 )
+from controlpanel.frontend.mixins import PreloadPermissionsMixin
 from controlpanel.oidc import OIDCLoginRequiredMixin
 
 DATASOURCE_TYPES = [
@@ -63,6 +66,7 @@ class DatasourceMixin(ContextMixin):
 class BucketList(
     OIDCLoginRequiredMixin,
     PermissionRequiredMixin,
+    PreloadPermissionsMixin,
     DatasourceMixin,
     ListView,
 ):
@@ -73,6 +77,9 @@ class BucketList(
     permission_required = "api.list_s3bucket"
     template_name = "datasource-list.html"
 
+    # the number of data sources the user doesn't have access to shown per page
+    other_datasources_paginate_by = 50
+
     def get_queryset(self):
         return S3Bucket.objects.prefetch_related("users3buckets").filter(
             is_data_warehouse=self.datasource_type == "warehouse",
@@ -80,27 +87,44 @@ class BucketList(
             is_deleted=False,
         )
 
-    def get_context_data(self, *args, **kwargs):
-        context = super().get_context_data(*args, **kwargs)
-
-        if not self.request.user.is_external_user:
-            all_datasources = S3Bucket.objects.prefetch_related("users3buckets__user").filter(
+    def get_other_datasources(self):
+        """
+        The data sources the user doesn't have access to, with their admins
+        loaded in a single query as `admin_access`, rather than one per data
+        source.
+        """
+        return (
+            S3Bucket.objects.filter(
                 is_data_warehouse=self.datasource_type == "warehouse",
                 is_deleted=False,
             )
+            .exclude(id__in=self.get_queryset().values("id"))
+            .prefetch_related(
+                Prefetch(
+                    "users3buckets",
+                    queryset=UserS3Bucket.objects.filter(is_admin=True)
+                    .select_related("user")
+                    .order_by("user__username"),
+                    to_attr="admin_access",
+                )
+            )
+            .order_by("name")
+        )
 
-            other_datasources = all_datasources.exclude(id__in=self.get_queryset())
-            other_datasources_admins = {}
-            for datasource in other_datasources:
-                admins = [m2m.user for m2m in datasource.users3buckets.filter(is_admin=True)]
-                other_datasources_admins[datasource.id] = admins
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
 
-            context["other_datasources"] = other_datasources
-            context["other_datasources_admins"] = other_datasources_admins
+        if not self.request.user.is_external_user:
+            paginator = Paginator(self.get_other_datasources(), self.other_datasources_paginate_by)
+            page = paginator.get_page(self.request.GET.get("page"))
+            context["other_datasources"] = page.object_list
+            context["other_datasources_page"] = page
+            context["other_datasources_elided"] = paginator.get_elided_page_range(page.number)
 
         return context
 
 
+@use_replica
 class AdminBucketList(BucketList):
     all_datasources = True
     permission_required = "api.is_superuser"
@@ -0,0 +1,25 @@
+# Third-party
+from django.views.generic.base import TemplateView
+
+# First-party/Local
+from controlpanel.api import search
+from controlpanel.api.db_routers import use_replica
+from controlpanel.oidc import OIDCLoginRequiredMixin
+
+
+@use_replica
+class Search(OIDCLoginRequiredMixin, TemplateView):
+    """
+    Finds the apps, buckets, users and dashboards matching the `q` query param,
+    that the user can see
+    """
+
+    template_name = "search.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        term = self.request.GET.get("q", "").strip()
+        context["search"] = term
+        context["min_term_length"] = search.MIN_TERM_LENGTH
+        context["results"] = search.search(self.request.user, term)
+        return context
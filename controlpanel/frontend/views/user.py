@@ -21,6 +21,7 @@ from rules.contrib.views import PermissionRequiredMixin
 # First-party/Local
 from controlpanel.api.aws import AWSIdentityStore
 from controlpanel.api.cluster import User as ClusterUser
+from controlpanel.api.db_routers import use_replica
 from controlpanel.api.exceptions import QuicksightAccessError
 from controlpanel.api.models import QUICKSIGHT_EMBED_AUTHOR_PERMISSION, User
 from controlpanel.frontend import forms
@@ -36,15 +37,27 @@ def ninety_days_ago():
     past, from the current date. The assumption made here is that a month is
     roughly 30 days (so the result is always 90 days in the past).
     """
-    return datetime.now().date() - timedelta(days=90)
+    return datetime.now().date() - timedelta(days=User.UNUSED_AFTER_DAYS)
 
 
+@use_replica
 class UserList(OIDCLoginRequiredMixin, PermissionRequiredMixin, ListView):
     context_object_name = "users"
     model = User
+    paginate_by = 100
     permission_required = "api.list_user"
     queryset = User.objects.exclude(auth0_id="")
     template_name = "user-list.html"
+    unused_only = False
+
+    def get_queryset(self):
+        queryset = super().get_queryset().with_is_unused()
+        if self.unused_only:
+            queryset = queryset.unused()
+        return queryset.search(self.get_search())
+
+    def get_search(self):
+        return self.request.GET.get("q", "")
 
     def get_ordering(self):
         order_by = self.request.GET.get("o", "username")
@@ -59,17 +72,26 @@ class UserList(OIDCLoginRequiredMixin, PermissionRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        unused_users = []
-        for user in self.queryset:
-            if user.last_login:
-                if user.last_login.date() < ninety_days_ago():
-                    unused_users.append(user)
-            else:
-                unused_users.append(user)
-        context["unused_users"] = unused_users
+        context["unused_only"] = self.unused_only
+        context["search"] = self.get_search()
+        context["ordering"] = self.get_ordering()
+        context["unused_after_days"] = User.UNUSED_AFTER_DAYS
+        if context["is_paginated"]:
+            context["elided"] = context["paginator"].get_elided_page_range(
+                context["page_obj"].number
+            )
         return context
 
 
+class UnusedUserList(UserList):
+    """
+    The users who haven't logged in recently, or ever, so their accounts may be
+    candidates for removal.
+    """
+
+    unused_only = True
+
+
 class UserDelete(OIDCLoginRequiredMixin, PermissionRequiredMixin, DeleteView):
     model = User
     permission_required = "api.destroy_user"
@@ -1,2 +1,3 @@
 # First-party/Local
 from controlpanel.middleware.never_cache import DisableClientSideCachingMiddleware
+from controlpanel.middleware.replica import ReplicaMiddleware
@@ -8,6 +8,8 @@ class DisableClientSideCachingMiddleware:
 
     def __call__(self, request):
         response = self.get_response(request)
-        add_never_cache_headers(response)
-        response["Pragma"] = "no-cache"
+        # views that support conditional requests set their own caching headers
+        if not response.has_header("Cache-Control"):
+            add_never_cache_headers(response)
+            response["Pragma"] = "no-cache"
         return response
@@ -0,0 +1,42 @@
+# Standard library
+from time import time
+
+# Third-party
+from django.conf import settings
+
+# First-party/Local
+from controlpanel.api import db_routers
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# session key of the time until which the session reads from the primary
+SESSION_KEY = "_read_from_primary_until"
+
+
+class ReplicaMiddleware:
+    """
+    Lets safe requests to views that opt in with `use_replica` read from the replica
+    of the database, unless the session has recently written to the primary
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        session = getattr(request, "session", None)
+        # only existing sessions are kept on the primary, rather than starting one
+        # for each API request that writes
+        if getattr(request, db_routers.WROTE_TO_PRIMARY, False) and session and session.session_key:
+            session[SESSION_KEY] = time() + int(settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.DB_REPLICA or request.method not in SAFE_METHODS:
+            return None
+        if not db_routers.reads_from_replica(view_func, request.method):
+            return None
+        session = getattr(request, "session", None)
+        if session is not None and session.get(SESSION_KEY, 0) > time():
+            return None
+        setattr(request, db_routers.READ_FROM_REPLICA, True)
+        return None
@@ -95,6 +95,8 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # Make current request available anywhere
     "crequest.middleware.CrequestMiddleware",
+    # Read from the database replica in the views that allow it
+    "controlpanel.middleware.ReplicaMiddleware",
     # Check user's OIDC token is still valid
     "mozilla_django_oidc.middleware.SessionRefresh",
     # Structured logging
@@ -141,7 +143,7 @@ AUTHENTICATION_BACKENDS = [
     # Needed for Basic Auth
     "django.contrib.auth.backends.ModelBackend",
     # Needed for object permissions
-    "rules.permissions.ObjectPermissionBackend",
+    "controlpanel.api.permission_cache.CachedObjectPermissionBackend",
 ]
 
 # List of validators used to check the strength of users' passwords
@@ -310,6 +312,32 @@ ENABLE_DB_SSL = (
     str(os.environ.get("ENABLE_DB_SSL", DB_HOST not in ["127.0.0.1", "localhost"])).lower()
     == "true"
 )
+# How long (in seconds) a connection is kept open to be reused by later tasks, 0
+# closes it at the end of each request or task. Connections are checked before
+# they're reused. Under ASGI each request runs in its own thread, so the web app
+# can't reuse persistent connections and would leave them open, which is why this
+# is only worth setting for the celery workers
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 0))
+# Share a pool of connections between the threads of each process, instead of
+# persistent connections, which lets the web app reuse connections. Each request
+# holds a connection for as long as it uses the database, and a streamed export
+# (see controlpanel.utils.streaming_csv_response and api.views.mixins.ExportMixin)
+# reads its rows with a server side cursor, so holds one until the whole response
+# has been sent. So DB_POOL_MAX_SIZE has to cover the requests each process
+# serves at once plus the exports, or requests fail with a PoolTimeout after
+# waiting DB_POOL_TIMEOUT seconds
+DB_POOL = str(os.environ.get("DB_POOL", False)).lower() == "true"
+DB_POOL_OPTIONS = {
+    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+    # how long (in seconds) to wait for a connection before failing
+    "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+}
+
+# Let migrations skip the search indexes that need the pg_trgm extension when the
+# database server doesn't have it, instead of failing. Searches then scan the tables
+DB_PG_TRGM_OPTIONAL = str(os.environ.get("DB_PG_TRGM_OPTIONAL", False)).lower() == "true"
+
 DATABASES = {
     "default": {
         "ENGINE": "django_prometheus.db.backends.postgresql",
@@ -318,11 +346,33 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD", ""),
         "HOST": DB_HOST,
         "PORT": os.environ.get("DB_PORT", "5432"),
+        "CONN_MAX_AGE": 0 if DB_POOL else DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
     }
 }
 
 if ENABLE_DB_SSL:
-    DATABASES["default"]["OPTIONS"] = {"sslmode": "require"}
+    DATABASES["default"]["OPTIONS"]["sslmode"] = "require"
+
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {**DB_POOL_OPTIONS}
+
+# A read only replica of the database, which safe requests to the views that allow
+# it read from, to spare the primary (see controlpanel.api.db_routers)
+DB_REPLICA_HOST = os.environ.get("DB_REPLICA_HOST")
+DB_REPLICA = "replica" if DB_REPLICA_HOST else None
+if DB_REPLICA:
+    DATABASES[DB_REPLICA] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "HOST": DB_REPLICA_HOST,
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["controlpanel.api.db_routers.ReplicaRouter"]
 
 # Wrap each request in a transaction
 ATOMIC_REQUESTS = True
@@ -12,6 +12,20 @@ MIDDLEWARE.remove("mozilla_django_oidc.middleware.SessionRefresh")  # noqa: F405
 REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"].remove(  # noqa: F405
     "mozilla_django_oidc.contrib.drf.OIDCAuthentication",
 )
+# views only read from the replica in the tests that enable it, which mirrors the
+# test database
+DATABASES.setdefault(  # noqa: F405
+    "replica",
+    {
+        **DATABASES["default"],  # noqa: F405
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},  # noqa: F405
+        "TEST": {"MIRROR": "default"},
+    },
+)
+DB_REPLICA = None
+# the searches work without the trigram indexes, just more slowly
+DB_PG_TRGM_OPTIONAL = True
+
 OIDC_OP_JWKS_ENDPOINT = "https://example.com/.well-known/jwks.json"
 OIDC_ALLOW_UNSECURED_JWT = True
 OIDC_DOMAIN = "oidc.idp.example.com"
@@ -51,6 +65,7 @@ DASHBOARD_AUTH0_ROLE_ID = "rol_ab0CdEf1GHiJKlmN"  # gitleaks:allow
 
 NOTIFY_API_KEY = "test-key"
 NOTIFY_DASHBOARD_ACCESS_TEMPLATE_ID = "test-template-id"
+NOTIFY_DASHBOARD_REVOKED_TEMPLATE_ID = "test-revoked-template-id"
 NOTIFY_DASHBOARD_ADMIN_ADDED_TEMPLATE_ID = "test-admin-added-template-id"
 NOTIFY_DASHBOARD_ADMIN_REMOVED_TEMPLATE_ID = "test-admin-removed-template-id"
 
@@ -1,25 +1,28 @@
 # Standard library
+import csv
 import os
 import re
 import time
 from base64 import b64encode
 from functools import wraps
+from itertools import islice
 from zoneinfo import ZoneInfo
 
 # Third-party
 import sentry_sdk
 import structlog
 import yaml
-from asgiref.sync import async_to_sync
+from asgiref.sync import async_to_sync, sync_to_async
 from channels.exceptions import StopConsumer
 from channels.generic.http import AsyncHttpConsumer
 from channels.layers import get_channel_layer
 from django.apps import apps
 from django.conf import settings
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from django.template.defaultfilters import slugify
 from django.utils.timezone import localtime
-from nacl import encoding, public
+from nacl import encoding, public, secret
+from nacl.hash import blake2b
 from notifications_python_client.errors import HTTPError
 from notifications_python_client.notifications import NotificationsAPIClient
 
@@ -233,6 +236,29 @@ def encrypt_data_by_using_public_key(public_key: str, data: str) -> str:
     return b64encode(encrypted).decode("utf-8")
 
 
+def _secret_box():
+    key = blake2b(
+        settings.SECRET_KEY.encode("utf-8"),
+        digest_size=secret.SecretBox.KEY_SIZE,
+        encoder=encoding.RawEncoder,
+    )
+    return secret.SecretBox(key)
+
+
+def encrypt_data_by_using_secret_key(data: str) -> str:
+    """Encrypt a Unicode string with a key derived from the Django SECRET_KEY."""
+    return _secret_box().encrypt(data.encode("utf-8"), encoder=encoding.Base64Encoder).decode()
+
+
+def decrypt_data_by_using_secret_key(data: str) -> str:
+    """
+    Decrypt a string encrypted by encrypt_data_by_using_secret_key. Raises
+    nacl.exceptions.CryptoError if it can't be decrypted, e.g. the SECRET_KEY
+    has changed.
+    """
+    return _secret_box().decrypt(data.encode("utf-8"), encoder=encoding.Base64Encoder).decode()
+
+
 def time_it(func):
     """
     Debug tool to time how long a function takes. Use as a decorator e.g.:
@@ -251,6 +277,59 @@ def time_it(func):
     return wrapper
 
 
+class _Echo:
+    """
+    A file-like object that returns what is written to it, so a csv writer
+    returns each line rather than buffering the whole file
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(headings, rows):
+    """
+    Yields each line of a CSV with the headings and rows, lists of values
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headings)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_queryset(queryset):
+    """
+    Iterate over the results of a queryset in chunks of CSV_EXPORT_CHUNK_SIZE,
+    rather than loading all of them at once
+    """
+    return queryset.iterator(chunk_size=int(settings.CSV_EXPORT_CHUNK_SIZE))
+
+
+async def aiter_chunks(parts):
+    """
+    Asynchronously iterate over an iterable of strings or bytes, reading
+    CSV_EXPORT_CHUNK_SIZE of them at a time in the request's thread and yielding
+    them joined together. Under ASGI, a StreamingHttpResponse reads a synchronous
+    iterator into a list before sending anything, so streamed responses need this
+    to send each chunk as it's read.
+    """
+    parts = iter(parts)
+    chunk_size = int(settings.CSV_EXPORT_CHUNK_SIZE)
+    read_chunk = sync_to_async(lambda: list(islice(parts, chunk_size)), thread_sensitive=True)
+    while chunk := await read_chunk():
+        yield chunk[0][:0].join(chunk)
+
+
+def streaming_csv_response(headings, rows):
+    """
+    Returns a response streaming a CSV with the headings and rows. The rows are
+    only read as the response is sent, so they can be a lazy iterable, e.g.
+    from iter_queryset(), and the memory used doesn't grow with the number of
+    rows.
+    """
+    return StreamingHttpResponse(aiter_chunks(iter_csv(headings, rows)), content_type="text/csv")
+
+
 def send_sse(user_id, event):
     """
     Tell the SSEConsumer to send an event to the specified user
@@ -292,23 +371,33 @@ def get_domain_from_email(email):
 
 
 class GovukNotifyEmailError(Exception):
-    pass
+    def __init__(self, *args, status_code=None):
+        super().__init__(*args)
+        self.status_code = status_code
+
+    @property
+    def is_temporary(self):
+        """Rate limiting and server errors may succeed if the email is sent again"""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
 
 
-def govuk_notify_send_email(email_address, template_id, personalisation):
+def govuk_notify_send_email(email_address, template_id, personalisation, client=None):
     """
-    Send an email using the GOV.UK Notify API.
+    Send an email using the GOV.UK Notify API. Pass a `client` to reuse it when
+    sending several emails.
     """
-    client = NotificationsAPIClient(settings.NOTIFY_API_KEY)
+    client = client or NotificationsAPIClient(settings.NOTIFY_API_KEY)
     try:
-        client.send_email_notification(
+        return client.send_email_notification(
             email_address=email_address,
             template_id=template_id,
             personalisation=personalisation,
         )
     except HTTPError as e:
         sentry_sdk.capture_exception(e)
-        raise GovukNotifyEmailError(f"Failed to send email to {email_address}") from e
+        raise GovukNotifyEmailError(
+            f"Failed to send email to {email_address}", status_code=e.status_code
+        ) from e
 
 
 def format_uk_time(dt):
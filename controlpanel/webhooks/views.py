@@ -34,6 +34,7 @@ class PagerDutyWebhookView(View):
             return HttpResponseBadRequest("Missing href in payload")
 
         event, created = self._save_event(data, href)
+        StatusPageEvent.invalidate_active_events()
 
         log.info(
             "pagerduty.event_processed",
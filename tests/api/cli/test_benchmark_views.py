@@ -0,0 +1,35 @@
+# Standard library
+from io import StringIO
+
+# Third-party
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.urls import reverse
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_views(superuser):
+    conn_max_age = connection.settings_dict["CONN_MAX_AGE"]
+    stdout = StringIO()
+    call_command(
+        "benchmark_views",
+        superuser.username,
+        "--requests=4",
+        "--concurrency=2",
+        f"--path={reverse('list-apps')}",
+        stdout=stdout,
+    )
+
+    assert "/webapps/: " in stdout.getvalue()
+    assert "requests/s with pooled connections" in stdout.getvalue()
+    assert connection.settings_dict["CONN_MAX_AGE"] == conn_max_age
+    assert "pool" not in connection.settings_dict["OPTIONS"]
+    assert connection.pool is None
+
+
+@pytest.mark.django_db
+def test_benchmark_views_needs_superuser(users):
+    with pytest.raises(CommandError, match="not found"):
+        call_command("benchmark_views", users["normal_user"].username)
@@ -0,0 +1,137 @@
+# Standard library
+import json
+from unittest.mock import call, patch
+
+# Third-party
+import pytest
+from auth0.exceptions import Auth0Error
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+ANCIENT_USER = {
+    "email": "ancient@example.com",
+    "created_at": "2020-01-01T00:00:00.000Z",
+    "updated_at": "2020-01-01T00:00:00.000Z",
+    "last_login": "2020-01-01T00:00:00.000Z",
+}
+ACTIVE_USER = dict(ANCIENT_USER, email="active@example.com", last_login="2999-01-01T00:00:00.000Z")
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def auth0_instance():
+    with patch(
+        "controlpanel.cli.management.commands.clear_up_auth0_resources.auth0.ExtendedAuth0"
+    ) as ExtendedAuth0:
+        auth0_instance = ExtendedAuth0.return_value
+        auth0_instance.roles.get_all.return_value = [
+            {
+                "_id": "role_removed",
+                "name": "app-viewer",
+                "applicationId": "removed_client",
+                "permissions": ["permission_removed"],
+            },
+            {
+                "_id": "role_kept",
+                "name": "app-viewer",
+                "applicationId": "kept_client",
+                "permissions": ["permission_kept"],
+            },
+        ]
+        auth0_instance.clients.get_all.return_value = [{"client_id": "kept_client", "name": "kept"}]
+        auth0_instance.groups.get_all.return_value = [
+            {"_id": "group_removed", "name": "removed", "roles": ["role_removed"]},
+            {
+                "_id": "group_kept",
+                "name": "kept",
+                "roles": ["role_kept"],
+                "members": ["github|ancient", "github|active", "github|missing"],
+            },
+            {"_id": "group_no_role", "name": "no-role", "members": ["github|active"]},
+        ]
+
+        def get_user(user_id):
+            if user_id == "github|missing":
+                raise Auth0Error(404, "inexistent_user", "The user does not exist.")
+            return ANCIENT_USER if user_id == "github|ancient" else ACTIVE_USER
+
+        auth0_instance.users.get.side_effect = get_user
+        yield auth0_instance
+
+
+def test_plan_only(auth0_instance, in_tmp_path):
+    call_command("clear_up_auth0_resources", "--plan-only")
+
+    plan = json.loads((in_tmp_path / "clear_up_auth0_resources_plan.json").read_text())
+    assert [(operation["action"], operation["args"]) for operation in plan] == [
+        ("delete_group", {"group_id": "group_removed"}),
+        ("delete_role", {"role_id": "role_removed"}),
+        ("delete_permission", {"permission_id": "permission_removed"}),
+        (
+            "delete_group_members",
+            {"group_id": "group_no_role", "user_ids": ["github|active"]},
+        ),
+        ("delete_group", {"group_id": "group_no_role"}),
+        (
+            "delete_group_members",
+            {"group_id": "group_kept", "user_ids": ["github|ancient", "github|missing"]},
+        ),
+    ]
+    auth0_instance.groups.delete.assert_not_called()
+    # each member is only looked up once
+    assert auth0_instance.users.get.call_count == 3
+
+
+def test_execute_in_stages(auth0_instance, in_tmp_path):
+    calls = []
+    auth0_instance.groups.delete_group_members.side_effect = lambda user_ids, group_id: (
+        calls.append("delete_group_members")
+    )
+    auth0_instance.groups.delete.side_effect = lambda group_id: calls.append("delete_group")
+    auth0_instance.roles.delete.side_effect = lambda role_id: calls.append("delete_role")
+
+    call_command("clear_up_auth0_resources", "--concurrency", "2")
+
+    assert calls == ["delete_group_members"] * 2 + ["delete_group"] * 2 + ["delete_role"]
+    auth0_instance.permissions.delete.assert_called_once_with("permission_removed")
+    assert not (in_tmp_path / "clear_up_auth0_resources_plan.json").exists()
+    assert not (in_tmp_path / "clear_up_auth0_resources_progress.txt").exists()
+    log = (in_tmp_path / "clear_up_auth0_resources_log.txt").read_text()
+    assert "delete_group_members: 2 deleted" in log
+    assert "delete_permission: 1 deleted" in log
+
+
+def test_resume_after_failure(auth0_instance, in_tmp_path):
+    auth0_instance.groups.delete.side_effect = [
+        None,
+        Auth0Error(500, "server_error", "Internal error"),
+    ]
+
+    with pytest.raises(CommandError, match="run the command again"):
+        call_command("clear_up_auth0_resources", "--concurrency", "1")
+
+    # the roles and permissions depend on the groups, so haven't been deleted
+    auth0_instance.roles.delete.assert_not_called()
+    auth0_instance.permissions.delete.assert_not_called()
+
+    auth0_instance.groups.get_all.reset_mock()
+    auth0_instance.groups.delete.reset_mock()
+    auth0_instance.groups.delete_group_members.reset_mock()
+    # deleted by someone else in the meantime
+    auth0_instance.groups.delete.side_effect = Auth0Error(404, "not_found", "Not found")
+
+    call_command("clear_up_auth0_resources")
+
+    # the saved plan is used rather than planning again
+    auth0_instance.groups.get_all.assert_not_called()
+    auth0_instance.groups.delete_group_members.assert_not_called()
+    auth0_instance.groups.delete.assert_called_once()
+    auth0_instance.roles.delete.assert_called_once_with("role_removed")
+    auth0_instance.permissions.delete.assert_has_calls([call("permission_removed")])
+    log = (in_tmp_path / "clear_up_auth0_resources_log.txt").read_text()
+    assert "delete_group: 1 already done, 1 not found" in log
@@ -0,0 +1,125 @@
+# Standard library
+import gzip
+import json
+from unittest.mock import call, patch
+
+# Third-party
+import pytest
+from auth0.exceptions import RateLimitError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+# First-party/Local
+from controlpanel.cli.management.commands.export_auth0_log import Command
+
+START_LOG_ID = Command().generate_log_id("2024-01-01")
+END_LOG_ID = Command().generate_log_id("2024-02-01")
+
+
+def log_id(day):
+    # a log id from some time during the day
+    return Command().generate_log_id(f"2024-01-{day:02}")[:-1] + "1"
+
+
+@pytest.fixture
+def auth0_logs():
+    with patch.object(Command, "get_logs_client") as get_logs_client:
+        yield get_logs_client.return_value
+
+
+@pytest.fixture
+def output(tmp_path):
+    return tmp_path / "logs.ndjson.gz"
+
+
+def read_logs(output):
+    with gzip.open(output, "rt") as log_file:
+        return [json.loads(line) for line in log_file]
+
+
+def test_export_writes_ndjson_until_end_date(auth0_logs, output):
+    auth0_logs.search.side_effect = [
+        [{"log_id": log_id(2)}, {"log_id": log_id(3)}],
+        [{"log_id": log_id(31)}, {"log_id": END_LOG_ID}],
+    ]
+
+    call_command("export_auth0_log", "2024-01-01", "2024-02-01", "--output", str(output))
+
+    assert read_logs(output) == [
+        {"log_id": log_id(2)},
+        {"log_id": log_id(3)},
+        {"log_id": log_id(31)},
+    ]
+    assert auth0_logs.search.call_args_list == [
+        call(from_param=START_LOG_ID, take=100),
+        call(from_param=log_id(3), take=100),
+    ]
+    assert not output.with_name("logs.ndjson.gz.checkpoint").exists()
+
+
+def test_export_resumes_from_checkpoint(auth0_logs, output):
+    auth0_logs.search.side_effect = [
+        [{"log_id": log_id(2)}],
+        RateLimitError("too_many_requests", "Too Many Requests", reset_at=-1),
+    ]
+    with patch("controlpanel.cli.management.commands.export_auth0_log.sleep"):
+        with patch.object(Command, "MAX_RETRIES", 1), pytest.raises(CommandError):
+            call_command("export_auth0_log", "2024-01-01", "2024-02-01", "--output", str(output))
+
+    checkpoint = output.with_name("logs.ndjson.gz.checkpoint")
+    assert json.loads(checkpoint.read_text()) == {
+        "log_id": log_id(2),
+        "size": output.stat().st_size,
+    }
+
+    auth0_logs.search.side_effect = [[{"log_id": log_id(3)}], []]
+    call_command("export_auth0_log", "2024-01-01", "2024-02-01", "--output", str(output))
+
+    assert auth0_logs.search.call_args_list[-2] == call(from_param=log_id(2), take=100)
+    assert read_logs(output) == [{"log_id": log_id(2)}, {"log_id": log_id(3)}]
+    assert not checkpoint.exists()
+
+
+def test_export_resume_drops_what_was_written_after_checkpoint(auth0_logs, output):
+    auth0_logs.search.side_effect = [
+        [{"log_id": log_id(2)}],
+        RateLimitError("too_many_requests", "Too Many Requests", reset_at=-1),
+    ]
+    with patch("controlpanel.cli.management.commands.export_auth0_log.sleep"):
+        with patch.object(Command, "MAX_RETRIES", 1), pytest.raises(CommandError):
+            call_command("export_auth0_log", "2024-01-01", "2024-02-01", "--output", str(output))
+    # a page written but not checkpointed, cut short by the export being killed
+    page = gzip.compress(json.dumps({"log_id": log_id(3)}).encode() + b"\n")
+    with open(output, "ab") as log_file:
+        log_file.write(page[: len(page) // 2])
+
+    auth0_logs.search.side_effect = [[{"log_id": log_id(3)}], []]
+    call_command("export_auth0_log", "2024-01-01", "2024-02-01", "--output", str(output))
+
+    assert read_logs(output) == [{"log_id": log_id(2)}, {"log_id": log_id(3)}]
+
+
+def test_export_resume_fails_if_output_is_shorter(auth0_logs, output):
+    output.with_name("logs.ndjson.gz.checkpoint").write_text(
+        json.dumps({"log_id": log_id(2), "size": 100})
+    )
+
+    with pytest.raises(CommandError, match="shorter than when it was checkpointed"):
+        call_command("export_auth0_log", "2024-01-01", "2024-02-01", "--output", str(output))
+
+    auth0_logs.search.assert_not_called()
+
+
+def test_export_waits_for_rate_limit_reset(auth0_logs, output):
+    auth0_logs.search.side_effect = [
+        RateLimitError("too_many_requests", "Too Many Requests", reset_at=1030),
+        [],
+    ]
+    with (
+        patch("controlpanel.cli.management.commands.export_auth0_log.time", return_value=1000),
+        patch("controlpanel.cli.management.commands.export_auth0_log.sleep") as sleep,
+    ):
+        call_command("export_auth0_log", "2024-01-01", "2024-02-01", "--output", str(output))
+
+    sleep.assert_called_once_with(30)
+    assert auth0_logs.search.call_count == 2
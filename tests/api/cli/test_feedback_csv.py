@@ -35,3 +35,18 @@ def test_feedback_csv_bucket_exists(mock_bucket, db, feedback):
     mock_bucket.return_value.exists.assert_called_with("test-feedback-bucket")
     mock_bucket.return_value.create.assert_not_called()
     mock_bucket.return_value.write_to_bucket.assert_called_once()
+
+
+@patch("controlpanel.cli.management.commands.feedback_csv.AWSBucket")
+def test_feedback_csv_content(mock_bucket, db, feedback):
+    written = {}
+    mock_bucket.return_value.write_to_bucket.side_effect = lambda bucket, key, data: written.update(
+        key=key, content=data.read().decode()
+    )
+    call_command("feedback_csv", "--weeks", "2")
+
+    assert written["key"].startswith("feedback_")
+    assert written["content"].splitlines() == [
+        "Satisfaction Rating,Suggestions,Date Added",
+        f"Very satisfied,Great software!,{feedback.date_added.date()}",
+    ]
@@ -0,0 +1,27 @@
+# Standard library
+from unittest.mock import patch
+
+# Third-party
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@patch("controlpanel.cli.management.commands.get_customer_emails_csv.auth0.ExtendedAuth0")
+def test_get_customer_emails_csv(ExtendedAuth0, in_tmp_path):
+    groups = ExtendedAuth0.return_value.groups
+    groups.get_group_id.return_value = "group-id"
+    groups.iter_group_members.return_value = iter(
+        [{"email": "alice@example.com"}, {"email": "bob@example.com"}]
+    )
+
+    call_command("get_customer_emails_csv", "my-app")
+
+    groups.iter_group_members.assert_called_once_with("group-id")
+    [csv_file] = in_tmp_path.glob("my-app_customers_*.csv")
+    assert csv_file.read_text().splitlines() == ["Email", "alice@example.com", "bob@example.com"]
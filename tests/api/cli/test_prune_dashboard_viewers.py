@@ -0,0 +1,24 @@
+# Standard library
+from io import StringIO
+from unittest.mock import patch
+
+# Third-party
+from django.core.management import call_command
+
+
+def test_prune_dashboard_viewers_dry_run():
+    with patch(
+        "controlpanel.cli.management.commands.prune_dashboard_viewers.prune_dashboard_viewers"
+    ) as prune_dashboard_viewers:
+        prune_dashboard_viewers.return_value = {
+            "stale": 2,
+            "deleted": 0,
+            "failed": 0,
+            "dry_run": True,
+            "timings": {"query": 0.01},
+        }
+        stdout = StringIO()
+        call_command("prune_dashboard_viewers", "--dry-run", stdout=stdout)
+
+    prune_dashboard_viewers.assert_called_once_with(dry_run=True)
+    assert "2 dashboard viewers would be removed (query 0.01s)" in stdout.getvalue()
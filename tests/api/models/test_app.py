@@ -8,7 +8,7 @@ from model_bakery import baker
 
 # First-party/Local
 from controlpanel.api.auth0 import Auth0Error
-from controlpanel.api.models import App
+from controlpanel.api.models import App, AppCustomerGroup
 
 
 @pytest.fixture
@@ -87,6 +87,65 @@ def test_get_customers(auth0):
     assert expected_emails == [customer["email"] for customer in customers]
 
 
+@pytest.mark.django_db
+def test_customers_read_from_mirror(auth0, app):
+    AppCustomerGroup.objects.sync(
+        app, "test_env", "testing_group_id", [{"user_id": "email|1", "email": "a@example.com"}]
+    )
+
+    assert [customer["email"] for customer in app.customers("test_env")] == ["a@example.com"]
+    assert app.customer_paginated(1, "testing_group_id", search="a") == {
+        "total": 1,
+        "users": [{"email": "a@example.com", "user_id": "email|1"}],
+    }
+    auth0.ExtendedAuth0.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_customer_search_syncs_group(auth0, app):
+    authz = auth0.ExtendedAuth0.return_value
+    authz.groups.get_group_members.return_value = [
+        {"user_id": "email|1", "email": "a@example.com"},
+        {"user_id": "email|2", "email": "b@example.com"},
+    ]
+
+    customers = app.customer_paginated(1, "testing_group_id", search="b")
+
+    assert [customer["email"] for customer in customers["users"]] == ["b@example.com"]
+    authz.groups.get_group_members.assert_called_once_with(group_id="testing_group_id")
+    authz.groups.get_group_members_paginated.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_sync_customers(auth0, app):
+    stale = baker.make("api.AppCustomerGroup", app=app, group_id="old_group_id")
+    authz = auth0.ExtendedAuth0.return_value
+    authz.groups.get_group_members.return_value = [{"user_id": "email|1", "email": "a@x.com"}]
+
+    app.sync_customers()
+
+    group = AppCustomerGroup.objects.synced("testing_group_id")
+    assert group.env_name == "test_env"
+    assert list(group.customers.values_list("email", flat=True)) == ["a@x.com"]
+    assert not AppCustomerGroup.objects.filter(pk=stale.pk).exists()
+
+
+@pytest.mark.django_db
+def test_add_and_delete_customers_write_through(auth0, app):
+    group = AppCustomerGroup.objects.sync(app, "test_env", "testing_group_id", [])
+    authz = auth0.ExtendedAuth0.return_value
+    authz.add_group_members_by_emails.return_value = ["email|1", "email|2"]
+
+    app.add_customers(["A@example.com", "b@example.com", "a@example.com"], env_name="test_env")
+    assert list(group.customers.values_list("user_id", "email")) == [
+        ("email|1", "a@example.com"),
+        ("email|2", "b@example.com"),
+    ]
+
+    app.delete_customers(["email|1"], env_name="test_env")
+    assert list(group.customers.values_list("user_id", flat=True)) == ["email|2"]
+
+
 @pytest.mark.django_db
 def test_add_customers(auth0, app):
     authz = auth0.ExtendedAuth0.return_value
@@ -99,6 +158,7 @@ def test_add_customers(auth0, app):
         emails=emails,
         user_options={"connection": "email"},
         group_id="testing_group_id",
+        progress_callback=None,
     )
 
 
@@ -255,3 +315,42 @@ def test_get_logs_url(env):
 def test_m2m_client_id(app_conf, expected):
     app = App(app_conf=app_conf)
     assert app.m2m_client_id == expected
+
+
+@pytest.mark.django_db
+def test_auth0_clients_status_for(auth0, app):
+    other_app = baker.make(
+        "api.App",
+        app_conf={
+            App.KEY_WORD_FOR_AUTH_SETTINGS: {
+                "dev": {"client_id": "dev_client_id"},
+                "prod": {"client_id": "removed_client_id"},
+                "staging": {},
+            }
+        },
+    )
+    clients = auth0.ExtendedAuth0.return_value.clients
+    clients.get_client_ids.return_value = {"testing_client_id", "dev_client_id"}
+
+    assert App.auth0_clients_status_for([app, other_app]) == {
+        app.pk: {"test_env": {"client_id": "testing_client_id", "ok": True}},
+        other_app.pk: {
+            "dev": {"client_id": "dev_client_id", "ok": True},
+            "prod": {
+                "client_id": "removed_client_id",
+                "ok": False,
+                "error_msg": "The client does not exist",
+            },
+        },
+    }
+    clients.get_client_ids.assert_called_once()
+    clients.get.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_auth0_clients_status_auth0_error(auth0, app):
+    auth0.ExtendedAuth0.return_value.clients.get_client_ids.side_effect = Auth0Error("Error")
+
+    assert app.auth0_clients_status() == {
+        "test_env": {"client_id": "testing_client_id", "ok": False, "error_msg": "Error"}
+    }
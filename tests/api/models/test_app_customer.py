@@ -0,0 +1,97 @@
+# Third-party
+import pytest
+from model_bakery import baker
+
+# First-party/Local
+from controlpanel.api.models import AppCustomer, AppCustomerGroup
+
+
+@pytest.fixture
+def group(db):
+    app = baker.make("api.App")
+    return AppCustomerGroup.objects.sync(
+        app,
+        "dev",
+        "group-id",
+        [
+            {"user_id": "email|1", "email": "Alice@example.com", "name": "Alice"},
+            {"user_id": "email|2", "email": "bob@example.com", "nickname": "bob"},
+            {"user_id": "email|3", "email": "bob@example.com"},
+            {"user_id": "email|4", "email": "carol@example.com"},
+        ],
+    )
+
+
+def test_sync_creates_mirror(group):
+    assert group.synced_at is not None
+    assert AppCustomerGroup.objects.synced("group-id") == group
+    assert list(group.customers.values_list("email", "user_id")) == [
+        ("alice@example.com", "email|1"),
+        ("bob@example.com", "email|2"),
+        ("bob@example.com", "email|3"),
+        ("carol@example.com", "email|4"),
+    ]
+
+
+def test_sync_reconciles_changes(group):
+    unchanged = group.customers.get(user_id="email|2")
+
+    AppCustomerGroup.objects.sync(
+        group.app,
+        "dev",
+        "group-id",
+        [
+            {"user_id": "email|1", "email": "alice.new@example.com"},
+            {"user_id": "email|2", "email": "bob@example.com", "nickname": "bob"},
+            {"user_id": "email|5", "email": "dave@example.com"},
+        ],
+    )
+
+    assert list(group.customers.values_list("user_id", "email")) == [
+        ("email|1", "alice.new@example.com"),
+        ("email|2", "bob@example.com"),
+        ("email|5", "dave@example.com"),
+    ]
+    assert group.customers.get(user_id="email|2").pk == unchanged.pk
+
+
+def test_synced_ignores_groups_never_synced(db):
+    baker.make("api.AppCustomerGroup", group_id="group-id", synced_at=None)
+
+    assert AppCustomerGroup.objects.synced("group-id") is None
+
+
+def test_search_and_keyset_pagination(group):
+    customers = group.customers.all()
+
+    assert [c.user_id for c in customers.search(" BOB")] == ["email|2", "email|3"]
+    assert [c.user_id for c in customers.after("bob@example.com", "email|2")] == [
+        "email|3",
+        "email|4",
+    ]
+    assert [c.user_id for c in customers.after("bob@example.com")] == ["email|4"]
+    assert customers.page(2, 3) == {
+        "total": 4,
+        "users": [{"email": "carol@example.com", "user_id": "email|4"}],
+    }
+
+
+def test_add_and_remove_members(group):
+    AppCustomerGroup.objects.add_members(
+        "group-id", [{"user_id": "email|5", "email": "Dave@example.com"}]
+    )
+    AppCustomerGroup.objects.remove_members("group-id", ["email|1", "email|2"])
+
+    assert list(group.customers.values_list("user_id", flat=True)) == [
+        "email|3",
+        "email|4",
+        "email|5",
+    ]
+
+
+def test_add_members_skips_groups_not_synced(db):
+    AppCustomerGroup.objects.add_members(
+        "unknown-group", [{"user_id": "email|5", "email": "dave@example.com"}]
+    )
+
+    assert not AppCustomer.objects.exists()
@@ -1,14 +1,24 @@
 # Standard library
+import threading
 from unittest.mock import patch
 
 # Third-party
 import pytest
 from django.conf import settings
+from django.db import connection, transaction
 from django.urls import reverse
+from django.utils import timezone
 from model_bakery import baker
 
 # First-party/Local
-from controlpanel.api.models.dashboard import Dashboard, DashboardAdminAccess, DashboardViewerAccess
+from controlpanel.api.models.dashboard import (
+    Dashboard,
+    DashboardAccess,
+    DashboardAdminAccess,
+    DashboardViewerAccess,
+)
+from controlpanel.api.models.email_notification import EmailNotification
+from controlpanel.api.tasks.notifications import send_email_notifications
 
 
 class TestDashboardUrls:
@@ -78,17 +88,66 @@ def test_delete_viewers(users, dashboard, viewer_with_access, govuk_notify_send_
     )
     assert history_record.dashboard_id == dashboard.id
     assert history_record.viewer_id == viewer.id
+    assert not DashboardAccess.objects.filter(dashboard=dashboard, via="viewer").exists()
 
-    govuk_notify_send_email.assert_called_once_with(
-        email_address="viewer@example.com",
-        template_id=settings.NOTIFY_DASHBOARD_REVOKED_TEMPLATE_ID,
-        personalisation={
-            "dashboard": dashboard.name,
-            "dashboard_link": dashboard.url,
-            "dashboard_home": settings.DASHBOARD_SERVICE_URL,
-            "revoked_by": admin.justice_email,
-        },
+    # the viewer is emailed from the background
+    govuk_notify_send_email.assert_not_called()
+    notification = EmailNotification.objects.get()
+    assert notification.email_address == "viewer@example.com"
+    assert notification.template_id == settings.NOTIFY_DASHBOARD_REVOKED_TEMPLATE_ID
+    assert notification.personalisation == {
+        "dashboard": dashboard.name,
+        "dashboard_link": dashboard.url,
+        "dashboard_home": settings.DASHBOARD_SERVICE_URL,
+        "revoked_by": admin.justice_email,
+    }
+
+
+@pytest.mark.django_db
+def test_add_viewers(users, dashboard, viewer_with_access, django_capture_on_commit_callbacks):
+    existing_viewer, _ = viewer_with_access
+    emails = ["viewer@example.com", "New.Viewer@example.com", "new.viewer@example.com"]
+    emails += [f"viewer{i}@example.com" for i in range(3)]
+
+    with (
+        patch("controlpanel.api.auth0.ExtendedAuth0") as ExtendedAuth0,
+        patch.object(send_email_notifications, "delay") as delay,
+        patch.object(settings, "NOTIFY_BATCH_SIZE", 3),
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        notifications = dashboard.add_viewers(emails, shared_by=users["superuser"])
+
+    # only the new viewers are added to Auth0, in one go
+    ExtendedAuth0.return_value.add_dashboard_members_by_emails.assert_called_once_with(
+        [
+            "new.viewer@example.com",
+            "viewer0@example.com",
+            "viewer1@example.com",
+            "viewer2@example.com",
+        ],
+        user_options={"connection": "email"},
     )
+    assert set(dashboard.viewers.values_list("email", flat=True)) == {
+        "viewer@example.com",
+        "new.viewer@example.com",
+        "viewer0@example.com",
+        "viewer1@example.com",
+        "viewer2@example.com",
+    }
+    assert dashboard.viewer_access.get(viewer=existing_viewer).shared_by == users["superuser"]
+    assert DashboardViewerAccess.history.filter(dashboard=dashboard, history_type="+").count() == 5
+    assert DashboardAccess.objects.filter(dashboard=dashboard, via="viewer").count() == 5
+
+    assert [notification.email_address for notification in notifications] == [
+        "viewer@example.com",
+        "new.viewer@example.com",
+        "viewer0@example.com",
+        "viewer1@example.com",
+        "viewer2@example.com",
+    ]
+    ids = [notification.pk for notification in notifications]
+    # sent in batches once the transaction commits
+    assert [call.args for call in delay.call_args_list] == [(ids[:3],), (ids[3:],)]
 
 
 @pytest.fixture
@@ -131,3 +190,116 @@ def test_delete_admin(users, dashboard, admin_with_access, govuk_notify_send_ema
             "revoked_by": requesting_admin.justice_email,
         },
     )
+
+
+def access_index(dashboard):
+    return set(DashboardAccess.objects.filter(dashboard=dashboard).values_list("via", "principal"))
+
+
+@pytest.mark.django_db
+def test_access_index_maintained(users, dashboard, viewer_with_access):
+    viewer, access = viewer_with_access
+    admin = users["superuser"]
+    admin.justice_email = "Admin@Justice.gov.uk"
+    admin.save()
+    domain = baker.make("api.DashboardDomain", name="cica.gov.uk")
+
+    dashboard.admins.add(admin)
+    baker.make("api.DashboardDomainAccess", dashboard=dashboard, domain=domain, added_by=admin)
+
+    assert access_index(dashboard) == {
+        ("viewer", "viewer@example.com"),
+        ("admin", "admin@justice.gov.uk"),
+        ("domain", "cica.gov.uk"),
+    }
+    viewer_access = DashboardAccess.objects.get(dashboard=dashboard, via="viewer")
+    assert viewer_access.shared_by == users["superuser"]
+    assert viewer_access.shared_on == access.created
+
+    admin.justice_email = "new.admin@justice.gov.uk"
+    admin.save()
+    access.delete()
+    dashboard.whitelist_domains.clear()
+
+    assert access_index(dashboard) == {("admin", "new.admin@justice.gov.uk")}
+
+    admin.dashboards.remove(dashboard)
+    assert access_index(dashboard) == set()
+
+
+@pytest.mark.django_db
+def test_access_index_only_synced_when_justice_email_changes(users, dashboard):
+    admin = users["superuser"]
+    dashboard.admins.add(admin)
+
+    with patch.object(DashboardAccess.objects, "sync") as sync:
+        admin.last_login = timezone.now()
+        admin.save()
+        sync.assert_not_called()
+
+        admin.justice_email = "new.admin@justice.gov.uk"
+        admin.save()
+        sync.assert_called_once()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_access_index_syncs_take_turns(dashboard, viewer_with_access):
+    synced = threading.Event()
+
+    def sync():
+        try:
+            DashboardAccess.objects.sync([dashboard.pk])
+            synced.set()
+        finally:
+            connection.close()
+
+    with transaction.atomic():
+        DashboardAccess.objects.sync([dashboard.pk])
+        thread = threading.Thread(target=sync)
+        thread.start()
+        # the other sync waits for this one to finish with the dashboard
+        assert not synced.wait(timeout=1)
+
+    thread.join(timeout=10)
+    assert synced.is_set()
+    assert access_index(dashboard) == {("viewer", "viewer@example.com")}
+
+
+@pytest.mark.django_db
+def test_delete_viewers_syncs_access_index_once(users, dashboard, viewer_with_access):
+    viewer, _ = viewer_with_access
+    other_viewer = baker.make("api.DashboardViewer", email="other.viewer@example.com")
+    baker.make("api.DashboardViewerAccess", dashboard=dashboard, viewer=other_viewer)
+
+    with patch.object(DashboardAccess.objects, "sync", wraps=DashboardAccess.objects.sync) as sync:
+        dashboard.delete_viewers([viewer, other_viewer], admin=users["superuser"])
+
+    sync.assert_called_once_with([dashboard.pk])
+    assert access_index(dashboard) == set()
+
+
+@pytest.mark.django_db
+def test_access_index_synced_when_viewer_deleted(dashboard, viewer_with_access):
+    viewer, _ = viewer_with_access
+
+    # the viewer's access is deleted in a cascade
+    type(viewer).objects.filter(pk=viewer.pk).delete()
+
+    assert access_index(dashboard) == set()
+
+
+@pytest.mark.django_db
+def test_access_index_deleted_with_dashboard(dashboard, viewer_with_access):
+    dashboard.delete()
+
+    assert not DashboardAccess.objects.exists()
+
+
+@pytest.mark.django_db
+def test_access_for_email(dashboard, viewer_with_access):
+    domain = baker.make("api.DashboardDomain", name="example.com")
+    baker.make("api.DashboardDomainAccess", dashboard=dashboard, domain=domain)
+
+    assert DashboardAccess.objects.for_email("Viewer@Example.com").count() == 2
+    assert DashboardAccess.objects.for_email("other@example.com").get().via == "domain"
+    assert not DashboardAccess.objects.for_email("other@example.com", shared_via=["viewer"])
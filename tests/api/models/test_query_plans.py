@@ -0,0 +1,163 @@
+# Third-party
+import pytest
+from django.db import connection
+from model_bakery import baker
+
+# First-party/Local
+from controlpanel.api.models import (
+    App,
+    AppS3Bucket,
+    Dashboard,
+    DashboardViewer,
+    DashboardViewerAccess,
+    IAMManagedPolicy,
+    PolicyS3Bucket,
+    S3Bucket,
+    Tool,
+    ToolDeployment,
+    User,
+    UserApp,
+    UserS3Bucket,
+)
+
+NUM_USERS = 200
+NUM_OBJECTS = 100
+PER_USER = 5
+VERSIONS = 10
+
+
+@pytest.fixture
+def seeded(db):
+    """
+    Enough access records for the planner to prefer indexes to scanning the tables,
+    as it would in production
+    """
+    users = User.objects.bulk_create(
+        [User(auth0_id=f"github|{i}", username=f"user-{i}") for i in range(NUM_USERS)]
+    )
+    apps = App.objects.bulk_create(
+        [
+            App(
+                name=f"app-{i}",
+                slug=f"app-{i}",
+                namespace=f"app-{i}",
+                repo_url=f"https://github.com/org/app-{i}",
+            )
+            for i in range(NUM_OBJECTS)
+        ]
+    )
+    buckets = S3Bucket.objects.bulk_create(
+        [S3Bucket(name=f"bucket-{i}") for i in range(NUM_OBJECTS)]
+    )
+    policies = IAMManagedPolicy.objects.bulk_create(
+        [IAMManagedPolicy(name=f"policy-{i}") for i in range(NUM_OBJECTS)]
+    )
+    dashboards = Dashboard.objects.bulk_create(
+        [Dashboard(name=f"dashboard-{i}", quicksight_id=f"qs-{i}") for i in range(NUM_OBJECTS)]
+    )
+    viewers = DashboardViewer.objects.bulk_create(
+        [DashboardViewer(email=f"viewer-{i}@example.com") for i in range(NUM_USERS * PER_USER)]
+    )
+    tools = [
+        baker.make(Tool, chart_name=tool_type, version=f"1.{version}")
+        for tool_type in ToolDeployment.ToolType
+        for version in range(VERSIONS)
+    ]
+
+    pairs = [
+        (i, (i * PER_USER + j) % NUM_OBJECTS) for i in range(NUM_USERS) for j in range(PER_USER)
+    ]
+    object_pairs = [
+        (i, (i * PER_USER + j) % NUM_OBJECTS) for i in range(NUM_OBJECTS) for j in range(PER_USER)
+    ]
+    UserApp.objects.bulk_create(
+        [UserApp(user=users[i], app=apps[j], is_admin=j % 4 == 0) for i, j in pairs]
+    )
+    UserS3Bucket.objects.bulk_create(
+        [UserS3Bucket(user=users[i], s3bucket=buckets[j], is_admin=j % 4 == 0) for i, j in pairs]
+    )
+    AppS3Bucket.objects.bulk_create(
+        [AppS3Bucket(app=apps[i], s3bucket=buckets[j]) for i, j in object_pairs]
+    )
+    PolicyS3Bucket.objects.bulk_create(
+        [PolicyS3Bucket(policy=policies[i], s3bucket=buckets[j]) for i, j in object_pairs]
+    )
+    DashboardViewerAccess.objects.bulk_create(
+        [DashboardViewerAccess(viewer=viewers[i], dashboard=dashboards[j]) for i, j in pairs]
+    )
+    ToolDeployment.objects.bulk_create(
+        [
+            ToolDeployment(
+                user=user,
+                tool=tool,
+                tool_type=tool.chart_name,
+                is_active=(i + j) % VERSIONS == 0,
+            )
+            for i, user in enumerate(users)
+            for j, tool in enumerate(tools)
+        ]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    return {
+        "user": users[NUM_USERS // 2],
+        "app": apps[NUM_OBJECTS // 2],
+        "bucket": buckets[NUM_OBJECTS // 2],
+        "policy": policies[NUM_OBJECTS // 2],
+        "dashboard": dashboards[NUM_OBJECTS // 2],
+        "viewer": viewers[NUM_USERS // 2],
+        "tool": tools[0],
+    }
+
+
+HOT_QUERIES = {
+    "app admins": lambda s: UserApp.objects.filter(app=s["app"], is_admin=True),
+    "apps a user admins": lambda s: UserApp.objects.filter(user=s["user"], is_admin=True),
+    "bucket admins": lambda s: UserS3Bucket.objects.filter(s3bucket=s["bucket"], is_admin=True),
+    "buckets a user admins": lambda s: UserS3Bucket.objects.filter(user=s["user"], is_admin=True),
+    "user bucket access": lambda s: UserS3Bucket.objects.filter(
+        user=s["user"], s3bucket=s["bucket"]
+    ),
+    "app buckets": lambda s: AppS3Bucket.objects.filter(app=s["app"]),
+    "bucket apps": lambda s: AppS3Bucket.objects.filter(s3bucket=s["bucket"]),
+    "policy buckets": lambda s: PolicyS3Bucket.objects.filter(policy=s["policy"]),
+    "bucket policies": lambda s: PolicyS3Bucket.objects.filter(s3bucket=s["bucket"]),
+    "active deployment": lambda s: ToolDeployment.objects.filter(
+        user=s["user"], tool_type=s["tool"].chart_name
+    ).active(),
+    "tool active deployments": lambda s: s["tool"].tool_deployments.active(),
+    "viewer by email": lambda s: DashboardViewer.objects.filter(
+        email__in=[s["viewer"].email, "missing@example.com"]
+    ),
+    "viewer shared dashboard": lambda s: DashboardViewerAccess.objects.filter(
+        viewer=s["viewer"], dashboard=s["dashboard"]
+    ),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_use_indexes(seeded, name):
+    plan = HOT_QUERIES[name](seeded).explain()
+
+    assert "Seq Scan" not in plan, plan
+
+
+# the queries served by the indexes added for them in migration 0089, rather than
+# by the foreign key indexes, which they'd fall back to without them
+QUERY_INDEXES = {
+    "app admins": "userapp_app_admin_idx",
+    "apps a user admins": "userapp_user_admin_idx",
+    "bucket admins": "users3bucket_bucket_admin_idx",
+    "buckets a user admins": "users3bucket_user_admin_idx",
+    "active deployment": "tooldeployment_user_active_idx",
+    "tool active deployments": "tooldeployment_tool_active_idx",
+    "viewer shared dashboard": "dashboard_viewer_access_idx",
+}
+
+
+@pytest.mark.parametrize("name, index", QUERY_INDEXES.items())
+def test_hot_queries_use_access_indexes(seeded, name, index):
+    plan = HOT_QUERIES[name](seeded).explain()
+
+    assert index in plan, plan
@@ -5,6 +5,7 @@ from zoneinfo import ZoneInfo
 # Third-party
 import pytest
 from django.utils.timezone import make_aware
+from model_bakery import baker
 
 # First-party/Local
 from controlpanel.api.models import StatusPageEvent
@@ -44,3 +45,21 @@ def test_time_property_formats_correctly_gmt(field_name):
     event = StatusPageEvent(reported_at=dt_utc, starts_at=dt_utc, ends_at=dt_utc)
     result = getattr(event, field_name)
     assert result == "1 Jan 2025, 12:00"
+
+
+@pytest.mark.django_db
+def test_get_active_events_cached(django_assert_num_queries, django_capture_on_commit_callbacks):
+    event = baker.make(StatusPageEvent, status=StatusPageEvent.STATUS_INVESTIGATING)
+    baker.make(StatusPageEvent, status=StatusPageEvent.STATUS_RESOLVED)
+
+    with django_assert_num_queries(1):
+        assert StatusPageEvent.get_active_events() == [event]
+    with django_assert_num_queries(0):
+        assert StatusPageEvent.get_active_events() == [event]
+
+    event.status = StatusPageEvent.STATUS_RESOLVED
+    event.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        StatusPageEvent.invalidate_active_events()
+
+    assert StatusPageEvent.get_active_events() == []
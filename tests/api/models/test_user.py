@@ -1,12 +1,20 @@
 # Standard library
+from datetime import timedelta
 from unittest.mock import call, patch
 
 # Third-party
 import pytest
+import requests
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import cache
+from django.utils import timezone
 
 # First-party/Local
 from controlpanel.api import cluster
+from controlpanel.api.github import GithubAPI
 from controlpanel.api.models import User
+from controlpanel.api.models.user import GITHUB_API_TOKEN_CACHE_KEY
+from controlpanel.utils import decrypt_data_by_using_secret_key
 
 
 @pytest.fixture(autouse=True)
@@ -108,6 +116,35 @@ def test_bulk_migration_update(users):
     assert user.migration_state == new_state
 
 
+def test_with_is_unused(users):
+    recently = timezone.now() - timedelta(days=1)
+    long_ago = timezone.now() - timedelta(days=User.UNUSED_AFTER_DAYS + 1)
+    User.objects.filter(pk=users["normal_user"].pk).update(last_login=recently)
+    User.objects.filter(pk=users["other_user"].pk).update(last_login=long_ago)
+    User.objects.filter(pk=users["superuser"].pk).update(last_login=None)
+
+    is_unused = dict(User.objects.with_is_unused().values_list("pk", "is_unused"))
+
+    assert is_unused[users["normal_user"].pk] is False
+    assert is_unused[users["other_user"].pk] is True
+    assert is_unused[users["superuser"].pk] is True
+    assert users["normal_user"] not in User.objects.unused()
+    assert users["other_user"] in User.objects.unused()
+
+
+def test_search(users):
+    User.objects.filter(pk=users["other_user"].pk).update(name="Bobby Tables")
+    User.objects.filter(pk=users["database_user"].pk).update(email="BOB@example.com")
+
+    def search(term):
+        return list(User.objects.search(term).values_list("username", flat=True))
+
+    assert search("BOb") == ["bob", "carol", "dave"]
+    assert search("bob@") == ["dave"]
+    assert search("tables") == []
+    assert len(search(" ")) == User.objects.count()
+
+
 @pytest.mark.parametrize("enable", [True, False], ids=["enable", "disable"])
 def test_set_quicksight_access(users, enable):
 
@@ -139,3 +176,48 @@ def test_non_github_user_not_provisioned():
     with patch.object(cluster.User, "create") as mock_create:
         user.save()
         mock_create.assert_not_called()
+
+
+@pytest.fixture
+def github_identity(auth0):
+    auth0.ExtendedAuth0.return_value.users.get.return_value = {
+        "identities": [{"provider": "github", "access_token": "github-token"}],
+    }
+    cache.delete(GITHUB_API_TOKEN_CACHE_KEY.format("github|user_1"))
+    yield auth0.ExtendedAuth0.return_value.users.get
+
+
+def test_github_api_token_cached_encrypted(github_identity):
+    user = User.objects.create(auth0_id="github|user_1")
+
+    assert user.github_api_token == "github-token"
+    assert User.objects.get(pk=user.pk).github_api_token == "github-token"
+    github_identity.assert_called_once_with("github|user_1")
+
+    cached = cache.get(GITHUB_API_TOKEN_CACHE_KEY.format("github|user_1"))
+    assert "github-token" not in cached
+    assert decrypt_data_by_using_secret_key(cached) == "github-token"
+
+
+def test_github_api_token_cleared_on_logout(github_identity, rf):
+    user = User.objects.create(auth0_id="github|user_1")
+    assert user.github_api_token == "github-token"
+
+    user_logged_out.send(sender=User, user=user, request=rf.get("/"))
+
+    assert cache.get(GITHUB_API_TOKEN_CACHE_KEY.format("github|user_1")) is None
+    assert User.objects.get(pk=user.pk).github_api_token == "github-token"
+    assert github_identity.call_count == 2
+
+
+def test_github_api_token_cleared_when_rejected(github_identity):
+    user = User.objects.create(auth0_id="github|user_1")
+    assert user.github_api_token == "github-token"
+
+    with patch("controlpanel.api.github.requests.get") as get:
+        get.return_value.status_code = 401
+        get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError()
+        with pytest.raises(requests.exceptions.HTTPError):
+            GithubAPI("github-token", github_org="testing").get_repos(1)
+
+    assert cache.get(GITHUB_API_TOKEN_CACHE_KEY.format("github|user_1")) is None
@@ -0,0 +1,56 @@
+# Standard library
+from unittest.mock import patch
+
+# Third-party
+import pytest
+from auth0.exceptions import Auth0Error as LibraryAuth0Error
+from model_bakery import baker
+
+# First-party/Local
+from controlpanel.api.auth0 import Auth0Error
+from controlpanel.api.models import App, AppCustomer
+from controlpanel.api.tasks.customers import sync_app_customers
+
+
+@pytest.mark.django_db
+def test_sync_app_customers():
+    auth_settings = {"dev": {"client_id": "client-id", "group_id": "group-id"}}
+    apps = [
+        baker.make("api.App", app_conf={App.KEY_WORD_FOR_AUTH_SETTINGS: auth_settings}),
+        baker.make("api.App", app_conf={App.KEY_WORD_FOR_AUTH_SETTINGS: auth_settings}),
+    ]
+    baker.make("api.App", app_conf=None)
+
+    with patch.object(App, "sync_customers", autospec=True) as sync_customers:
+        # one failing app doesn't stop the others being synced
+        sync_customers.side_effect = [Auth0Error("boom"), None]
+        sync_app_customers()
+
+    assert sorted(call.args[0].pk for call in sync_customers.call_args_list) == sorted(
+        app.pk for app in apps
+    )
+
+
+@pytest.mark.django_db
+def test_sync_app_customers_continues_after_group_fails():
+    apps = [
+        baker.make(
+            "api.App",
+            app_conf={App.KEY_WORD_FOR_AUTH_SETTINGS: {"dev": {"group_id": f"group-{i}"}}},
+        )
+        for i in range(2)
+    ]
+
+    def get_group_members(group_id):
+        if group_id == "group-0":
+            # e.g. a group that no longer exists
+            raise LibraryAuth0Error(404, "not_found", "Group not found")
+        return [{"user_id": "email|1", "email": "customer@example.com"}]
+
+    with patch("controlpanel.api.auth0.ExtendedAuth0") as ExtendedAuth0:
+        ExtendedAuth0.return_value.groups.get_group_members.side_effect = get_group_members
+        sync_app_customers()
+
+    customer = AppCustomer.objects.get()
+    assert customer.group.app == apps[1]
+    assert customer.email == "customer@example.com"
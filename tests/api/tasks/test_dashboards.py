@@ -6,7 +6,7 @@ import pytest
 from model_bakery import baker
 
 # First-party/Local
-from controlpanel.api import helm
+from controlpanel.api import auth0, helm
 from controlpanel.api.models import (
     Dashboard,
     DashboardDomain,
@@ -21,7 +21,7 @@ from controlpanel.api.tasks.dashboards import prune_dashboard_viewers
 def ExtendedAuth0():
     with patch("controlpanel.api.auth0.ExtendedAuth0") as ExtendedAuth0:
         ExtendedAuth0.return_value.add_dashboard_member_by_email.return_value = None
-        ExtendedAuth0.return_value.remove_dashboard_role.return_value = None
+        ExtendedAuth0.return_value.remove_dashboard_roles.return_value = set()
         yield ExtendedAuth0.return_value
 
 
@@ -104,7 +104,62 @@ def test_prune_dashboard_viewers(ExtendedAuth0, dashboards, viewers, domain):
     Viewer 3 is linked via domain
     Viewer 4 is not linked at all
     """
-    prune_dashboard_viewers()
-    assert ExtendedAuth0.remove_dashboard_role.call_count == 1
+    summary = prune_dashboard_viewers()
+
+    ExtendedAuth0.remove_dashboard_roles.assert_called_once_with([viewers[3].email])
     assert DashboardViewer.objects.count() == 3
     assert DashboardViewer.objects.filter(email=viewers[3].email).exists() is False
+    assert summary["stale"] == summary["deleted"] == 1
+    assert set(summary["timings"]) == {"query", "auth0", "delete"}
+
+
+@pytest.mark.django_db
+def test_stale_dashboard_viewers_single_query(
+    django_assert_num_queries, dashboards, viewers, domain
+):
+    baker.make(DashboardViewer, email="test.user5@TEST-DOMAIN1.gov.uk")
+
+    with django_assert_num_queries(1):
+        stale = list(DashboardViewer.objects.stale().values_list("email", flat=True))
+
+    assert stale == [viewers[3].email]
+
+
+@pytest.mark.django_db
+def test_prune_dashboard_viewers_dry_run(ExtendedAuth0, dashboards, viewers, domain):
+    summary = prune_dashboard_viewers(dry_run=True)
+
+    assert summary["stale"] == 1
+    assert summary["deleted"] == 0
+    ExtendedAuth0.remove_dashboard_roles.assert_not_called()
+    assert DashboardViewer.objects.count() == 4
+
+
+@pytest.mark.django_db
+def test_prune_dashboard_viewers_keeps_failed(ExtendedAuth0, dashboards, viewers, domain):
+    extra = baker.make(DashboardViewer, email="test.user5@test-domain4.gov.uk")
+    # an older viewer, from before emails were stored in lower case
+    mixed_case = baker.make(DashboardViewer, email="Test.User6@test-domain4.gov.uk")
+    ExtendedAuth0.remove_dashboard_roles.return_value = {extra.email, mixed_case.email.lower()}
+
+    summary = prune_dashboard_viewers()
+
+    assert summary["deleted"] == 1
+    assert summary["failed"] == 2
+    assert DashboardViewer.objects.filter(email=extra.email).exists()
+    assert DashboardViewer.objects.filter(email=mixed_case.email).exists()
+    assert not DashboardViewer.objects.filter(email=viewers[3].email).exists()
+
+
+@pytest.mark.django_db
+def test_prune_dashboard_viewers_keeps_all_if_lookup_fails(
+    ExtendedAuth0, dashboards, viewers, domain
+):
+    mixed_case = baker.make(DashboardViewer, email="Test.User6@test-domain4.gov.uk")
+    ExtendedAuth0.remove_dashboard_roles.side_effect = auth0.Auth0Error("Boom")
+
+    summary = prune_dashboard_viewers()
+
+    assert summary["deleted"] == 0
+    assert DashboardViewer.objects.filter(email=mixed_case.email).exists()
+    assert DashboardViewer.objects.filter(email=viewers[3].email).exists()
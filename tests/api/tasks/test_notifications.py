@@ -0,0 +1,84 @@
+# Standard library
+from unittest.mock import patch
+
+# Third-party
+import pytest
+from celery.exceptions import Retry
+from model_bakery import baker
+
+# First-party/Local
+from controlpanel.api.models import EmailNotification
+from controlpanel.api.tasks.notifications import send_email_notifications
+from controlpanel.utils import GovukNotifyEmailError
+
+
+@pytest.fixture(autouse=True)
+def notify_client():
+    with patch("controlpanel.api.models.email_notification.NotificationsAPIClient") as client:
+        yield client.return_value
+
+
+@pytest.fixture
+def notifications(db):
+    return baker.make(
+        "api.EmailNotification",
+        _quantity=3,
+        template_id="template-id",
+        personalisation={"dashboard": "test"},
+    )
+
+
+def test_send_email_notifications(notifications, notify_client, govuk_notify_send_email):
+    govuk_notify_send_email.side_effect = [
+        {"id": "notify-id"},
+        GovukNotifyEmailError("Bad request", status_code=400),
+        GovukNotifyEmailError("Too many requests", status_code=429),
+    ]
+
+    with pytest.raises(Retry):
+        send_email_notifications([notification.pk for notification in notifications])
+
+    sent, failed, rate_limited = [
+        EmailNotification.objects.get(pk=notification.pk) for notification in notifications
+    ]
+    assert sent.status == EmailNotification.STATUS_SENT
+    assert sent.notify_id == "notify-id"
+    assert sent.sent_at is not None
+    # the same client is used for the whole batch
+    for call in govuk_notify_send_email.call_args_list:
+        assert call.kwargs["client"] is notify_client
+    assert failed.status == EmailNotification.STATUS_FAILED
+    assert failed.error == "Bad request"
+    assert rate_limited.status == EmailNotification.STATUS_PENDING
+    assert rate_limited.attempts == 1
+
+
+def test_send_email_notifications_retry(notifications, govuk_notify_send_email, settings):
+    govuk_notify_send_email.side_effect = GovukNotifyEmailError("Server error", status_code=500)
+    ids = [notification.pk for notification in notifications]
+
+    with patch.object(send_email_notifications, "retry", side_effect=Retry) as retry:
+        with pytest.raises(Retry):
+            send_email_notifications(ids)
+
+    assert retry.call_args.kwargs["args"] == [ids]
+    assert retry.call_args.kwargs["countdown"] == settings.NOTIFY_RETRY_BACKOFF
+
+    # the last retry gives up, rather than leaving them pending
+    send_email_notifications.push_request(retries=settings.NOTIFY_MAX_RETRIES)
+    try:
+        send_email_notifications(ids)
+    finally:
+        send_email_notifications.pop_request()
+
+    assert set(EmailNotification.objects.values_list("status", "attempts")) == {
+        (EmailNotification.STATUS_FAILED, 2)
+    }
+
+
+def test_send_email_notifications_skips_sent(notifications, govuk_notify_send_email):
+    EmailNotification.objects.update(status=EmailNotification.STATUS_SENT)
+
+    send_email_notifications([notification.pk for notification in notifications])
+
+    govuk_notify_send_email.assert_not_called()
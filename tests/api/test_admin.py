@@ -7,7 +7,7 @@ from unittest.mock import Mock, patch
 # Third-party
 import pytest
 from django.contrib.admin.sites import AdminSite
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from model_bakery import baker
 
@@ -22,7 +22,7 @@ class TestExportAsCsvFunction:
     """Test the standalone export_as_csv function."""
 
     @patch("controlpanel.api.admin.timezone.now")
-    def test_export_with_data(self, mock_now):
+    def test_export_with_data(self, mock_now, helpers):
         """Test CSV export with valid data."""
         mock_now.return_value = datetime(2025, 8, 22, 14, 30, 0)
 
@@ -33,7 +33,7 @@ class TestExportAsCsvFunction:
 
         response = export_as_csv("test_users", test_data)
 
-        assert isinstance(response, HttpResponse)
+        assert isinstance(response, StreamingHttpResponse)
         assert response["Content-Type"] == "text/csv"
         assert (
             response["Content-Disposition"]
@@ -41,7 +41,7 @@ class TestExportAsCsvFunction:
         )
 
         # Parse CSV content
-        content = response.content.decode("utf-8")
+        content = helpers.read_streaming_content(response).decode("utf-8")
         csv_reader = csv.DictReader(StringIO(content))
         rows = list(csv_reader)
 
@@ -52,13 +52,13 @@ class TestExportAsCsvFunction:
         assert rows[1]["name"] == "Jane"
 
     @patch("controlpanel.api.admin.timezone.now")
-    def test_export_with_empty_data(self, mock_now):
+    def test_export_with_empty_data(self, mock_now, helpers):
         """Test CSV export with empty data."""
         mock_now.return_value = datetime(2025, 8, 22, 14, 30, 0)
 
         response = export_as_csv("empty_file", [])
 
-        assert isinstance(response, HttpResponse)
+        assert isinstance(response, StreamingHttpResponse)
         assert response["Content-Type"] == "text/csv"
         assert (
             response["Content-Disposition"]
@@ -66,7 +66,7 @@ class TestExportAsCsvFunction:
         )
 
         # Should have only header row (which is empty)
-        content = response.content.decode("utf-8")
+        content = helpers.read_streaming_content(response).decode("utf-8")
         assert content.strip() == ""
 
     def test_filename_timestamp_format(self):
@@ -122,7 +122,7 @@ class TestUserAdminExportAction:
             assert mock_export.call_count == 1
             assert mock_export.call_args.kwargs["filename"] == "users"
 
-            row_data = mock_export.call_args.kwargs["row_data"]
+            row_data = list(mock_export.call_args.kwargs["row_data"])
             assert len(row_data) == 2
 
             # Check first user data
@@ -153,7 +153,7 @@ class TestUserAdminExportAction:
             self.admin.export_as_csv(self.request, queryset)
 
             assert mock_export.call_args.kwargs["filename"] == "users"
-            assert len(mock_export.call_args.kwargs["row_data"]) == 0
+            assert len(list(mock_export.call_args.kwargs["row_data"])) == 0
 
     def test_export_users_csv_action_description(self):
         """Test that the action has the correct description."""
@@ -201,7 +201,7 @@ class TestToolDeploymentAdminExportAction:
 
             # Verify export_as_csv was called
             assert mock_export.call_count == 1
-            row_data = mock_export.call_args.kwargs["row_data"]
+            row_data = list(mock_export.call_args.kwargs["row_data"])
 
             assert mock_export.call_args.kwargs["filename"] == "tool_deployments"
             assert len(row_data) == 1
@@ -262,7 +262,7 @@ class TestToolDeploymentAdminExportAction:
 
             self.admin.export_as_csv(self.request, queryset)
 
-            row_data = mock_export.call_args.kwargs["row_data"]
+            row_data = list(mock_export.call_args.kwargs["row_data"])
             assert mock_export.call_args.kwargs["filename"] == "tool_deployments"
             assert len(row_data) == 0
 
@@ -287,7 +287,7 @@ class TestAdminIntegration:
         assert "export_as_csv" in admin.actions
         assert hasattr(admin, "export_as_csv")
 
-    def test_user_admin_export_end_to_end(self):
+    def test_user_admin_export_end_to_end(self, helpers):
         """End-to-end test of user export functionality."""
         site = AdminSite()
         admin = UserAdmin(User, site)
@@ -299,16 +299,16 @@ class TestAdminIntegration:
 
         response = admin.export_as_csv(request, queryset)
 
-        assert isinstance(response, HttpResponse)
+        assert isinstance(response, StreamingHttpResponse)
         assert response["Content-Type"] == "text/csv"
         assert "users_" in response["Content-Disposition"]
 
         # Verify CSV content contains the user data
-        content = response.content.decode("utf-8")
+        content = helpers.read_streaming_content(response).decode("utf-8")
         assert "testuser" in content
         assert "test@example.com" in content
 
-    def test_tool_deployment_admin_export_end_to_end(self):
+    def test_tool_deployment_admin_export_end_to_end(self, helpers):
         """End-to-end test of tool deployment export functionality."""
         site = AdminSite()
         admin = ToolDeploymentAdmin(ToolDeployment, site)
@@ -324,12 +324,12 @@ class TestAdminIntegration:
 
         response = admin.export_as_csv(request, queryset)
 
-        assert isinstance(response, HttpResponse)
+        assert isinstance(response, StreamingHttpResponse)
         assert response["Content-Type"] == "text/csv"
         assert "tool_deployments_" in response["Content-Disposition"]
 
         # Verify CSV content contains the deployment data
-        content = response.content.decode("utf-8")
+        content = helpers.read_streaming_content(response).decode("utf-8")
         assert "testuser" in content
         assert "rstudio" in content
         assert "latest" in content
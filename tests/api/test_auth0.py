@@ -6,6 +6,7 @@ from unittest.mock import ANY, MagicMock, call, patch
 import pytest
 from auth0 import exceptions
 from django.conf import settings
+from django.core.cache import cache
 
 # First-party/Local
 from controlpanel.api import auth0
@@ -50,6 +51,50 @@ def test_get_all_with_more_than_100(ExtendedAuth0, fixture_users_200):
     assert len(users) == 200
 
 
+@pytest.fixture
+def fixture_users_120(ExtendedAuth0):
+    users = [{"name": f"Test User {i}", "user_id": f"github|{i}"} for i in range(120)]
+
+    def all_users(request_url=None, fields=None, page=None, per_page=None, extra_params=None):
+        return {"total": 120, "users": users[page * per_page : (page + 1) * per_page]}
+
+    with patch.object(ExtendedAuth0.users, "all", side_effect=all_users) as request:
+        yield request
+
+
+def test_get_all_fetches_remaining_pages(ExtendedAuth0, fixture_users_120):
+    users = ExtendedAuth0.users.get_all()
+
+    assert [user["user_id"] for user in users] == [f"github|{i}" for i in range(120)]
+    assert sorted(call.kwargs["page"] for call in fixture_users_120.call_args_list) == [0, 1, 2]
+
+
+def test_get_all_total_changed(ExtendedAuth0, fixture_users_120):
+    fixture_users_120.side_effect = [
+        {"total": 120, "users": [{"name": "a"}] * 50},
+        {"total": 121, "users": [{"name": "b"}] * 50},
+        {"total": 120, "users": [{"name": "c"}] * 20},
+    ]
+    with pytest.raises(auth0.Auth0Error, match="Total changed"):
+        ExtendedAuth0.users.get_all()
+
+
+def test_iter_all_fetches_pages_lazily(ExtendedAuth0, fixture_users_120):
+    users = ExtendedAuth0.users.iter_all()
+
+    assert next(users)["user_id"] == "github|0"
+    assert fixture_users_120.call_count == 1
+    assert len(list(users)) == 119
+    assert fixture_users_120.call_count == 3
+
+
+def test_search_first_match_stops_at_match(ExtendedAuth0, fixture_users_120):
+    user = ExtendedAuth0.users.search_first_match({"name": "Test User 10"})
+
+    assert user["user_id"] == "github|10"
+    assert fixture_users_120.call_count == 1
+
+
 def test_search_first_match_by_name_exist(ExtendedAuth0, fixture_users_200):
     user = ExtendedAuth0.users.search_first_match({"name": "Test User 1"})
     assert user["name"] == "Test User 1"
@@ -165,32 +210,34 @@ def test_create_user(ExtendedAuth0):
 
 @pytest.fixture
 def fixture_get_users_email_search_empty(ExtendedAuth0):
-    with patch.object(ExtendedAuth0.users, "get_users_email_search") as get_users_email_search:
-        get_users_email_search.return_value = []
-        yield get_users_email_search
+    with patch.object(ExtendedAuth0.users, "list") as users_list:
+        users_list.return_value = {"users": []}
+        yield users_list
 
 
 @pytest.fixture
 def fixture_get_users_email_search(ExtendedAuth0):
-    with patch.object(ExtendedAuth0.users, "get_users_email_search") as get_users_email_search:
-        get_users_email_search.return_value = [
-            {
-                "email": "new@test.com",
-                "email_verified": True,
-                "identities": [
-                    {
-                        "connection": "email",
-                        "user_id": "new_id",
-                        "provider": "email",
-                        "isSocial": False,
-                    }
-                ],
-                "name": "foot@test.com",
-                "nickname": "foo",
-                "user_id": "email|existing_id",
-            }
-        ]
-        yield get_users_email_search
+    with patch.object(ExtendedAuth0.users, "list") as users_list:
+        users_list.return_value = {
+            "users": [
+                {
+                    "email": "new@test.com",
+                    "email_verified": True,
+                    "identities": [
+                        {
+                            "connection": "email",
+                            "user_id": "new_id",
+                            "provider": "email",
+                            "isSocial": False,
+                        }
+                    ],
+                    "name": "foot@test.com",
+                    "nickname": "foo",
+                    "user_id": "email|existing_id",
+                }
+            ]
+        }
+        yield users_list
 
 
 @pytest.fixture
@@ -256,6 +303,43 @@ def test_existing_user_add_to_group(
     )
 
 
+def test_add_users_by_emails_in_batches(ExtendedAuth0):
+    emails = [f"user{i}@example.com" for i in range(25)]
+    # every other user already exists
+    existing = {email: f"email|{email}" for email in emails[::2]}
+
+    def search(q, search_engine, per_page):
+        return {
+            "users": [
+                {"email": email, "user_id": user_id}
+                for email, user_id in existing.items()
+                if f'email:"{email}"' in q
+            ]
+        }
+
+    def create_user(email, email_verified, **kwargs):
+        return {"email": email, "user_id": f"email|new-{email}"}
+
+    progress_callback = MagicMock()
+    with (
+        patch.object(ExtendedAuth0.users, "list", side_effect=search) as users_list,
+        patch.object(ExtendedAuth0.users, "create_user", side_effect=create_user) as create,
+    ):
+        user_ids = ExtendedAuth0.users.add_users_by_emails(
+            emails + ["USER0@example.com"],
+            user_options={"connection": "email"},
+            progress_callback=progress_callback,
+        )
+
+    assert users_list.call_count == 2
+    assert users_list.call_args_list[0].kwargs["q"].endswith(') AND identities.connection:"email"')
+    assert create.call_count == 12
+    create.assert_any_call(email="user1@example.com", email_verified=True, connection="email")
+    assert user_ids == [existing.get(email, f"email|new-{email}") for email in emails]
+    assert progress_callback.call_args_list[0] == call(done=13, total=25)
+    assert progress_callback.call_args_list[-1] == call(done=25, total=25)
+
+
 @pytest.fixture
 def fixture_client_create(ExtendedAuth0):
     with patch.object(ExtendedAuth0.clients, "create") as client_create:
@@ -294,6 +378,7 @@ def fixture_connection_enable_client(ExtendedAuth0):
 
 @pytest.fixture
 def fixture_connection_get_all(ExtendedAuth0):
+    cache.delete(auth0.CONNECTIONS_CACHE_KEY)
     with patch.object(ExtendedAuth0.connections, "get_all") as connection_get_all:
         connection_get_all.return_value = [
             {
@@ -397,6 +482,34 @@ def test_setup_auth0_client(
     fixture_group_add_role.assert_called_with(f"{domain}/groups/group_001/roles", data=["role_001"])
 
 
+def test_setup_auth0_client_existing_group(
+    ExtendedAuth0,
+    fixture_client_create,
+    fixture_connection_disable_client,
+    fixture_connection_enable_client,
+    fixture_connection_search_first_match,
+    fixture_connection_get_all,
+    fixture_permission_create,
+    fixture_role_create,
+    fixture_group_create,
+    fixture_role_add_permission,
+    fixture_group_add_role,
+):
+    # the group's name was looked up before it was created outside this app
+    cache.add(auth0.GROUP_ID_MISS_CACHE_KEY.format("new_client"), True)
+    fixture_group_create.side_effect = exceptions.Auth0Error(409, "conflict", "Group exists")
+
+    with patch.object(ExtendedAuth0.groups, "all") as groups_all:
+        groups_all.return_value = {
+            "total": 1,
+            "groups": [{"name": "new_client", "_id": "group_002"}],
+        }
+        ExtendedAuth0.setup_auth0_client(client_name="new_client")
+
+    domain = settings.AUTH0["authorization_extension_url"]
+    fixture_group_add_role.assert_called_with(f"{domain}/groups/group_002/roles", data=["role_001"])
+
+
 @pytest.fixture
 def fixture_users_get_user_groups(ExtendedAuth0):
     with patch.object(ExtendedAuth0.users, "get_user_groups") as get_user_groups:
@@ -487,6 +600,70 @@ def test_group_member_more_than_100(ExtendedAuth0, fixture_group_members_200):
     assert len(members) == 200
 
 
+@pytest.fixture
+def fixture_groups_all(ExtendedAuth0):
+    cache.delete(auth0.GROUP_IDS_CACHE_KEY)
+    with patch.object(ExtendedAuth0.groups, "all") as groups_all:
+        groups_all.return_value = {
+            "total": 2,
+            "groups": [
+                {"name": "app-one", "_id": "group-1"},
+                {"name": "app-two", "_id": "group-2"},
+            ],
+        }
+        yield groups_all
+    cache.delete(auth0.GROUP_IDS_CACHE_KEY)
+
+
+def test_get_group_id_uses_cached_index(ExtendedAuth0, fixture_groups_all):
+    assert ExtendedAuth0.groups.get_group_id("app-one") == "group-1"
+    assert ExtendedAuth0.groups.get_group_id("app-two") == "group-2"
+
+    fixture_groups_all.assert_called_once()
+
+
+def test_get_group_id_refreshes_on_miss(ExtendedAuth0, fixture_groups_all):
+    cache.set(auth0.GROUP_IDS_CACHE_KEY, {"app-one": "group-1"})
+
+    assert ExtendedAuth0.groups.get_group_id("app-two") == "group-2"
+    assert ExtendedAuth0.groups.get_group_id("missing") is None
+
+    assert fixture_groups_all.call_count == 2
+
+
+def test_get_group_id_caches_missing_names(ExtendedAuth0, fixture_groups_all):
+    assert ExtendedAuth0.groups.get_group_id("missing") is None
+    assert ExtendedAuth0.groups.get_group_id("missing") is None
+
+    fixture_groups_all.assert_called_once()
+
+
+def test_get_group_id_finds_group_created_after_miss(ExtendedAuth0, fixture_groups_all):
+    assert ExtendedAuth0.groups.get_group_id("app-three") is None
+
+    # the group is created outside this app, and the miss expires
+    fixture_groups_all.return_value["groups"].append({"name": "app-three", "_id": "group-3"})
+    fixture_groups_all.return_value["total"] = 3
+    cache.delete(auth0.GROUP_ID_MISS_CACHE_KEY.format("app-three"))
+
+    assert ExtendedAuth0.groups.get_group_id("app-three") == "group-3"
+    assert fixture_groups_all.call_count == 2
+
+
+def test_group_create_and_delete_update_index(ExtendedAuth0, fixture_groups_all):
+    ExtendedAuth0.groups.get_group_id("app-one")
+
+    with patch.object(ExtendedAuth0.groups.client, "post") as post:
+        post.return_value = {"name": "app-three", "_id": "group-3"}
+        ExtendedAuth0.groups.create({"name": "app-three"})
+    with patch.object(ExtendedAuth0.groups.client, "delete"):
+        ExtendedAuth0.groups.delete("group-1")
+
+    assert cache.get(auth0.GROUP_IDS_CACHE_KEY) == {"app-two": "group-2", "app-three": "group-3"}
+    assert ExtendedAuth0.groups.get_group_id("app-three") == "group-3"
+    fixture_groups_all.assert_called_once()
+
+
 @pytest.fixture
 def fixture_client_search_first_match(ExtendedAuth0):
     with patch.object(ExtendedAuth0.clients, "search_first_match") as client_search_first_match:
@@ -529,6 +706,56 @@ def test_update_client_auth_connections(
     )
 
 
+def test_get_client_enabled_connections_uses_index(ExtendedAuth0, fixture_connection_get_all):
+    fixture_connection_get_all.return_value.append(
+        {"name": "github", "id": "con_0000000000000004", "enabled_clients": ["other_client_id"]}
+    )
+
+    assert ExtendedAuth0.get_client_enabled_connections(["new_client_id", "other_client_id"]) == {
+        "new_client_id": ["email", "connection 1", "connection 2"],
+        "other_client_id": ["github"],
+    }
+    assert ExtendedAuth0.get_client_enabled_connections(["missing_client_id"]) == {}
+    assert ExtendedAuth0.connections.get_all_connection_names()[:4] == [
+        "email",
+        "connection 1",
+        "connection 2",
+        "github",
+    ]
+    fixture_connection_get_all.assert_called_once()
+
+
+def test_enable_and_disable_client_update_index(ExtendedAuth0, fixture_connection_get_all):
+    connections = ExtendedAuth0.connections
+    connections.get_index()
+
+    with (
+        patch.object(connections, "get") as get,
+        patch.object(connections, "update") as update,
+    ):
+        # another client was enabled since the index was built
+        get.return_value = {"enabled_clients": ["new_client_id", "other_client_id"]}
+        connection = connections.get_connections(["connection 1"])[0]
+        connections.disable_client(connection, "new_client_id")
+        update.assert_called_once_with(
+            "con_0000000000000002", body={"enabled_clients": ["other_client_id"]}
+        )
+
+        update.reset_mock()
+        get.return_value = {"enabled_clients": ["new_client_id"]}
+        connection = connections.get_connections(["connection 2"])[0]
+        connections.enable_client(connection, "other_client_id")
+        update.assert_called_once_with(
+            "con_0000000000000003", body={"enabled_clients": ["new_client_id", "other_client_id"]}
+        )
+
+    assert ExtendedAuth0.get_client_enabled_connections(["new_client_id", "other_client_id"]) == {
+        "new_client_id": ["email", "connection 2"],
+        "other_client_id": ["connection 1", "connection 2"],
+    }
+    fixture_connection_get_all.assert_called_once()
+
+
 @pytest.fixture
 def fixture_connection_create(ExtendedAuth0):
     with patch.object(ExtendedAuth0.connections, "create") as connection_create:
@@ -571,7 +798,11 @@ def test_create_custom_connection(ExtendedAuth0, fixture_connection_create):
 
 
 def test_create_custom_connection_with_allowed_error(ExtendedAuth0):
-    with patch.object(ExtendedAuth0.connections, "create") as connection_create:
+    with (
+        patch.object(ExtendedAuth0.connections, "create") as connection_create,
+        patch.object(ExtendedAuth0.connections, "get_by_name") as get_by_name,
+    ):
+        get_by_name.return_value = None
         connection_create.side_effect = exceptions.Auth0Error(
             409, 409, "The connection name existed already"
         )
@@ -584,6 +815,79 @@ def test_create_custom_connection_with_allowed_error(ExtendedAuth0):
             },
         )
         connection_create.assert_called_once_with(ANY)
+        get_by_name.assert_called_once_with("test_nomis_connection")
+
+
+def test_create_custom_connection_updates_index(
+    ExtendedAuth0, fixture_connection_get_all, fixture_connection_create
+):
+    connections = ExtendedAuth0.connections
+    connections.get_index()
+
+    connections.create_custom_connection(
+        "auth0_nomis",
+        input_values={
+            "name": "test_nomis_connection",
+            "client_id": "test_nomis_connection_id",
+            "client_secret": "WNXFkM3FCTXJhUWs0Q1NwcKFu",  # gitleaks:allow
+        },
+    )
+    with (
+        patch.object(connections, "get") as get,
+        patch.object(connections, "update") as update,
+    ):
+        get.return_value = {"enabled_clients": []}
+        ExtendedAuth0._enable_connections_for_new_client("new_client_id", ["test_nomis_connection"])
+        update.assert_called_once_with(
+            "new_connection", body={"enabled_clients": ["new_client_id"]}
+        )
+
+    assert (
+        "test_nomis_connection"
+        in ExtendedAuth0.get_client_enabled_connections(["new_client_id"])["new_client_id"]
+    )
+    fixture_connection_get_all.assert_called_once()
+
+
+def test_create_existing_custom_connection_updates_index(ExtendedAuth0, fixture_connection_get_all):
+    connections = ExtendedAuth0.connections
+    connections.get_index()
+
+    with (
+        patch.object(connections, "create") as connection_create,
+        patch.object(connections.client, "get") as get,
+    ):
+        connection_create.side_effect = exceptions.Auth0Error(
+            409, 409, "The connection name existed already"
+        )
+        get.return_value = [
+            {
+                "name": "test_nomis_connection",
+                "id": "existing_connection",
+                "enabled_clients": ["other_client_id"],
+            }
+        ]
+        connections.create_custom_connection(
+            "auth0_nomis",
+            input_values={
+                "name": "test_nomis_connection",
+                "client_id": "test_nomis_connection_id",
+                "client_secret": "WNXFkM3FCTXJhUWs0Q1NwcKFu",  # gitleaks:allow
+            },
+        )
+        assert get.call_args.kwargs["params"]["name"] == "test_nomis_connection"
+
+    assert connections.get_connections(["test_nomis_connection"]) == [
+        {
+            "id": "existing_connection",
+            "name": "test_nomis_connection",
+            "enabled_clients": ["other_client_id"],
+        }
+    ]
+    assert ExtendedAuth0.get_client_enabled_connections(["other_client_id"]) == {
+        "other_client_id": ["test_nomis_connection"]
+    }
+    fixture_connection_get_all.assert_called_once()
 
 
 def test_create_custom_connection_with_notallowed_error(ExtendedAuth0):
@@ -722,3 +1026,64 @@ def test_rotate_m2m_client_secret(ExtendedAuth0, side_effect, expected):
         else:
             with pytest.raises(auth0.Auth0Error, match=expected):
                 ExtendedAuth0.rotate_m2m_client_secret("test_m2m_client_id")
+
+
+@pytest.fixture
+def fixture_clients_all(ExtendedAuth0):
+    cache.delete(auth0.CLIENT_IDS_CACHE_KEY)
+    with patch.object(ExtendedAuth0.clients, "all") as clients_all:
+        clients_all.return_value = {
+            "total": 2,
+            "clients": [{"client_id": "client_1"}, {"client_id": "client_2"}],
+        }
+        yield clients_all
+
+
+def test_get_client_ids_cached(ExtendedAuth0, fixture_clients_all):
+    assert ExtendedAuth0.clients.get_client_ids() == {"client_1", "client_2"}
+    assert ExtendedAuth0.clients.get_client_ids() == {"client_1", "client_2"}
+
+    fixture_clients_all.assert_called_once()
+    assert fixture_clients_all.call_args.kwargs["fields"] == ["client_id"]
+
+
+def test_client_ids_updated_on_create_and_delete(ExtendedAuth0, fixture_clients_all):
+    ExtendedAuth0.clients.get_client_ids()
+
+    with (
+        patch("auth0.management.clients.Clients.create") as create,
+        patch("auth0.management.clients.Clients.delete"),
+    ):
+        create.return_value = {"client_id": "client_3"}
+        ExtendedAuth0.clients.create({"name": "new_app"})
+        ExtendedAuth0.clients.delete("client_1")
+
+    assert ExtendedAuth0.clients.get_client_ids() == {"client_2", "client_3"}
+    fixture_clients_all.assert_called_once()
+
+
+def test_remove_dashboard_roles(ExtendedAuth0):
+    with (
+        patch.object(ExtendedAuth0.users, "get_user_ids_by_emails") as get_user_ids_by_emails,
+        patch.object(ExtendedAuth0.users, "remove_roles") as remove_roles,
+    ):
+        get_user_ids_by_emails.return_value = {
+            "one@example.com": "email|1",
+            "two@example.com": "email|2",
+        }
+
+        def remove(user_id, roles):
+            if user_id == "email|2":
+                raise exceptions.Auth0Error(500, "error", "failed")
+
+        remove_roles.side_effect = remove
+
+        failed = ExtendedAuth0.remove_dashboard_roles(
+            ["one@example.com", "two@example.com", "missing@example.com"]
+        )
+
+    get_user_ids_by_emails.assert_called_once_with(
+        ["one@example.com", "two@example.com", "missing@example.com"], connection="email"
+    )
+    assert failed == {"two@example.com"}
+    remove_roles.assert_any_call("email|1", [settings.DASHBOARD_AUTH0_ROLE_ID])
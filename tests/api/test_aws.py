@@ -1373,3 +1373,11 @@ def test_get_name_from_email(email, expected_forename, expected_surname):
 def test_get_name_from_email_fail(email):
     with pytest.raises(ValueError):
         aws.AWSIdentityStore().get_name_from_email(email)
+
+
+def test_quicksight_pooled():
+    with patch.object(aws.AWSQuicksight, "_pool", {}):
+        quicksight = aws.AWSQuicksight.pooled("role", "profile", "eu-west-1")
+
+        assert aws.AWSQuicksight.pooled("role", "profile", "eu-west-1") is quicksight
+        assert aws.AWSQuicksight.pooled("role", "profile", "eu-west-2") is not quicksight
@@ -0,0 +1,95 @@
+# Standard library
+from unittest.mock import patch
+
+# Third-party
+import pytest
+from django.core.cache import cache
+
+# First-party/Local
+from controlpanel.api.cloud_platform import (
+    NAMESPACES_CACHE_KEY,
+    NAMESPACES_PATH,
+    CloudPlatformNamespaces,
+)
+from controlpanel.api.github import GithubAPIException, RepositoryNotFound
+
+
+@pytest.fixture(autouse=True)
+def githubapi():
+    cache.delete(NAMESPACES_CACHE_KEY)
+    with patch("controlpanel.api.cloud_platform.GithubAPI") as GithubAPI:
+        GithubAPI.return_value.get_repository_tree.return_value = [
+            {"path": "app-one-dev", "type": "tree"},
+            {"path": "app-one-prod", "type": "tree"},
+            {"path": "README.md", "type": "blob"},
+        ]
+        yield GithubAPI.return_value
+    cache.delete(NAMESPACES_CACHE_KEY)
+
+
+def test_refresh(githubapi):
+    namespaces = CloudPlatformNamespaces("token").refresh()
+
+    assert namespaces == {"app-one-dev", "app-one-prod"}
+    assert cache.get(NAMESPACES_CACHE_KEY) == namespaces
+    githubapi.get_repository_tree.assert_called_once_with(
+        "cloud-platform-environments", f"main:{NAMESPACES_PATH}"
+    )
+
+
+def test_refresh_failure(githubapi):
+    githubapi.get_repository_tree.side_effect = GithubAPIException(500)
+
+    assert CloudPlatformNamespaces("token").refresh() is None
+    assert cache.get(NAMESPACES_CACHE_KEY) is None
+
+
+def test_any_exists_uses_cached_index(githubapi):
+    namespaces = CloudPlatformNamespaces("token")
+
+    assert namespaces.any_exists(["app-one-dev", "app-one-staging"])
+    assert namespaces.exists("app-one-prod")
+
+    githubapi.get_repository_tree.assert_called_once()
+    githubapi.get_repository_contents.assert_not_called()
+
+
+def test_any_exists_falls_back_to_repository(githubapi):
+    namespaces = CloudPlatformNamespaces("token")
+
+    assert namespaces.any_exists(["new-app-dev", "new-app-prod"])
+    githubapi.get_repository_contents.assert_called_once_with(
+        "cloud-platform-environments", f"{NAMESPACES_PATH}/new-app-dev"
+    )
+    assert "new-app-dev" in cache.get(NAMESPACES_CACHE_KEY)
+
+
+def test_any_exists_not_found(githubapi):
+    githubapi.get_repository_contents.side_effect = RepositoryNotFound()
+
+    assert not CloudPlatformNamespaces("token").any_exists(["new-app-dev", "new-app-prod"])
+    assert githubapi.get_repository_contents.call_count == 2
+
+
+def test_any_exists_does_not_cache_index_after_failed_refresh(githubapi):
+    githubapi.get_repository_tree.side_effect = GithubAPIException(500)
+    namespaces = CloudPlatformNamespaces("token")
+
+    assert namespaces.any_exists(["new-app-dev"])
+
+    assert cache.get(NAMESPACES_CACHE_KEY) is None
+    # so the next lookup tries to build the index again
+    githubapi.get_repository_tree.side_effect = None
+    assert namespaces.exists("app-one-prod")
+    assert githubapi.get_repository_tree.call_count == 2
+
+
+def test_any_exists_keeps_namespaces_added_by_other_requests(githubapi):
+    namespaces = CloudPlatformNamespaces("token")
+    index = namespaces.get_index()
+    cache.set(NAMESPACES_CACHE_KEY, index | {"other-app-dev"})
+
+    with patch.object(namespaces, "get_index", return_value=index):
+        assert namespaces.any_exists(["new-app-dev"])
+
+    assert {"new-app-dev", "other-app-dev"} <= cache.get(NAMESPACES_CACHE_KEY)
@@ -0,0 +1,134 @@
+# Standard library
+from time import time
+
+# Third-party
+import pytest
+from crequest.middleware import CrequestMiddleware
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework.decorators import action
+from rest_framework.reverse import reverse
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+# First-party/Local
+from controlpanel.api.db_routers import (
+    READ_FROM_REPLICA,
+    WROTE_TO_PRIMARY,
+    ReplicaRouter,
+    reads_from_replica,
+    use_primary,
+    use_replica,
+)
+from controlpanel.api.models import User
+from controlpanel.middleware.replica import SESSION_KEY, ReplicaMiddleware
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DB_REPLICA = "replica"
+
+
+@pytest.fixture
+def request_context(rf):
+    request = rf.get("/")
+    CrequestMiddleware.set_request(request)
+    yield request
+    CrequestMiddleware.del_request()
+
+
+@use_replica
+class ExampleViewSet(ReadOnlyModelViewSet):
+    @use_primary
+    @action(detail=True)
+    def refresh(self, request, *args, **kwargs):
+        pass
+
+
+def test_reads_from_replica():
+    assert reads_from_replica(ExampleViewSet.as_view({"get": "list"}), "GET")
+    assert not reads_from_replica(
+        ExampleViewSet.as_view({"get": "refresh"}, **ExampleViewSet.refresh.kwargs), "GET"
+    )
+    assert not reads_from_replica(use_primary(lambda request: None), "GET")
+    assert not reads_from_replica(lambda request: None, "GET")
+
+
+def test_router_without_replica(request_context):
+    setattr(request_context, READ_FROM_REPLICA, True)
+
+    assert ReplicaRouter().db_for_read(User) is None
+
+
+def test_router_only_migrates_primary():
+    router = ReplicaRouter()
+
+    assert router.allow_migrate("default", "api") is None
+    # the tests' replica mirrors the test database, whether or not reads use it
+    assert router.allow_migrate("replica", "api") is False
+
+
+def test_router_sticks_to_primary_after_write(replica, request_context):
+    router = ReplicaRouter()
+    assert router.db_for_read(User) is None
+
+    setattr(request_context, READ_FROM_REPLICA, True)
+    assert router.db_for_read(User) == "replica"
+
+    assert router.db_for_write(User) == "default"
+    assert router.db_for_read(User) is None
+    assert getattr(request_context, WROTE_TO_PRIMARY)
+
+
+@pytest.mark.django_db
+def test_router_reads_from_primary_in_transaction(replica, request_context):
+    setattr(request_context, READ_FROM_REPLICA, True)
+
+    with transaction.atomic():
+        assert ReplicaRouter().db_for_read(User) is None
+
+
+@pytest.mark.django_db
+def test_middleware_keeps_session_on_primary(replica, rf):
+    def write(request):
+        ReplicaRouter().db_for_write(User)
+        return HttpResponse()
+
+    request = rf.get("/")
+    request.session = SessionStore()
+    request.session.create()
+    CrequestMiddleware.set_request(request)
+    try:
+        ReplicaMiddleware(write)(request)
+    finally:
+        CrequestMiddleware.del_request()
+    assert request.session[SESSION_KEY] > time()
+
+    view = ExampleViewSet.as_view({"get": "list"})
+    ReplicaMiddleware(write).process_view(request, view, (), {})
+    assert not getattr(request, READ_FROM_REPLICA, False)
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_dashboards_read_from_replica(replica, client, superuser):
+    baker.make("api.Dashboard", _quantity=2)
+    client.force_login(superuser)
+
+    with CaptureQueriesContext(connections["replica"]) as queries:
+        response = client.get(reverse("dashboard-list"))
+
+    assert response.status_code == 200
+    assert response.data["count"] == 2
+    assert queries.captured_queries
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_unsafe_requests_use_primary(replica, client, superuser):
+    client.force_login(superuser)
+
+    with CaptureQueriesContext(connections["replica"]) as queries:
+        client.post(reverse("dashboard-list"))
+
+    assert not queries.captured_queries
@@ -77,3 +77,29 @@ def test_get_repository_contents_not_found(request_get_not_found):
     ):
         test_api_token = "abc123"
         GithubAPI(test_api_token).get_repository_contents("test-repo-name", "some/resource/path")
+
+
+def test_get_repository_tree(requests):
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"tree": [{"path": "namespace-dev", "type": "tree"}]}
+    requests.get.return_value = response
+
+    tree = GithubAPI("abc123", github_org="ministryofjustice").get_repository_tree(
+        "test-repo-name", "main:some/path"
+    )
+
+    assert tree == [{"path": "namespace-dev", "type": "tree"}]
+    assert requests.get.call_args.args[0] == (
+        "https://api.github.com/repos/ministryofjustice/test-repo-name/git/trees/main:some/path"
+    )
+
+
+def test_get_repository_tree_not_found(request_get_not_found):
+    with pytest.raises(RepositoryNotFound):
+        GithubAPI("abc123").get_repository_tree("test-repo-name", "main:some/path")
+
+
+def test_headers_without_token():
+    assert "Authorization" not in GithubAPI(None).headers
+    assert GithubAPI("abc123").headers["Authorization"] == "Bearer abc123"
@@ -0,0 +1,97 @@
+# Standard library
+from unittest.mock import MagicMock, patch
+
+# Third-party
+import pytest
+from model_bakery import baker
+
+# First-party/Local
+from controlpanel.api.ip_ranges import IPAllowlistPropagator, collapse_ip_ranges
+
+
+@pytest.mark.parametrize(
+    "ip_ranges, expected",
+    [
+        (["127.0.0.1, 128.10.10.100"], ["127.0.0.1", "128.10.10.100"]),
+        (["10.0.0.0/24", "10.0.1.0/24"], ["10.0.0.0/23"]),
+        (["10.0.0.0/16,10.0.5.0/24", "10.0.5.10"], ["10.0.0.0/16"]),
+        (["10.0.0.1/24"], ["10.0.0.0/24"]),
+        (["2001:db8::/33, 2001:db8:8000::/33", "1.2.3.4"], ["1.2.3.4", "2001:db8::/32"]),
+        (["", None], []),
+    ],
+)
+def test_collapse_ip_ranges(ip_ranges, expected):
+    assert collapse_ip_ranges(ip_ranges) == expected
+
+
+@pytest.fixture
+def allowlists(db):
+    changed = baker.make("api.IPAllowlist", allowed_ip_ranges="1.1.1.1")
+    other = baker.make("api.IPAllowlist", allowed_ip_ranges="2.2.2.0/24")
+    app = baker.make("api.App", repo_url="https://github.com/ministryofjustice/example")
+    for env_name, ip_allowlist in [("dev", changed), ("prod", changed), ("prod", other)]:
+        baker.make(
+            "api.AppIPAllowList",
+            app=app,
+            ip_allowlist=ip_allowlist,
+            deployment_env=env_name,
+        )
+    # env without the changed allowlist is not affected
+    baker.make("api.AppIPAllowList", app=app, ip_allowlist=other, deployment_env="staging")
+    return changed, other, app
+
+
+def test_plan_update(allowlists, django_assert_num_queries):
+    changed, _, app = allowlists
+    changed.allowed_ip_ranges = "1.1.1.1, 3.3.3.3"
+
+    with django_assert_num_queries(1):
+        plan = IPAllowlistPropagator("token").plan(changed, previous_ip_ranges="1.1.1.1")
+
+    assert [(item.app, item.env_name, item.secret_value) for item in plan] == [
+        (app, "dev", "1.1.1.1,3.3.3.3"),
+        (app, "prod", "1.1.1.1,2.2.2.0/24,3.3.3.3"),
+    ]
+
+
+def test_plan_skips_unchanged_envs(allowlists):
+    changed, _, app = allowlists
+    # the new range is already covered by the other allowlist in prod
+    changed.allowed_ip_ranges = "1.1.1.1, 2.2.2.2"
+
+    plan = IPAllowlistPropagator("token").plan(changed, previous_ip_ranges="1.1.1.1")
+
+    assert [(item.env_name, item.secret_value) for item in plan] == [
+        ("dev", "1.1.1.1,2.2.2.2"),
+    ]
+
+
+def test_plan_removed(allowlists):
+    changed, _, app = allowlists
+
+    plan = IPAllowlistPropagator("token").plan(changed, removed=True)
+
+    assert [(item.env_name, item.secret_value) for item in plan] == [
+        ("dev", ""),
+        ("prod", "2.2.2.0/24"),
+    ]
+
+
+@patch("controlpanel.api.ip_ranges.cluster.App")
+def test_apply(App, allowlists):
+    changed, _, app = allowlists
+    changed.allowed_ip_ranges = "3.3.3.3"
+    progress_callback = MagicMock()
+    App.return_value.create_or_update_secret.side_effect = [None, Exception("boom")]
+
+    propagator = IPAllowlistPropagator("token", max_workers=1, progress_callback=progress_callback)
+    plan = propagator.plan(changed, previous_ip_ranges="1.1.1.1")
+    failures = propagator.apply(plan)
+
+    assert App.return_value.create_or_update_secret.call_count == 2
+    App.return_value.create_or_update_secret.assert_any_call(
+        env_name="dev", secret_key=App.IP_RANGES, secret_value="3.3.3.3"
+    )
+    assert [(item.env_name, str(error)) for item, error in failures] == [("prod", "boom")]
+    assert progress_callback.call_count == 2
+    progress_callback.assert_called_with(done=2, total=2, item=plan[1], error=failures[0][1])
@@ -1,5 +1,11 @@
+# Standard library
+import json
+from unittest.mock import patch
+
 # Third-party
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 from rest_framework.reverse import reverse
 
@@ -18,7 +24,7 @@ def login_superuser(client, superuser):
         ({"page_size": DEFAULT_PAGE_SIZE - 50}, 50, True, False),
         ({"page_size": DEFAULT_PAGE_SIZE - 50, "page": 3}, 20, False, True),
         ({"page_size": DEFAULT_PAGE_SIZE + 30}, 120, False, False),
-        ({"page_size": 0}, 120, False, False),
+        ({"page_size": 0}, DEFAULT_PAGE_SIZE, True, False),
     ],
 )
 @pytest.mark.django_db
@@ -32,3 +38,82 @@ def test_pagination(client, urlparams, page_size, next, prev, sqs):
 
     assert (response.data.get("next") is not None) == next
     assert (response.data.get("previous") is not None) == prev
+
+
+@pytest.mark.django_db
+def test_page_size_is_capped(client, sqs):
+    baker.make("api.App", 30)
+
+    with patch("controlpanel.api.pagination.CustomPageNumberPagination.max_page_size", 20):
+        response = client.get(reverse("app-list"), {"page_size": 1000})
+
+    assert response.data["count"] == 30
+    assert len(response.data["results"]) == 20
+
+
+@pytest.mark.django_db
+def test_keyset_pagination(client, sqs):
+    apps = baker.make("api.App", DEFAULT_PAGE_SIZE + 20)
+
+    response = client.get(reverse("app-list"), {"cursor": ""})
+    assert "count" not in response.data
+    assert response.data["previous"] is None
+    assert len(response.data["results"]) == DEFAULT_PAGE_SIZE
+
+    response = client.get(response.data["next"])
+    assert response.data["next"] is None
+    assert response.data["previous"] is not None
+    assert [app["res_id"] for app in response.data["results"]] == [
+        str(app.res_id) for app in apps[-20:]
+    ]
+
+
+@pytest.mark.django_db
+def test_export(client, sqs, helpers):
+    apps = baker.make("api.App", 3)
+
+    response = client.get(reverse("app-export"))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = helpers.read_streaming_content(response).decode().splitlines()
+    assert sorted(json.loads(line)["res_id"] for line in lines) == sorted(
+        str(app.res_id) for app in apps
+    )
+
+
+@pytest.mark.parametrize(
+    "resource, make_related",
+    [
+        ("user", lambda: baker.make("api.UserApp", _quantity=2, user=baker.make("api.User"))),
+        ("app", lambda: baker.make("api.UserApp", _quantity=2, app=baker.make("api.App"))),
+        (
+            "s3bucket",
+            lambda: baker.make(
+                "api.UserS3Bucket", _quantity=2, s3bucket=baker.make("api.S3Bucket")
+            ),
+        ),
+    ],
+)
+@pytest.mark.django_db
+def test_export_queries_constant(client, sqs, helpers, resource, make_related):
+    def export():
+        with CaptureQueriesContext(connection) as queries:
+            helpers.read_streaming_content(client.get(reverse(f"{resource}-export")))
+        return len(queries)
+
+    make_related()
+    baseline = export()
+    for _ in range(3):
+        make_related()
+
+    assert export() == baseline
+
+
+@pytest.mark.django_db
+def test_export_forbidden(client, users):
+    client.force_login(users["normal_user"])
+
+    response = client.get(reverse("user-export"))
+
+    assert response.status_code == 403
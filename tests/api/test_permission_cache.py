@@ -0,0 +1,112 @@
+# Standard library
+from unittest.mock import patch
+
+# Third-party
+import pytest
+from crequest.middleware import CrequestMiddleware
+from model_bakery import baker
+
+# First-party/Local
+from controlpanel.api.models import UserS3Bucket
+from controlpanel.api.permission_cache import get_permission_cache, preload_permissions
+
+
+@pytest.fixture(autouse=True)
+def enable_db_for_all_tests(db):
+    pass
+
+
+@pytest.fixture
+def request_context(rf):
+    CrequestMiddleware.set_request(rf.get("/"))
+    yield
+    CrequestMiddleware.del_request()
+
+
+@pytest.fixture
+def user():
+    return baker.make("api.User", is_superuser=False)
+
+
+@pytest.fixture
+def apps(user):
+    apps = baker.make("api.App", _quantity=5)
+    for app in apps[:2]:
+        baker.make("api.UserApp", user=user, app=app, is_admin=True)
+    baker.make("api.UserApp", user=user, app=apps[2], is_admin=False)
+    return apps
+
+
+@pytest.fixture
+def buckets(user):
+    with patch("controlpanel.api.aws.AWSBucket.create"):
+        buckets = baker.make("api.S3Bucket", dispatch_task=False, _quantity=3)
+    baker.make(
+        "api.UserS3Bucket",
+        user=user,
+        s3bucket=buckets[0],
+        access_level=UserS3Bucket.READWRITE,
+        is_admin=True,
+    )
+    baker.make(
+        "api.UserS3Bucket",
+        user=user,
+        s3bucket=buckets[1],
+        access_level=UserS3Bucket.READONLY,
+    )
+    return buckets
+
+
+def check_permissions(user, apps, buckets):
+    return (
+        [user.has_perm("api.retrieve_app", app) for app in apps],
+        [user.has_perm("api.retrieve_s3bucket", bucket) for bucket in buckets],
+        [user.has_perm("api.update_s3bucket", bucket) for bucket in buckets],
+        [user.has_perm("api.destroy_s3bucket", bucket) for bucket in buckets],
+    )
+
+
+EXPECTED = (
+    [True, True, False, False, False],
+    [True, True, False],
+    [True, False, False],
+    [True, False, False],
+)
+
+
+def test_uncached_outside_request(user, apps, buckets):
+    assert get_permission_cache() is None
+    assert check_permissions(user, apps, buckets) == EXPECTED
+
+
+def test_preloaded(request_context, user, apps, buckets, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        preload_permissions(user)
+    with django_assert_num_queries(0):
+        assert check_permissions(user, apps, buckets) == EXPECTED
+
+
+def test_loaded_once_per_kind(request_context, user, apps, buckets, django_assert_num_queries):
+    # the apps and the buckets the user has access to
+    with django_assert_num_queries(2):
+        assert check_permissions(user, apps, buckets) == EXPECTED
+    with django_assert_num_queries(0):
+        assert check_permissions(user, apps, buckets) == EXPECTED
+
+
+def test_cleared_when_access_changes(request_context, user, apps, buckets):
+    preload_permissions(user)
+    assert not user.has_perm("api.retrieve_app", apps[3])
+
+    baker.make("api.UserApp", user=user, app=apps[3], is_admin=True)
+
+    assert user.has_perm("api.retrieve_app", apps[3])
+
+
+def test_dashboard_admin(request_context, user, django_assert_num_queries):
+    dashboard, other = baker.make("api.Dashboard", _quantity=2)
+    dashboard.admins.add(user)
+
+    with django_assert_num_queries(1):
+        assert user.has_perm("api.update_dashboard", dashboard)
+        assert not user.has_perm("api.update_dashboard", other)
@@ -1,5 +1,9 @@
+# Standard library
+from unittest.mock import MagicMock, PropertyMock, patch
+
 # Third-party
 import pytest
+from django.db import connections
 from prometheus_client import REGISTRY
 
 # First-party/Local
@@ -22,3 +26,48 @@ def test_login_counters(client):
     client.force_login(user)
     after = _get_counter_value("django_control_panel_login_events")
     assert 1 == (after - before)
+
+
+def _get_pool_value(name):
+    return REGISTRY.get_sample_value(f"django_control_panel_db_pool_{name}", {"alias": "default"})
+
+
+def test_database_pool_metrics():
+    pool = MagicMock()
+    pool.get_stats.return_value = {
+        "pool_size": 4,
+        "pool_available": 1,
+        "requests_waiting": 2,
+        "requests_num": 10,
+        "requests_wait_ms": 1500,
+    }
+    connection_class = type(connections["default"])
+    with patch.object(connection_class, "pool", new_callable=PropertyMock, return_value=pool):
+        assert _get_pool_value("size") == 4
+        assert _get_pool_value("available") == 1
+        assert _get_pool_value("requests_waiting") == 2
+        assert _get_pool_value("requests_total") == 10
+        assert _get_pool_value("wait_seconds_total") == 1.5
+
+
+def test_database_pool_metrics_without_pool():
+    assert _get_pool_value("size") is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_database_pool_metrics_with_pool(settings):
+    connection = connections["default"]
+    connection.close()
+    conn_max_age = connection.settings_dict["CONN_MAX_AGE"]
+    connection.settings_dict["CONN_MAX_AGE"] = 0
+    connection.settings_dict["OPTIONS"]["pool"] = {**settings.DB_POOL_OPTIONS, "min_size": 1}
+    try:
+        assert User.objects.count() == 0
+        connection.close()
+
+        assert _get_pool_value("size") >= 1
+        assert _get_pool_value("requests_total") >= 1
+    finally:
+        connection.close_pool()
+        del connection.settings_dict["OPTIONS"]["pool"]
+        connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
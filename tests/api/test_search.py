@@ -0,0 +1,74 @@
+# Standard library
+from unittest.mock import patch
+
+# Third-party
+import pytest
+from model_bakery import baker
+
+# First-party/Local
+from controlpanel.api.search import search
+
+
+@pytest.fixture(autouse=True)
+def enable_db_for_all_tests(db):
+    pass
+
+
+@pytest.fixture
+def apps():
+    return {
+        name: baker.make("api.App", name=name, repo_url=f"https://github.com/org/{name}")
+        for name in ["weekly-reports", "report-tool", "reports", "report", "other"]
+    }
+
+
+@pytest.fixture
+def buckets():
+    with patch("controlpanel.api.aws.AWSBucket.create"):
+        return [
+            baker.make("api.S3Bucket", name="reports-data", dispatch_task=False),
+            baker.make("api.S3Bucket", name="old-reports", is_deleted=True, dispatch_task=False),
+        ]
+
+
+def test_search_ranks_and_limits(users, apps):
+    results = search(users["superuser"], "REPORT", limit=3)
+
+    # exact match first, then by prefix, then shortest
+    assert [app.name for app in results["apps"]] == ["report", "reports", "report-tool"]
+
+
+def test_search_matches_any_field(users, apps):
+    results = search(users["superuser"], "github.com/org/oth")
+
+    assert results["apps"] == [apps["other"]]
+
+
+def test_search_short_term(users, apps):
+    assert search(users["superuser"], " re ") == {}
+
+
+def test_search_as_superuser(users, apps, buckets):
+    results = search(users["superuser"], "bob")
+
+    assert set(results) == {"apps", "buckets", "users", "dashboards"}
+    assert users["normal_user"] in results["users"]
+
+    results = search(users["superuser"], "reports")
+    assert results["buckets"] == [buckets[0]]
+
+
+def test_search_as_normal_user(users, apps, buckets):
+    user = users["normal_user"]
+    baker.make("api.UserApp", user=user, app=apps["weekly-reports"])
+    baker.make("api.UserS3Bucket", user=user, s3bucket=buckets[0])
+    dashboard = baker.make("api.Dashboard", name="Weekly reports")
+    dashboard.admins.add(user)
+    baker.make("api.Dashboard", name="Monthly reports")
+
+    results = search(user, "reports")
+
+    assert set(results) == {"apps", "buckets", "dashboards"}
+    assert results["apps"] == [apps["weekly-reports"]]
+    assert results["buckets"] == [buckets[0]]
+    assert results["dashboards"] == [dashboard]
@@ -11,7 +11,7 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.reverse import reverse
 
 # First-party/Local
-from controlpanel.api.models import App
+from controlpanel.api.models import App, AppCustomerGroup
 from controlpanel.api.serializers import AppSerializer
 from tests.api.fixtures.aws import *
 
@@ -152,6 +152,36 @@ def test_app_by_name_get_customers_invalid(client, app, env_name):
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+def test_app_by_name_get_customers_keyset(client, app):
+    AppCustomerGroup.objects.sync(
+        app,
+        "dev",
+        "dev_group_id",
+        [{"user_id": f"email|{i}", "email": f"user{i}@example.com"} for i in range(3)],
+    )
+    url = reverse("apps-by-name-customers", kwargs={"name": app.name})
+
+    response = client.get(url, query_params={"env_name": "dev", "after": "", "per_page": 2})
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert response.data["count"] == 3
+    assert [customer["user_id"] for customer in response.data["results"]] == [
+        "email|0",
+        "email|1",
+    ]
+
+    response = client.get(response.data["next"])
+    assert [customer["user_id"] for customer in response.data["results"]] == ["email|2"]
+    assert response.data["next"] is None
+
+
+def test_app_by_name_get_customers_keyset_not_synced(client, app):
+    response = client.get(
+        reverse("apps-by-name-customers", kwargs={"name": app.name}),
+        query_params={"env_name": "dev", "after": ""},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.parametrize("env_name", ["dev", "prod"])
 def test_app_by_name_add_customers(client, app, env_name):
     emails = ["test1@example.com", "test2@example.com"]
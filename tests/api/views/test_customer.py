@@ -122,7 +122,10 @@ def test_post(client, app, ExtendedAuth0):
     assert response.status_code == status.HTTP_201_CREATED
 
     ExtendedAuth0.add_group_members_by_emails.assert_called_with(
-        emails=emails, user_options={"connection": "email"}, group_id=app.get_group_id(env_name)
+        emails=emails,
+        user_options={"connection": "email"},
+        group_id=app.get_group_id(env_name),
+        progress_callback=None,
     )
 
 
@@ -10,6 +10,7 @@ from rest_framework.test import APIClient
 
 # First-party/Local
 from controlpanel.api.jwt_auth import AuthenticatedServiceClient
+from controlpanel.api.serializers import DashboardDetailSerializer
 
 NUM_DASHBOARDS = 3
 
@@ -31,7 +32,7 @@ def m2m_client():
     payload = {
         "sub": "abc123@clients",
         "gty": "client-credentials",
-        "scope": "list:dashboard retrieve:dashboard",
+        "scope": "list:dashboard retrieve:dashboard embed_url:dashboard",
     }
     user = AuthenticatedServiceClient(jwt_payload=payload)
     client = APIClient()
@@ -150,19 +151,7 @@ def test_retrieve_error(
 
 
 @pytest.mark.parametrize(
-    "email, embed_url, user_arn",
-    [
-        (
-            "dashboard.viewer@justice.gov.uk",
-            "https://quicksight-embed-url-viewer",
-            "some:viewer:arn",
-        ),
-        (
-            "DASHBOARD.VIEWER@JUSTICE.GOV.UK",
-            "https://quicksight-embed-url-viewer",
-            "some:viewer:arn",
-        ),
-    ],
+    "email", ["dashboard.viewer@justice.gov.uk", "DASHBOARD.VIEWER@JUSTICE.GOV.UK"]
 )
 def test_retrieve_success_shared_as_viewer(
     m2m_client,
@@ -170,99 +159,214 @@ def test_retrieve_success_shared_as_viewer(
     dashboard_viewer,
     dashboard_domain,
     email,
-    embed_url,
-    user_arn,
 ):
     with patch("controlpanel.api.models.dashboard.Dashboard.get_embed_url") as get_embed_url:
-        get_embed_url.return_value = {
-            "EmbedUrl": embed_url,
-            "AnonymousUserArn": user_arn,
-        }
-
         response = m2m_client.get(
             reverse("dashboard-detail", args=[dashboard.quicksight_id]),
             data={"email": email},
         )
 
-        assert response.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_200_OK
+    get_embed_url.assert_not_called()
 
-        result = response.data
-        assert result["embed_url"] == embed_url
-        assert result["anonymous_user_arn"] == user_arn
-        assert result["shared_by_email"] == dashboard_viewer.shared_by.justice_email
-        assert result["shared_by_name"] == dashboard_viewer.shared_by.name
-        assert result["shared_on"] == dashboard_viewer.created
-        assert result["shared_via_domain"] is False
+    result = response.data
+    assert "embed_url" not in result
+    assert result["shared_by_email"] == dashboard_viewer.shared_by.justice_email
+    assert result["shared_by_name"] == dashboard_viewer.shared_by.name
+    assert result["shared_on"] == dashboard_viewer.created
+    assert result["shared_via_domain"] is False
 
 
-@pytest.mark.parametrize(
-    "email, embed_url, user_arn",
-    [
-        ("domain.viewer@cica.gov.uk", "https://quicksight-embed-url-domain", "some:domain:arn"),
-        ("DOMAIN.VIEWER@CICA.GOV.UK", "https://quicksight-embed-url-domain", "some:domain:arn"),
-    ],
-)
+@pytest.mark.parametrize("email", ["domain.viewer@cica.gov.uk", "DOMAIN.VIEWER@CICA.GOV.UK"])
 def test_retrieve_success_shared_as_domain_viewer(
     m2m_client,
     dashboard,
     dashboard_domain,
     email,
-    embed_url,
-    user_arn,
 ):
     with patch("controlpanel.api.models.dashboard.Dashboard.get_embed_url") as get_embed_url:
-        get_embed_url.return_value = {
-            "EmbedUrl": embed_url,
-            "AnonymousUserArn": user_arn,
-        }
-
         response = m2m_client.get(
             reverse("dashboard-detail", args=[dashboard.quicksight_id]),
             data={"email": email},
         )
 
-        assert response.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_200_OK
+    get_embed_url.assert_not_called()
 
-        result = response.data
-        assert result["embed_url"] == embed_url
-        assert result["anonymous_user_arn"] == user_arn
-        assert result["shared_by_email"] == dashboard_domain.added_by.justice_email
-        assert result["shared_by_name"] == dashboard_domain.added_by.name
-        assert result["shared_on"] == dashboard_domain.created
-        assert result["shared_via_domain"] is True
+    result = response.data
+    assert "embed_url" not in result
+    assert result["shared_by_email"] == dashboard_domain.added_by.justice_email
+    assert result["shared_by_name"] == dashboard_domain.added_by.name
+    assert result["shared_on"] == dashboard_domain.created
+    assert result["shared_via_domain"] is True
 
 
 @pytest.mark.parametrize(
-    "email, embed_url, user_arn",
-    [
-        ("dashboard.admin@justice.gov.uk", "https://quicksight-embed-url-viewer", "some:admin:arn"),
-        ("Dashboard.Admin@Justice.Gov.Uk", "https://quicksight-embed-url-viewer", "some:admin:arn"),
-    ],
+    "email", ["dashboard.admin@justice.gov.uk", "Dashboard.Admin@Justice.Gov.Uk"]
 )
 def test_retrieve_success_as_admin(
     m2m_client,
     dashboard,
     email,
-    embed_url,
-    user_arn,
 ):
+    with patch("controlpanel.api.models.dashboard.Dashboard.get_embed_url") as get_embed_url:
+        response = m2m_client.get(
+            reverse("dashboard-detail", args=[dashboard.quicksight_id]),
+            data={"email": email},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    get_embed_url.assert_not_called()
+
+    result = response.data
+    assert "embed_url" not in result
+    assert result["shared_by_email"] is None
+    assert result["shared_by_name"] is None
+    assert result["shared_on"] == dashboard.created
+    assert result["shared_via_domain"] is False
+
+
+@pytest.mark.parametrize(
+    "email, shared_via, expected_count",
+    [
+        ("dashboard.viewer@justice.gov.uk", ["viewer"], 1),
+        ("dashboard.viewer@justice.gov.uk", ["admin", "domain"], 0),
+        ("domain.viewer@cica.gov.uk", ["domain"], 1),
+        ("dashboard.admin@justice.gov.uk", ["admin"], 1),
+    ],
+)
+def test_list_shared_via(
+    m2m_client, dashboard, dashboard_viewer, dashboard_domain, email, shared_via, expected_count
+):
+    response = m2m_client.get(
+        reverse("dashboard-list"), data={"email": email, "shared_via": shared_via}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == expected_count
+
+
+@pytest.mark.parametrize(
+    "email, expected_status",
+    [
+        ("dashboard.viewer@justice.gov.uk", status.HTTP_200_OK),
+        ("domain.viewer@cica.gov.uk", status.HTTP_200_OK),
+        ("no.access@test.gov.uk", status.HTTP_404_NOT_FOUND),
+    ],
+)
+def test_head_checks_access(
+    m2m_client, dashboard, dashboard_viewer, dashboard_domain, email, expected_status
+):
+    with patch("controlpanel.api.models.dashboard.Dashboard.get_embed_url") as get_embed_url:
+        response = m2m_client.head(
+            reverse("dashboard-detail", args=[dashboard.quicksight_id]),
+            data={"email": email},
+        )
+
+    assert response.status_code == expected_status
+    get_embed_url.assert_not_called()
+
+
+def test_retrieve_conditional_get(m2m_client, users, dashboard, dashboard_viewer):
+    url = reverse("dashboard-detail", args=[dashboard.quicksight_id])
+    data = {"email": "dashboard.viewer@justice.gov.uk"}
+    response = m2m_client.get(url, data=data)
+
+    assert response.status_code == status.HTTP_200_OK
+    etag = response["ETag"]
+    assert "no-store" not in response["Cache-Control"]
+
+    with patch.object(DashboardDetailSerializer, "to_representation") as to_representation:
+        response = m2m_client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    to_representation.assert_not_called()
+
+    response = m2m_client.get(url, data=data, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # sharing the dashboard changes its metadata
+    dashboard.admins.add(baker.make("api.User", justice_email="new.admin@justice.gov.uk"))
+    response = m2m_client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+    assert len(response.data["admins"]) == 2
+
+
+def test_retrieve_conditional_get_sharer_changed(m2m_client, users, dashboard, dashboard_viewer):
+    url = reverse("dashboard-detail", args=[dashboard.quicksight_id])
+    data = {"email": "dashboard.viewer@justice.gov.uk"}
+    response = m2m_client.get(url, data=data)
+    etag = response["ETag"]
+    assert response.data["shared_by_email"] == "dashboard.admin@justice.gov.uk"
+
+    # the sharer's details aren't part of the dashboard, so don't change its modified time
+    sharer = users["dashboard_admin"]
+    sharer.name = "Renamed Sharer"
+    sharer.save()
+    response = m2m_client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+    assert response.data["shared_by_name"] == "Renamed Sharer"
+
+
+def test_retrieve_conditional_get_admin_renamed(m2m_client, users, dashboard, dashboard_viewer):
+    url = reverse("dashboard-detail", args=[dashboard.quicksight_id])
+    data = {"email": "dashboard.viewer@justice.gov.uk"}
+    admin = baker.make("api.User", justice_email="new.admin@justice.gov.uk")
+    dashboard.admins.add(admin)
+    etag = m2m_client.get(url, data=data)["ETag"]
+
+    # the admins' names aren't part of the dashboard, but are shown with it
+    admin.name = "Renamed Admin"
+    admin.save()
+    response = m2m_client.get(url, data=data, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "Renamed Admin" in [item["name"] for item in response.data["admins"]]
+
+
+@pytest.mark.parametrize(
+    "email, expected_status",
+    [
+        ("dashboard.viewer@justice.gov.uk", status.HTTP_200_OK),
+        ("no.access@test.gov.uk", status.HTTP_404_NOT_FOUND),
+        ("", status.HTTP_400_BAD_REQUEST),
+    ],
+)
+def test_embed_url(m2m_client, dashboard, dashboard_viewer, email, expected_status):
     with patch("controlpanel.api.models.dashboard.Dashboard.get_embed_url") as get_embed_url:
         get_embed_url.return_value = {
-            "EmbedUrl": embed_url,
-            "AnonymousUserArn": user_arn,
+            "EmbedUrl": "https://quicksight-embed-url-viewer",
+            "AnonymousUserArn": "some:viewer:arn",
         }
-
         response = m2m_client.get(
-            reverse("dashboard-detail", args=[dashboard.quicksight_id]),
+            reverse("dashboard-embed-url", args=[dashboard.quicksight_id]),
             data={"email": email},
         )
 
-        assert response.status_code == status.HTTP_200_OK
+    assert response.status_code == expected_status
+    if expected_status == status.HTTP_200_OK:
+        assert response.data == {
+            "embed_url": "https://quicksight-embed-url-viewer",
+            "anonymous_user_arn": "some:viewer:arn",
+        }
+        assert "no-store" in response["Cache-Control"]
+    else:
+        get_embed_url.assert_not_called()
+
+
+def test_embed_url_requires_scope(dashboard, dashboard_viewer):
+    user = AuthenticatedServiceClient(
+        jwt_payload={"sub": "abc123@clients", "scope": "list:dashboard retrieve:dashboard"}
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(
+        reverse("dashboard-embed-url", args=[dashboard.quicksight_id]),
+        data={"email": "dashboard.viewer@justice.gov.uk"},
+    )
 
-        result = response.data
-        assert result["embed_url"] == embed_url
-        assert result["anonymous_user_arn"] == user_arn
-        assert result["shared_by_email"] is None
-        assert result["shared_by_name"] is None
-        assert result["shared_on"] == dashboard.created
-        assert result["shared_via_domain"] is False
+    assert response.status_code == status.HTTP_403_FORBIDDEN
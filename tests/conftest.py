@@ -1,11 +1,14 @@
 # Standard library
 import uuid
+import warnings
 from unittest.mock import patch
 
 # Third-party
 import pytest
+from asgiref.sync import async_to_sync
 from django.conf import settings
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from model_bakery import baker
 
 # First-party/Local
@@ -106,6 +109,16 @@ def helm():
         yield helm
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Don't let anything cached in one test, e.g. a user's GitHub token, leak
+    into the next
+    """
+    yield
+    cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def slack_WebClient():
     """
@@ -219,6 +232,20 @@ def users(
 
 
 class Helpers:
+    @staticmethod
+    def read_streaming_content(response):
+        """
+        Read a streaming response the way the ASGI handler does, failing if Django
+        has to read a synchronous iterator into a list before sending it
+        """
+
+        async def read():
+            return b"".join([part async for part in response.__aiter__()])
+
+        with warnings.catch_warnings():
+            warnings.filterwarnings("error", message="StreamingHttpResponse must consume")
+            return async_to_sync(read)()
+
     @staticmethod
     def validate_task_with_sqs_messages(
         messages,
@@ -1,13 +1,15 @@
 # Standard library
 import json
-from unittest.mock import Mock, call, patch
+from unittest.mock import Mock, PropertyMock, call, patch
 
 # Third-party
 import pytest
+from model_bakery import baker
 
 # First-party/Local
 from controlpanel.api.cluster import HOME_RESETTING, TOOL_DEPLOYING, TOOL_READY, TOOL_RESTARTING
-from controlpanel.api.models import Tool, ToolDeployment, User
+from controlpanel.api.ip_ranges import PropagationItem
+from controlpanel.api.models import App, IPAllowlist, Tool, ToolDeployment, User
 from controlpanel.frontend import consumers
 
 
@@ -160,3 +162,126 @@ def test_update_tool_status():
             status,
         )
         send_sse.assert_called_with(user.auth0_id, expected_sse_event)
+
+
+@pytest.fixture
+def github_api_token():
+    with patch(
+        "controlpanel.api.models.User.github_api_token",
+        new_callable=PropertyMock,
+        return_value="github-token",
+    ) as github_api_token:
+        yield github_api_token
+
+
+def test_ip_allowlist_update(users, github_api_token):
+    user = User.objects.first()
+    ip_allowlist = baker.make("api.IPAllowlist", allowed_ip_ranges="1.1.1.1")
+
+    with patch("controlpanel.frontend.consumers.IPAllowlistPropagator") as propagator:
+        consumer = consumers.BackgroundTaskConsumer()
+        consumer.ip_allowlist_update(
+            message={
+                "user_id": user.auth0_id,
+                "ip_allowlist_id": ip_allowlist.id,
+                "previous_ip_ranges": "2.2.2.2",
+            }
+        )
+
+    assert propagator.call_args.args == ("github-token",)
+    propagator.return_value.propagate.assert_called_once_with(
+        ip_allowlist, previous_ip_ranges="2.2.2.2"
+    )
+
+
+def test_ip_allowlist_delete(users, github_api_token):
+    user = User.objects.first()
+    ip_allowlist = baker.make("api.IPAllowlist", allowed_ip_ranges="1.1.1.1", deleted=True)
+    app = baker.make("api.App")
+    baker.make("api.AppIPAllowList", app=app, ip_allowlist=ip_allowlist, deployment_env="dev")
+
+    with patch("controlpanel.frontend.consumers.IPAllowlistPropagator") as propagator:
+        propagator.return_value.apply.return_value = []
+        consumer = consumers.BackgroundTaskConsumer()
+        consumer.ip_allowlist_delete(
+            message={"user_id": user.auth0_id, "ip_allowlist_id": ip_allowlist.id}
+        )
+
+    plan = propagator.return_value.plan
+    assert plan.call_args.args[0].name == ip_allowlist.name
+    assert plan.call_args.kwargs == {"removed": True}
+    propagator.return_value.apply.assert_called_once_with(plan.return_value)
+    assert not IPAllowlist.objects.filter(name=ip_allowlist.name).exists()
+    assert not app.appipallowlists.exists()
+
+
+def test_ip_allowlist_delete_failed(users, github_api_token):
+    user = User.objects.first()
+    ip_allowlist = baker.make("api.IPAllowlist", allowed_ip_ranges="1.1.1.1", deleted=True)
+    app = baker.make("api.App")
+    for env_name in ("dev", "prod"):
+        baker.make(
+            "api.AppIPAllowList", app=app, ip_allowlist=ip_allowlist, deployment_env=env_name
+        )
+    failed = PropagationItem(app=app, env_name="prod", previous_ip_ranges=[], ip_ranges=[])
+
+    with patch("controlpanel.frontend.consumers.IPAllowlistPropagator") as propagator:
+        propagator.return_value.apply.return_value = [(failed, Exception("Boom"))]
+        consumer = consumers.BackgroundTaskConsumer()
+        consumer.ip_allowlist_delete(
+            message={"user_id": user.auth0_id, "ip_allowlist_id": ip_allowlist.id}
+        )
+
+    ip_allowlist.refresh_from_db()
+    assert ip_allowlist.deleted
+    assert list(app.appipallowlists.values_list("deployment_env", flat=True)) == ["prod"]
+
+
+def test_app_customers_add(users):
+    user = User.objects.first()
+    app = baker.make("api.App")
+    emails = ["foo@example.com", "bar@example.com"]
+
+    with (
+        patch("controlpanel.frontend.consumers.App.add_customers") as add_customers,
+        patch("controlpanel.frontend.consumers.send_sse") as send_sse,
+    ):
+        consumer = consumers.BackgroundTaskConsumer()
+        consumer.app_customers_add(
+            message={
+                "user_id": user.auth0_id,
+                "app_id": app.id,
+                "group_id": "group-id",
+                "emails": emails,
+            }
+        )
+
+    assert add_customers.call_args.args == (emails,)
+    assert add_customers.call_args.kwargs["group_id"] == "group-id"
+    payload = {"app_id": app.id, "group_id": "group-id", "done": 2, "total": 2}
+    send_sse.assert_called_once_with(
+        user.auth0_id,
+        {"event": "customersStatus", "data": json.dumps({**payload, "status": "Completed"})},
+    )
+
+
+def test_app_customers_add_failed(users):
+    user = User.objects.first()
+    app = baker.make("api.App")
+
+    with (
+        patch("controlpanel.frontend.consumers.App.add_customers") as add_customers,
+        patch("controlpanel.frontend.consumers.update_customers_status") as update_status,
+    ):
+        add_customers.side_effect = App.AddCustomerError
+        consumer = consumers.BackgroundTaskConsumer()
+        consumer.app_customers_add(
+            message={
+                "user_id": user.auth0_id,
+                "app_id": app.id,
+                "group_id": "group-id",
+                "emails": ["foo@example.com"],
+            }
+        )
+
+    update_status.assert_called_once_with(user, app, "group-id", done=0, total=0, status="Failed")
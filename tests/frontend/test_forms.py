@@ -16,6 +16,7 @@ from controlpanel.api.models import (
     DashboardAdminAccess,
     DashboardViewer,
     DashboardViewerAccess,
+    EmailNotification,
     S3Bucket,
 )
 from controlpanel.api.models.user import QUICKSIGHT_EMBED_AUTHOR_PERMISSION
@@ -916,13 +917,14 @@ class TestAddDashboardViewersForm:
             shared_by=shared_by_user,
         )
         assert form.is_valid(), form.errors
-        emails, not_notified = form.save()
+        emails = form.save()
 
         assert emails == ["newviewer@example.com"]
-        assert not_notified == []
         assert DashboardViewerAccess.objects.filter(
             dashboard=dashboard,
             viewer__email="newviewer@example.com",
             shared_by=shared_by_user,
         ).exists()
-        govuk_notify_send_email.assert_called_once()
+        # the viewer is emailed from the background
+        govuk_notify_send_email.assert_not_called()
+        assert EmailNotification.objects.filter(email_address="newviewer@example.com").exists()
@@ -20,41 +20,36 @@ class DummyStatusPageEventView(StatusPageEventMixin, BaseStubView):
 
 @mock.patch("controlpanel.frontend.mixins.StatusPageEvent")
 def test_mixin_adds_context_with_events(mock_event_model):
-    mock_qs = mock.Mock()
-    mock_qs.exists.return_value = True
-    mock_qs.order_by.return_value.last.return_value.modified = timezone.now()
-    mock_event_model.objects.exclude.return_value = mock_qs
+    events = [
+        mock.Mock(modified=timezone.now() - timezone.timedelta(days=2)),
+        mock.Mock(modified=timezone.now()),
+    ]
+    mock_event_model.get_active_events.return_value = events
 
     view = DummyStatusPageEventView()
     context = view.get_context_data()
 
-    assert context["pagerduty_posts"] == mock_qs
+    assert context["pagerduty_posts"] == events
     assert context["display_service_info"] is True
     assert context["show_pagerduty_posts"] is True
 
 
 @mock.patch("controlpanel.frontend.mixins.StatusPageEvent")
 def test_mixin_adds_context_with_events_dont_show_posts(mock_event_model):
-    mock_qs = mock.Mock()
-    mock_qs.exists.return_value = True
-    mock_qs.order_by.return_value.last.return_value.modified = timezone.now() - timezone.timedelta(
-        days=2
-    )
-    mock_event_model.objects.exclude.return_value = mock_qs
+    events = [mock.Mock(modified=timezone.now() - timezone.timedelta(days=2))]
+    mock_event_model.get_active_events.return_value = events
 
     view = DummyStatusPageEventView()
     context = view.get_context_data()
 
-    assert context["pagerduty_posts"] == mock_qs
+    assert context["pagerduty_posts"] == events
     assert context["display_service_info"] is True
     assert context["show_pagerduty_posts"] is False
 
 
 @mock.patch("controlpanel.frontend.mixins.StatusPageEvent")
 def test_mixin_adds_context_without_events(mock_event_model):
-    mock_qs = mock.Mock()
-    mock_qs.exists.return_value = False
-    mock_event_model.objects.exclude.return_value = mock_qs
+    mock_event_model.get_active_events.return_value = []
 
     view = DummyStatusPageEventView()
     context = view.get_context_data()
@@ -10,6 +10,7 @@ import requests
 from bs4 import BeautifulSoup
 from django.conf import settings
 from django.contrib.messages import Message, constants, get_messages
+from django.core.cache import cache
 from django.urls import reverse
 from model_bakery import baker
 from pytest_django.asserts import assertMessages, assertQuerySetEqual
@@ -17,6 +18,7 @@ from rest_framework import status
 
 # First-party/Local
 from controlpanel.api import auth0, cluster
+from controlpanel.api.cloud_platform import NAMESPACES_CACHE_KEY
 from controlpanel.api.github import RepositoryNotFound
 from controlpanel.api.models import App, AppIPAllowList, S3Bucket
 from controlpanel.api.models.app import CloudPlatformRole, DeleteCustomerError
@@ -91,12 +93,15 @@ def githubapi():
     """
     with (
         patch("controlpanel.frontend.forms.GithubAPI") as forms_githubapi,
-        patch("controlpanel.frontend.views.app.GithubAPI") as views_githubapi,
+        patch("controlpanel.api.cloud_platform.GithubAPI") as cloud_platform_githubapi,
         patch("controlpanel.api.cluster.GithubAPI") as cluster_githubapi,
     ):
+        # start each test with an empty cloud platform namespaces index
+        cache.delete(NAMESPACES_CACHE_KEY)
+        cloud_platform_githubapi.return_value.get_repository_tree.return_value = []
         yield {
             "forms": forms_githubapi.return_value,
-            "views": views_githubapi.return_value,
+            "cloud_platform": cloud_platform_githubapi.return_value,
             "cluster": cluster_githubapi.return_value,
         }
 
@@ -254,9 +259,10 @@ def add_customers(client, app, *args):
     data = {
         "customer_email": "test@example.com",
     }
-    return client.post(
-        reverse("add-app-customers", args=(app.id, app.get_group_id("dev_env"))), data
-    )
+    with patch("controlpanel.frontend.views.app.start_background_task"):
+        return client.post(
+            reverse("add-app-customers", args=(app.id, app.get_group_id("dev_env"))), data
+        )
 
 
 def remove_customers(client, app, *args):
@@ -416,10 +422,10 @@ def test_permissions(
         assert response.status_code == expected_status
 
 
-def test_admin_csv(client, app, users):
+def test_admin_csv(client, app, users, helpers):
     client.force_login(users["superuser"])
     response = admin_csv(client, app)
-    content = response.content.decode("utf-8")
+    content = helpers.read_streaming_content(response).decode("utf-8")
     assert "App Name,Repo URL,Admins,Emails" in content
     assert app.name in content
 
@@ -485,15 +491,40 @@ def add_customer_form_error(client, response):
 def test_add_customers(client, app, users, emails, expected_response):
     client.force_login(users["superuser"])
     data = {"customer_email": emails, "env_name": "dev_env"}
-    response = client.post(
-        reverse(
-            "add-app-customers", kwargs={"pk": app.id, "group_id": app.get_group_id("dev_env")}
-        ),
-        data,
-    )
+    with patch("controlpanel.frontend.views.app.start_background_task"):
+        response = client.post(
+            reverse(
+                "add-app-customers", kwargs={"pk": app.id, "group_id": app.get_group_id("dev_env")}
+            ),
+            data,
+        )
     assert expected_response(client, response)
 
 
+def test_add_customers_starts_background_task(client, app, users):
+    client.force_login(users["superuser"])
+    group_id = app.get_group_id("dev_env")
+    data = {"customer_email": "Foo@example.com, bar@example.com"}
+    with patch("controlpanel.frontend.views.app.start_background_task") as start_background_task:
+        response = client.post(
+            reverse("add-app-customers", kwargs={"pk": app.id, "group_id": group_id}), data
+        )
+
+    start_background_task.assert_called_once_with(
+        "app_customers.add",
+        {
+            "user_id": users["superuser"].auth0_id,
+            "app_id": app.id,
+            "group_id": group_id,
+            "emails": ["foo@example.com", "bar@example.com"],
+        },
+    )
+    assertMessages(
+        response,
+        [Message(constants.SUCCESS, "Adding 2 customers, this may take a few minutes")],
+    )
+
+
 def test_add_customers_get(client, app, users):
     client.force_login(users["superuser"])
     data = {"customer_email": "foo@example.com", "env_name": "dev_env"}
@@ -813,7 +844,9 @@ def test_app_settings_permission(client, app, users, repos_with_auth, user, can_
 
 
 def test_register_app_with_xacct_policy(client, users, githubapi):
-    githubapi["views"].get_repository_contents.return_value = {"repo": "test-app-namespace-test"}
+    githubapi["cloud_platform"].get_repository_contents.return_value = {
+        "repo": "test-app-namespace-test"
+    }
     test_app_name = "test_app_with_xacct_policy"
     assert App.objects.filter(name=test_app_name).count() == 0
     client.force_login(users["superuser"])
@@ -840,7 +873,9 @@ def test_register_app_with_xacct_policy(client, users, githubapi):
 
 
 def test_register_app_with_creating_datasource(client, users, githubapi):
-    githubapi["views"].get_repository_contents.return_value = {"repo": "test-app-namespace-test"}
+    githubapi["cloud_platform"].get_repository_contents.return_value = {
+        "repo": "test-app-namespace-test"
+    }
     test_app_name = "test_app_with_creating_datasource"
     test_bucket_name = "test-bucket"
     assert App.objects.filter(name=test_app_name).count() == 0
@@ -866,7 +901,9 @@ def test_register_app_with_creating_datasource(client, users, githubapi):
 
 
 def test_register_app_with_existing_datasource(client, users, s3buckets, githubapi):
-    githubapi["views"].get_repository_contents.return_value = {"repo": "test-app-namespace-test"}
+    githubapi["cloud_platform"].get_repository_contents.return_value = {
+        "repo": "test-app-namespace-test"
+    }
     test_app_name = "test_app_with_existing_datasource"
     existing_bucket = s3buckets["not_connected"]
     user = users["superuser"]
@@ -910,7 +947,7 @@ def test_register_app_invalid_organisation(client, users):
 
 
 def test_register_app_invalid_namespace(client, users, githubapi):
-    githubapi["views"].get_repository_contents.side_effect = RepositoryNotFound()
+    githubapi["cloud_platform"].get_repository_contents.side_effect = RepositoryNotFound()
     client.force_login(users["superuser"])
     test_app_name = "test-app-with-invalid-namespace"
     data = {
@@ -926,7 +963,7 @@ def test_register_app_invalid_namespace(client, users, githubapi):
     assert response.status_code == 200
     assert "namespace" in response.context_data["form"].errors
     assert App.objects.filter(name=test_app_name).count() == 0
-    githubapi["views"].get_repository_contents.assert_has_calls(
+    githubapi["cloud_platform"].get_repository_contents.assert_has_calls(
         [
             call(
                 "cloud-platform-environments",
@@ -941,7 +978,7 @@ def test_register_app_invalid_namespace(client, users, githubapi):
 
 
 def test_register_app_with_valid_namespace(client, users, githubapi):
-    githubapi["views"].get_repository_contents.return_value = {"repo": "test-app-dev"}
+    githubapi["cloud_platform"].get_repository_contents.return_value = {"repo": "test-app-dev"}
     client.force_login(users["superuser"])
     test_app_name = "test-app"
     data = {
@@ -956,7 +993,7 @@ def test_register_app_with_valid_namespace(client, users, githubapi):
     # 302 due to successful creation
     assert response.status_code == 302
     # only one call to get_repository_contents as dev exists
-    githubapi["views"].get_repository_contents.assert_called_once_with(
+    githubapi["cloud_platform"].get_repository_contents.assert_called_once_with(
         "cloud-platform-environments",
         f"namespaces/live.cloud-platform.service.justice.gov.uk/{data['namespace']}-dev",
     )
@@ -1227,7 +1264,9 @@ def test_update_cloud_platform_arns_replaces_existing(app, users, client):
 
 def test_create_app_with_multiple_arns(client, users, githubapi):
     """Test creating a new app with multiple ARNs"""
-    githubapi["views"].get_repository_contents.return_value = {"repo": "test-app-namespace-test"}
+    githubapi["cloud_platform"].get_repository_contents.return_value = {
+        "repo": "test-app-namespace-test"
+    }
     test_app_name = "test_app_with_multiple_arns"
 
     assert App.objects.filter(name=test_app_name).count() == 0
@@ -1341,3 +1380,15 @@ def test_cloud_platform_arn_form_validation():
     form_disabled = CloudPlatformArnForm(data=form_data_disabled)
     assert form_disabled.is_valid()
     assert "cloud_platform_role_arn" not in form_disabled.cleaned_data
+
+
+def test_list_all_flags_missing_auth0_clients(client, app, users, github_api_token):
+    github_api_token.clients.get_client_ids.return_value = {"dev_client_id"}
+    client.force_login(users["superuser"])
+
+    response = list_all(client)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content.decode().count("Auth0 client missing") == 1
+    assert 'title="prod_client_id"' in response.content.decode()
+    github_api_token.clients.get_client_ids.assert_called_once()
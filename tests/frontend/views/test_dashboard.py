@@ -11,7 +11,7 @@ from model_bakery import baker
 from rest_framework import status
 
 # First-party/Local
-from controlpanel.api.models import QUICKSIGHT_EMBED_AUTHOR_PERMISSION
+from controlpanel.api.models import QUICKSIGHT_EMBED_AUTHOR_PERMISSION, EmailNotification
 from controlpanel.api.models.dashboard import (
     Dashboard,
     DashboardDomainAccess,
@@ -387,24 +387,6 @@ def test_add_viewers(
     assert dashboard.viewers.filter(email__in=emails).count() == count
 
 
-def test_add_viewers_fail_notify(
-    client,
-    dashboard,
-    dashboard_viewer,
-    users,
-    govuk_notify_send_email,
-):
-    client.force_login(users["superuser"])
-    data = {"emails[0]": "test.user@justice.gov.uk"}
-    govuk_notify_send_email.side_effect = GovukNotifyEmailError()
-
-    response = client.post(dashboard.get_absolute_add_viewers_url(), data)
-    messages = [str(m) for m in get_messages(response.wsgi_request)]
-    assert (
-        "Failed to notify test.user@justice.gov.uk. You may wish to email them your dashboard link."
-    ) in messages
-
-
 def test_add_dashboard_domain(client, dashboard, users, dashboard_domain):
     client.force_login(users["superuser"])
     url = reverse("grant-domain-access", kwargs={"pk": dashboard.id})
@@ -796,17 +778,18 @@ def test_preview_dashboard_confirm_creates_dashboard(
     # Session should be cleared
     assert "dashboard_preview" not in client.session
 
-    govuk_notify_send_email.assert_called_once_with(
-        email_address="viewer@example.com",
-        template_id=settings.NOTIFY_DASHBOARD_ACCESS_TEMPLATE_ID,
-        personalisation={
-            "dashboard": dashboard.name,
-            "dashboard_link": dashboard.url,
-            "dashboard_home": settings.DASHBOARD_SERVICE_URL,
-            "dashboard_admin": users["superuser"].justice_email.lower(),
-            "dashboard_description": dashboard.description,
-        },
-    )
+    # the viewer is emailed from the background
+    govuk_notify_send_email.assert_not_called()
+    notification = EmailNotification.objects.get(email_address="viewer@example.com")
+    assert notification.status == EmailNotification.STATUS_PENDING
+    assert notification.template_id == settings.NOTIFY_DASHBOARD_ACCESS_TEMPLATE_ID
+    assert notification.personalisation == {
+        "dashboard": dashboard.name,
+        "dashboard_link": dashboard.url,
+        "dashboard_home": settings.DASHBOARD_SERVICE_URL,
+        "dashboard_admin": users["superuser"].justice_email.lower(),
+        "dashboard_description": dashboard.description,
+    }
 
 
 def test_preview_dashboard_confirm_creates_dashboard_with_whitelist_domain(
@@ -1002,7 +985,10 @@ def test_revoke_viewer_success(client, dashboard, dashboard_viewer, users, govuk
     )
     assert "You have removed viewers from" in client.session["success_message"]["heading"]
     assert dashboard.viewers.filter(pk=dashboard_viewer.id).count() == 0
-    govuk_notify_send_email.assert_called_once()
+    assert EmailNotification.objects.filter(
+        email_address=dashboard_viewer.email,
+        template_id=settings.NOTIFY_DASHBOARD_REVOKED_TEMPLATE_ID,
+    ).exists()
 
 
 def test_revoke_viewer_fail(client, dashboard, users, govuk_notify_send_email):
@@ -1046,75 +1032,6 @@ def test_revoke_admin_notify_error(client, dashboard, users, govuk_notify_send_e
     govuk_notify_send_email.assert_called_once()
 
 
-def test_revoke_viewer_notify_error(
-    client, dashboard, dashboard_viewer, users, govuk_notify_send_email
-):
-    """Test revoking viewer but notify email fails."""
-    client.force_login(users["superuser"])
-    govuk_notify_send_email.side_effect = GovukNotifyEmailError()
-
-    url = reverse(
-        "revoke-dashboard-viewer",
-        kwargs={"pk": dashboard.id, "viewer_id": dashboard_viewer.id},
-    )
-    response = client.post(url)
-
-    # Viewer should still be removed despite notification error
-    assert response.status_code == 302
-    assert (
-        response.url
-        == reverse("manage-dashboard-sharing", kwargs={"pk": dashboard.id}) + "#viewers"
-    )
-    assert "You have removed viewers from" in client.session["success_message"]["heading"]
-    assert dashboard.viewers.filter(pk=dashboard_viewer.id).count() == 0
-
-    # Check error message was shown
-    messages = [str(m) for m in get_messages(response.wsgi_request)]
-    assert any(
-        f"Failed to notify {dashboard_viewer.email}" in msg
-        and "their viewer access has been removed" in msg
-        for msg in messages
-    )
-    govuk_notify_send_email.assert_called_once()
-
-
-def test_preview_dashboard_confirm_creates_dashboard_fail_notify(
-    client, users, ExtendedAuth0, govuk_notify_send_email
-):
-    """Confirming preview creates dashboard but shows error if notify fails."""
-    client.force_login(users["superuser"])
-    session = client.session
-    session["dashboard_preview"] = {
-        "user_id": users["superuser"].id,
-        "name": "Confirmed Dashboard",
-        "description": "Confirmed description",
-        "quicksight_id": "confirm-123",
-        "emails": ["viewer@example.com"],
-    }
-    session.save()
-
-    govuk_notify_send_email.side_effect = GovukNotifyEmailError()
-
-    url = reverse("preview-dashboard")
-    response = client.post(url)
-
-    # Dashboard should still be created
-    dashboard = Dashboard.objects.get(quicksight_id="confirm-123")
-    assert response.status_code == 302
-    assert response.url == reverse("list-dashboards")
-    assert dashboard.name == "Confirmed Dashboard"
-
-    # Check viewers (viewer should still be added despite email failure)
-    viewer_emails = list(dashboard.viewers.values_list("email", flat=True))
-    assert "viewer@example.com" in viewer_emails
-
-    # Check error message
-    messages = [str(m) for m in get_messages(response.wsgi_request)]
-    assert (
-        "Failed to notify viewer@example.com. You may wish to email them your dashboard link."
-    ) in messages
-
-
 def test_update_description(client, users, dashboard):
     """Test updating the dashboard description."""
     client.force_login(users["dashboard_admin"])
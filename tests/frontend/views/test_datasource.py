@@ -4,6 +4,8 @@ from unittest.mock import patch
 # Third-party
 import pytest
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, reverse_lazy
 from model_bakery import baker
 from rest_framework import status
@@ -13,6 +15,7 @@ from controlpanel.api.exceptions import BucketAlreadyExistsError
 from controlpanel.api.models import S3Bucket, UserS3Bucket
 from controlpanel.frontend.forms import CreateDatasourceFolderForm, CreateDatasourceForm
 from controlpanel.frontend.views import CreateDatasource
+from controlpanel.frontend.views.datasource import BucketList
 
 
 @pytest.fixture(autouse=True)
@@ -270,6 +273,13 @@ def test_list_other_datasources(client, buckets, users, view, user, n_other_data
     assert len(response.context_data["other_datasources"]) == n_other_datasources
 
 
+def other_datasources_admins(response):
+    return {
+        datasource.id: [m2m.user for m2m in datasource.admin_access]
+        for datasource in response.context_data["other_datasources"]
+    }
+
+
 def test_list_other_datasources_admins(client, buckets, users):
     bucket_admin = users["bucket_admin"]
 
@@ -277,18 +287,71 @@ def test_list_other_datasources_admins(client, buckets, users):
     client.force_login(users["normal_user"])
     response = list_warehouse(client)
 
-    other_datasources_admins = response.context_data["other_datasources_admins"]
-    assert other_datasources_admins[buckets["warehouse1"].id] == [bucket_admin]
-    assert other_datasources_admins[buckets["warehouse2"].id] == [bucket_admin]
+    admins = other_datasources_admins(response)
+    assert admins[buckets["warehouse1"].id] == [bucket_admin]
+    assert admins[buckets["warehouse2"].id] == [bucket_admin]
 
     # Listing of "app datasources"
     client.force_login(users["normal_user"])
     response = list_app_data(client)
 
-    other_datasources_admins = response.context_data["other_datasources_admins"]
-    assert other_datasources_admins[buckets["app_data1"].id] == [bucket_admin]
-    assert other_datasources_admins[buckets["app_data2"].id] == [bucket_admin]
-    assert other_datasources_admins[buckets["other"].id] == []
+    admins = other_datasources_admins(response)
+    assert admins[buckets["app_data1"].id] == [bucket_admin]
+    assert admins[buckets["app_data2"].id] == [bucket_admin]
+    assert admins[buckets["other"].id] == []
+
+
+def count_list_queries(client, view):
+    with CaptureQueriesContext(connection) as queries:
+        response = view(client)
+    assert response.status_code == status.HTTP_200_OK
+    return len(queries)
+
+
+def make_buckets(user, is_data_warehouse, quantity):
+    """
+    Make buckets the user has access to, and others they don't with two admins
+    """
+    with patch("controlpanel.api.aws.AWSBucket.create"):
+        for _ in range(quantity):
+            other = baker.make(
+                "api.S3Bucket", is_data_warehouse=is_data_warehouse, dispatch_task=False
+            )
+            baker.make("api.UserS3Bucket", s3bucket=other, is_admin=True, _quantity=2)
+            bucket = baker.make(
+                "api.S3Bucket", is_data_warehouse=is_data_warehouse, dispatch_task=False
+            )
+            baker.make("api.UserS3Bucket", s3bucket=bucket, user=user)
+
+
+@pytest.mark.parametrize("view", [list_warehouse, list_app_data])
+def test_list_queries_constant(client, users, view):
+    user = users["bucket_admin"]
+    client.force_login(user)
+    is_data_warehouse = view == list_warehouse
+
+    make_buckets(user, is_data_warehouse, 1)
+    # the first request caches the status page events shown in the banner
+    view(client)
+    num_queries = count_list_queries(client, view)
+
+    make_buckets(user, is_data_warehouse, 5)
+    assert count_list_queries(client, view) == num_queries
+
+
+def test_list_other_datasources_paginated(client, users):
+    client.force_login(users["normal_user"])
+    with patch("controlpanel.api.aws.AWSBucket.create"):
+        baker.make("api.S3Bucket", is_data_warehouse=True, dispatch_task=False, _quantity=3)
+
+    with patch.object(BucketList, "other_datasources_paginate_by", 2):
+        first = list_warehouse(client)
+        last = client.get(reverse("list-warehouse-datasources") + "?page=3")
+
+    assert len(first.context_data["other_datasources"]) == 2
+    assert first.context_data["other_datasources_page"].paginator.count == 5
+    assert len(last.context_data["other_datasources"]) == 1
+    assert 'rel="prev"' in last.content.decode()
 
 
 @patch("controlpanel.api.models.users3bucket.tasks.S3BucketGrantToUser")
@@ -0,0 +1,36 @@
+# Third-party
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+
+@pytest.mark.django_db
+def test_search(client, users):
+    app = baker.make("api.App", name="weekly-reports")
+    client.force_login(users["superuser"])
+
+    response = client.get(reverse("search"), {"q": "reports"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.context_data["results"]["apps"] == [app]
+    assert reverse("manage-app", kwargs={"pk": app.id}) in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_search_without_term(client, users):
+    client.force_login(users["normal_user"])
+
+    response = client.get(reverse("search"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.context_data["results"] == {}
+
+
+@pytest.mark.django_db
+def test_search_users_only_for_superusers(client, users):
+    client.force_login(users["normal_user"])
+
+    response = client.get(reverse("search"), {"q": "carol"})
+
+    assert "users" not in response.context_data["results"]
@@ -1,14 +1,18 @@
 # Standard library
+from datetime import timedelta
 from unittest.mock import patch
 
 # Third-party
 import pytest
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from rest_framework import status
 
 # First-party/Local
 from controlpanel.api import aws, cluster
 from controlpanel.api.exceptions import QuicksightAccessError
+from controlpanel.api.models import User
+from controlpanel.frontend.views import UserList
 
 
 @pytest.fixture(autouse=True)
@@ -121,6 +125,33 @@ def test_list(client, users, view, user, expected_count):
     assert len(response.context_data["object_list"]) == expected_count
 
 
+def test_list_search(client, users):
+    client.force_login(users["superuser"])
+    response = client.get(reverse("list-users"), {"q": "CAR"})
+    assert [user.username for user in response.context_data["object_list"]] == ["carol"]
+
+
+def test_list_paginated(client, users):
+    client.force_login(users["superuser"])
+    with patch.object(UserList, "paginate_by", 3):
+        response = client.get(reverse("list-users"), {"page": 2})
+    assert len(response.context_data["object_list"]) == 3
+    assert response.context_data["paginator"].count == 10
+    assert 'rel="next"' in response.content.decode()
+
+
+def test_list_unused(client, users):
+    client.force_login(users["superuser"])
+    User.objects.filter(pk=users["other_user"].pk).update(
+        last_login=timezone.now() - timedelta(days=User.UNUSED_AFTER_DAYS + 1)
+    )
+    response = client.get(reverse("list-unused-users"))
+    unused = response.context_data["object_list"]
+    assert users["other_user"] in unused
+    assert users["superuser"] not in unused
+    assert all(user.is_unused for user in unused)
+
+
 @pytest.fixture
 def slack():
     with patch("controlpanel.api.models.user.slack") as slack:
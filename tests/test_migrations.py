@@ -1,9 +1,22 @@
 # Standard library
+from importlib import import_module
 from io import StringIO
+from unittest.mock import Mock, patch
 
 # Third-party
 import pytest
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management import call_command
+from django_celery_beat.models import IntervalSchedule, PeriodicTask
+
+trigram_indexes = import_module("controlpanel.api.migrations.0088_search_trigram_indexes")
+schedule_customers_sync = import_module(
+    "controlpanel.api.migrations.0090_schedule_sync_app_customers"
+)
+schedule_namespaces_refresh = import_module(
+    "controlpanel.api.migrations.0091_schedule_refresh_cloud_platform_namespaces"
+)
 
 
 @pytest.mark.django_db
@@ -19,3 +32,79 @@ def test_no_pending_migrations():
         )
     except SystemExit:
         raise AssertionError(f"Pending migrations: {out.getvalue()}") from None
+
+
+@pytest.fixture
+def without_pg_trgm():
+    cursor = Mock()
+    cursor.fetchone.return_value = None
+    schema_editor = Mock(connection=Mock())
+    schema_editor.connection.cursor.return_value.__enter__ = Mock(return_value=cursor)
+    schema_editor.connection.cursor.return_value.__exit__ = Mock(return_value=False)
+    return schema_editor
+
+
+def test_trigram_indexes_require_pg_trgm(settings, without_pg_trgm):
+    settings.DB_PG_TRGM_OPTIONAL = False
+
+    with pytest.raises(ImproperlyConfigured, match="DB_PG_TRGM_OPTIONAL"):
+        trigram_indexes.create_trigram_indexes(apps, without_pg_trgm)
+
+    without_pg_trgm.execute.assert_not_called()
+
+
+def test_trigram_indexes_skipped_if_optional(settings, without_pg_trgm):
+    settings.DB_PG_TRGM_OPTIONAL = True
+
+    with patch.object(trigram_indexes, "log") as log:
+        trigram_indexes.create_trigram_indexes(apps, without_pg_trgm)
+
+    log.warning.assert_called_once()
+    without_pg_trgm.execute.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_sync_app_customers_scheduled():
+    task = PeriodicTask.objects.get(task="controlpanel.api.tasks.customers.sync_app_customers")
+
+    assert task.enabled
+    assert (task.interval.every, task.interval.period) == (1, "hours")
+
+
+@pytest.mark.django_db
+def test_sync_app_customers_scheduled_with_duplicate_intervals():
+    PeriodicTask.objects.filter(name=schedule_customers_sync.TASK_NAME).delete()
+    IntervalSchedule.objects.bulk_create(
+        [IntervalSchedule(every=1, period="hours"), IntervalSchedule(every=1, period="hours")]
+    )
+
+    schedule_customers_sync.schedule_task(apps, None)
+
+    task = PeriodicTask.objects.get(name=schedule_customers_sync.TASK_NAME)
+    assert (task.interval.every, task.interval.period) == (1, "hours")
+
+
+@pytest.mark.django_db
+def test_refresh_cloud_platform_namespaces_scheduled():
+    task = PeriodicTask.objects.get(
+        task="controlpanel.api.tasks.cloud_platform.refresh_cloud_platform_namespaces"
+    )
+
+    assert task.enabled
+    assert (task.interval.every, task.interval.period) == (30, "minutes")
+
+
+@pytest.mark.django_db
+def test_refresh_cloud_platform_namespaces_scheduled_with_duplicate_intervals():
+    PeriodicTask.objects.filter(name=schedule_namespaces_refresh.TASK_NAME).delete()
+    IntervalSchedule.objects.bulk_create(
+        [
+            IntervalSchedule(every=30, period="minutes"),
+            IntervalSchedule(every=30, period="minutes"),
+        ]
+    )
+
+    schedule_namespaces_refresh.schedule_task(apps, None)
+
+    task = PeriodicTask.objects.get(name=schedule_namespaces_refresh.TASK_NAME)
+    assert (task.interval.every, task.interval.period) == (30, "minutes")
@@ -1,10 +1,18 @@
 # Third-party
+import pytest
+from asgiref.sync import async_to_sync
 from django import forms
 from django.conf import settings
 
 # First-party/Local
+from controlpanel.api.models import Feedback
 from controlpanel.frontend.forms import ErrorSummaryMixin, MultiEmailField
-from controlpanel.utils import SettingLoader
+from controlpanel.utils import (
+    SettingLoader,
+    aiter_chunks,
+    iter_queryset,
+    streaming_csv_response,
+)
 
 
 def test_not_overwrite_var_in_setting():
@@ -45,6 +53,47 @@ def test_feature_flag_env_True():
     assert settings.features.test_feature.enabled
 
 
+def test_aiter_chunks(settings):
+    settings.CSV_EXPORT_CHUNK_SIZE = 2
+    read = []
+
+    def parts():
+        for part in ["a", "b", "c"]:
+            read.append(part)
+            yield part
+
+    async def read_chunks():
+        return [(chunk, list(read)) async for chunk in aiter_chunks(parts())]
+
+    # each chunk is yielded before the next is read
+    assert async_to_sync(read_chunks)() == [("ab", ["a", "b"]), ("c", ["a", "b", "c"])]
+
+
+def test_streaming_csv_response(helpers):
+    read = []
+
+    def rows():
+        for row in [["a", "b,c"], [1, None]]:
+            read.append(row)
+            yield row
+
+    response = streaming_csv_response(["First", "Second"], rows())
+
+    # rows are only read as the response is sent
+    assert read == []
+    assert response.is_async
+    assert helpers.read_streaming_content(response) == b'First,Second\r\na,"b,c"\r\n1,\r\n'
+
+
+@pytest.mark.django_db
+def test_iter_queryset(settings, django_assert_num_queries):
+    settings.CSV_EXPORT_CHUNK_SIZE = 2
+    Feedback.objects.bulk_create([Feedback(satisfaction_rating=5) for _ in range(3)])
+
+    with django_assert_num_queries(1):
+        assert len(list(iter_queryset(Feedback.objects.all()))) == 3
+
+
 class TestErrorSummaryMixin:
     """Tests for the ErrorSummaryMixin form mixin."""
 
@@ -28,8 +28,11 @@ def webhook_url():
     return reverse("webhooks:pagerduty") + f"?token={settings.PAGERDUTY_WEBHOOK_SECRET}"
 
 
+@mock.patch("controlpanel.webhooks.views.StatusPageEvent.invalidate_active_events")
 @mock.patch("controlpanel.webhooks.views.StatusPageEvent.objects.update_or_create")
-def test_valid_webhook_creates_event(mock_update_or_create, rf, valid_payload, webhook_url):
+def test_valid_webhook_creates_event(
+    mock_update_or_create, mock_invalidate, rf, valid_payload, webhook_url
+):
     mock_event = mock.Mock()
     mock_update_or_create.return_value = (mock_event, True)
 
@@ -40,6 +43,7 @@ def test_valid_webhook_creates_event(mock_update_or_create, rf, valid_payload, w
     assert json.loads(response.content)["action"] == "Created"
     mock_update_or_create.assert_called_once()
     assert mock_update_or_create.call_args[1]["href"] == valid_payload["href"]
+    mock_invalidate.assert_called_once()
 
 
 def test_invalid_token_returns_403(rf, valid_payload):